@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from app.auth.dependencies import get_current_admin_user, user_cache
+from app.auth.jwt_handler import token_cache
+from app.auth.password_handler import password_pool
+from app.models.user import User
+from app.counts import count_cache
+from app.response_cache import response_cache
+from app.services.dashboard_stream import dashboard_broadcaster
+from app.services.spatial_index import location_index
+from app.services.analysis_jobs import analysis_jobs
+from app.query_stats import query_stats
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+QUERY_STATS_SORT_FIELDS = {
+    "total_exec_ms", "avg_exec_ms", "max_exec_ms", "calls",
+    "total_wait_ms", "max_wait_ms", "rows", "slow_calls", "errors"
+}
+
+
+@router.get("/query-stats")
+async def get_query_stats(
+    sort_by: str = Query("total_exec_ms"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Per-statement timing histograms, heaviest fingerprints first (admins only)"""
+    if sort_by not in QUERY_STATS_SORT_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"sort_by must be one of: {', '.join(sorted(QUERY_STATS_SORT_FIELDS))}"
+        )
+    
+    return {
+        "message": "Query statistics retrieved successfully",
+        "query_stats": query_stats.snapshot(sort_by=sort_by, limit=limit),
+        "count_cache": count_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "dashboard_stream": dashboard_broadcaster.stats(),
+        "location_index": location_index.stats(),
+        "analysis_jobs": analysis_jobs.stats()
+    }
+
+
+@router.delete("/query-stats")
+async def reset_query_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Clear collected query statistics (admins only)"""
+    query_stats.reset()
+    logger.info(f"Query statistics reset by user {current_user.id}")
+    return {"message": "Query statistics reset successfully"}
+
+
+@router.get("/auth-stats")
+async def get_auth_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Token/user caches and bcrypt worker pool metrics (admins only)"""
+    return {
+        "message": "Authentication statistics retrieved successfully",
+        "auth_stats": {
+            "token_cache": token_cache.stats(),
+            "user_cache": user_cache.stats(),
+            "password_pool": password_pool.stats()
+        }
+    }
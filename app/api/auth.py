@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.auth import create_access_token, verify_password, get_password_hash
+from app.auth import (
+    create_access_token, verify_password_async, get_password_hash_async, PasswordPoolBusyError
+)
 from app.auth.dependencies import get_current_user
-from app.database import get_db
+from app.database import get_async_db
+from app.response_cache import invalidates
 from app.models.user import User, UserCreate, UserLogin, UserResponse, UserPasswordChange
 from datetime import datetime
 import logging
@@ -12,10 +15,20 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def password_pool_busy() -> HTTPException:
+    """503 returned when the bcrypt worker pool is saturated"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("users")
 async def register(
     user_data: UserCreate,
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Register a new user"""
     try:
@@ -27,7 +40,7 @@ async def register(
             )
         
         # Check if user already exists
-        existing_users = db.execute_query("SELECT id FROM users WHERE email = %s", (user_data.email,))
+        existing_users = await db.execute_query("SELECT id FROM users WHERE email = %s", (user_data.email,), prepared=True)
         if existing_users:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,7 +48,7 @@ async def register(
             )
         
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         # Create user data
         user_dict = user_data.dict()
@@ -46,13 +59,14 @@ async def register(
         user_dict["updated_at"] = datetime.utcnow()
         
         # Insert user into database
-        user_id = db.execute_insert(
-            "INSERT INTO users (email, first_name, last_name, hashed_password, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s)",
-            (user_data.email, user_data.first_name, user_data.last_name, hashed_password, user_dict["created_at"], user_dict["updated_at"])
-        )
-        
-        # Get the created user
-        created_user_data = db.execute_query("SELECT * FROM users WHERE id = %s", (user_id,))[0]
+        created_user_data = await db.insert_returning("users", {
+            "email": user_data.email,
+            "first_name": user_data.first_name,
+            "last_name": user_data.last_name,
+            "hashed_password": hashed_password,
+            "created_at": user_dict["created_at"],
+            "updated_at": user_dict["updated_at"]
+        }, defaults={"role": "user", "status": "active", "company_name": None, "phone": None})
         created_user = User(**created_user_data)
         
         return UserResponse(
@@ -62,6 +76,9 @@ async def register(
         
     except HTTPException:
         raise
+    except PasswordPoolBusyError:
+        logger.warning("Password worker pool saturated; rejecting request")
+        raise password_pool_busy()
     except Exception as e:
         logger.error(f"Error registering user: {e}")
         raise HTTPException(
@@ -73,12 +90,12 @@ async def register(
 @router.post("/login")
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Login user and return access token"""
     try:
         # Get user from database
-        users = db.execute_query("SELECT * FROM users WHERE email = %s", (form_data.username,))
+        users = await db.execute_query("SELECT * FROM users WHERE email = %s", (form_data.username,), prepared=True)
         
         if not users:
             raise HTTPException(
@@ -90,7 +107,7 @@ async def login(
         user = User(**user_data)
         
         # Verify password
-        if not verify_password(form_data.password, user_data["password_hash"]):
+        if not await verify_password_async(form_data.password, user_data["password_hash"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -109,7 +126,7 @@ async def login(
         )
         
         # Update last login
-        db.execute_update(
+        await db.execute_update(
             "UPDATE users SET updated_at = %s WHERE id = %s",
             (datetime.utcnow(), user.id)
         )
@@ -128,6 +145,9 @@ async def login(
         
     except HTTPException:
         raise
+    except PasswordPoolBusyError:
+        logger.warning("Password worker pool saturated; rejecting request")
+        raise password_pool_busy()
     except Exception as e:
         logger.error(f"Error during login: {e}")
         raise HTTPException(
@@ -140,12 +160,12 @@ async def login(
 async def change_password(
     password_data: UserPasswordChange,
     current_user: User = Depends(get_current_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Change user password"""
     try:
         # Get current user data from database
-        users = db.execute_query("SELECT * FROM users WHERE id = %s", (current_user.id,))
+        users = await db.execute_query("SELECT * FROM users WHERE id = %s", (current_user.id,), prepared=True)
         if not users:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -154,7 +174,7 @@ async def change_password(
         user_data = users[0]
         
         # Verify current password
-        if not verify_password(password_data.current_password, user_data["password_hash"]):
+        if not await verify_password_async(password_data.current_password, user_data["password_hash"]):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
@@ -168,10 +188,10 @@ async def change_password(
             )
         
         # Hash new password
-        new_hashed_password = get_password_hash(password_data.new_password)
+        new_hashed_password = await get_password_hash_async(password_data.new_password)
         
         # Update password in database
-        db.execute_update(
+        await db.execute_update(
             "UPDATE users SET password_hash = %s, updated_at = %s WHERE id = %s",
             (new_hashed_password, datetime.utcnow(), current_user.id)
         )
@@ -180,6 +200,9 @@ async def change_password(
         
     except HTTPException:
         raise
+    except PasswordPoolBusyError:
+        logger.warning("Password worker pool saturated; rejecting request")
+        raise password_pool_busy()
     except Exception as e:
         logger.error(f"Error changing password: {e}")
         raise HTTPException(
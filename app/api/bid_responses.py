@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
 from app.auth.dependencies import get_current_active_user, get_current_manager_user
 from app.database import get_db
+from app.response_cache import invalidates
 from app.models.bid_response import (
     BidResponse, BidResponseCreate, BidResponseUpdate, BidResponseResponse, 
     BidResponseListResponse, BidResponseStats
@@ -17,6 +18,7 @@ router = APIRouter(prefix="/bid-responses", tags=["Bid Responses"])
 
 
 @router.post("/", response_model=BidResponseResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("bid_responses")
 async def create_bid_response(
     bid_response_data: BidResponseCreate,
     current_user: User = Depends(get_current_active_user),
@@ -158,6 +160,7 @@ async def get_bid_response(
 
 
 @router.put("/{bid_response_id}", response_model=BidResponseResponse)
+@invalidates("bid_responses")
 async def update_bid_response(
     bid_response_id: str,
     bid_response_data: BidResponseUpdate,
@@ -213,6 +216,7 @@ async def update_bid_response(
 
 
 @router.delete("/{bid_response_id}")
+@invalidates("bid_responses")
 async def delete_bid_response(
     bid_response_id: str,
     current_user: User = Depends(get_current_active_user),
@@ -253,6 +257,7 @@ async def delete_bid_response(
 
 
 @router.post("/{bid_response_id}/accept")
+@invalidates("bid_responses", "bids")
 async def accept_bid_response(
     bid_response_id: str,
     current_user: User = Depends(get_current_manager_user),
@@ -309,6 +314,7 @@ async def accept_bid_response(
 
 
 @router.post("/{bid_response_id}/reject")
+@invalidates("bid_responses")
 async def reject_bid_response(
     bid_response_id: str,
     current_user: User = Depends(get_current_manager_user),
@@ -1,13 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from app.auth.dependencies import get_current_active_user, get_current_manager_user
-from app.database import get_db
+from app.database import get_async_db
+from app.response_cache import cached, invalidates, by_user
+from app.config import settings
+from app.counts import count_rows, COUNT_MODE_PATTERN
 from app.models.bid import (
     Bid, BidCreate, BidUpdate, BidResponse, BidListResponse,
-    BidStats
+    BidStats, BidSummary, BidBatchCreate, BidBatchItemResult, BidBatchResponse
 )
 from app.models.user import User
+from app.pagination import encode_cursor, decode_cursor
+from app.database_mysql import chunked
+from app.services.bid_stats import compute_bid_stats, record_bid_change, record_bid_changes
 from datetime import datetime
+import csv
+import io
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,10 +25,11 @@ router = APIRouter(prefix="/bids", tags=["Bids"])
 
 
 @router.post("/", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("bids")
 async def create_bid(
     bid_data: BidCreate,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Create a new bid"""
     try:
@@ -32,60 +42,39 @@ async def create_bid(
         
         lane_id = bid_data.lane_ids[0]  # Use first lane for simple bids table
         
-        # Check if user already has a bid for this lane
-        existing_bids = db.execute_query(
-            "SELECT id FROM bids WHERE created_by = %s AND lane_id = %s",
-            (str(current_user.id), lane_id)
-        )
-        if existing_bids:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You already have a bid for this lane"
-            )
-        
         # Create bid data
         bid_dict = bid_data.dict()
         bid_dict["user_id"] = str(current_user.id)
         bid_dict["created_at"] = datetime.utcnow()
         bid_dict["updated_at"] = datetime.utcnow()
         
-        # Insert bid into database - map to simple bids table structure
-        bid_id = db.execute_insert(
-            "INSERT INTO bids (title, description, lane_id, estimated_cost, status, created_by, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
-            (bid_data.name, bid_data.description, lane_id, bid_data.budget, "open", bid_dict["user_id"], bid_dict["created_at"], bid_dict["updated_at"])
-        )
-        
-        # Get the created bid
-        created_bid_data = db.execute_query("SELECT * FROM bids WHERE id = %s", (bid_id,))[0]
-        
-        # Create a simplified Bid object that matches the simple table structure
-        simplified_bid = {
-            "id": str(created_bid_data["id"]),
-            "name": created_bid_data["title"],
-            "description": created_bid_data["description"],
-            "bid_type": bid_data.bid_type,
-            "priority": bid_data.priority,
-            "start_date": bid_data.start_date,
-            "end_date": bid_data.end_date,
-            "submission_deadline": bid_data.submission_deadline,
-            "budget": created_bid_data["estimated_cost"],
-            "currency": bid_data.currency,
-            "requirements": bid_data.requirements,
-            "terms_conditions": bid_data.terms_conditions,
-            "is_template": bid_data.is_template,
-            "status": created_bid_data["status"],
-            "created_by": str(created_bid_data["created_by"]),
-            "created_at": created_bid_data["created_at"],
-            "updated_at": created_bid_data["updated_at"],
-            "published_at": None,
-            "closed_at": None,
-            "awarded_at": None,
-            "total_responses": 0,
-            "total_lanes": 1,
-            "total_carriers": 0
-        }
-        
-        created_bid = Bid(**simplified_bid)
+        async with db.transaction() as tx:
+            # Check if user already has a bid for this lane; the lock holds until the insert commits
+            existing_bids = await tx.execute_query(
+                "SELECT id FROM bids WHERE created_by = %s AND lane_id = %s",
+                (str(current_user.id), lane_id),
+                for_update=True
+            )
+            if existing_bids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="You already have a bid for this lane"
+                )
+            
+            # Insert bid into database - map to simple bids table structure
+            created_bid_data = await tx.insert_returning("bids", {
+                "title": bid_data.name,
+                "description": bid_data.description,
+                "lane_id": lane_id,
+                "estimated_cost": bid_data.budget,
+                "status": "open",
+                "created_by": bid_dict["user_id"],
+                "created_at": bid_dict["created_at"],
+                "updated_at": bid_dict["updated_at"]
+            })
+            await record_bid_change(tx, bid_dict["user_id"], after=("open", bid_data.budget))
+        
+        created_bid = map_bid(created_bid_data, bid_data)
         
         return BidResponse(
             bid=created_bid,
@@ -103,9 +92,10 @@ async def create_bid(
 
 
 @router.post("/dev", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("bids")
 async def create_bid_dev(
     bid_data: BidCreate,
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Create a new bid (Development endpoint - no authentication required)"""
     try:
@@ -121,60 +111,39 @@ async def create_bid_dev(
         
         lane_id = bid_data.lane_ids[0]  # Use first lane for simple bids table
         
-        # Check if user already has a bid for this lane
-        existing_bids = db.execute_query(
-            "SELECT id FROM bids WHERE created_by = %s AND lane_id = %s",
-            (default_user_id, lane_id)
-        )
-        if existing_bids:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You already have a bid for this lane"
-            )
-        
         # Create bid data
         bid_dict = bid_data.dict()
         bid_dict["user_id"] = default_user_id
         bid_dict["created_at"] = datetime.utcnow()
         bid_dict["updated_at"] = datetime.utcnow()
         
-        # Insert bid into database - map to simple bids table structure
-        bid_id = db.execute_insert(
-            "INSERT INTO bids (title, description, lane_id, estimated_cost, status, created_by, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
-            (bid_data.name, bid_data.description, lane_id, bid_data.budget, "open", default_user_id, bid_dict["created_at"], bid_dict["updated_at"])
-        )
-        
-        # Get the created bid
-        created_bid_data = db.execute_query("SELECT * FROM bids WHERE id = %s", (bid_id,))[0]
-        
-        # Create a simplified Bid object that matches the simple table structure
-        simplified_bid = {
-            "id": str(created_bid_data["id"]),
-            "name": created_bid_data["title"],
-            "description": created_bid_data["description"],
-            "bid_type": bid_data.bid_type,
-            "priority": bid_data.priority,
-            "start_date": bid_data.start_date,
-            "end_date": bid_data.end_date,
-            "submission_deadline": bid_data.submission_deadline,
-            "budget": created_bid_data["estimated_cost"],
-            "currency": bid_data.currency,
-            "requirements": bid_data.requirements,
-            "terms_conditions": bid_data.terms_conditions,
-            "is_template": bid_data.is_template,
-            "status": created_bid_data["status"],
-            "created_by": str(created_bid_data["created_by"]),
-            "created_at": created_bid_data["created_at"],
-            "updated_at": created_bid_data["updated_at"],
-            "published_at": None,
-            "closed_at": None,
-            "awarded_at": None,
-            "total_responses": 0,
-            "total_lanes": 1,
-            "total_carriers": 0
-        }
-        
-        created_bid = Bid(**simplified_bid)
+        async with db.transaction() as tx:
+            # Check if user already has a bid for this lane; the lock holds until the insert commits
+            existing_bids = await tx.execute_query(
+                "SELECT id FROM bids WHERE created_by = %s AND lane_id = %s",
+                (default_user_id, lane_id),
+                for_update=True
+            )
+            if existing_bids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="You already have a bid for this lane"
+                )
+            
+            # Insert bid into database - map to simple bids table structure
+            created_bid_data = await tx.insert_returning("bids", {
+                "title": bid_data.name,
+                "description": bid_data.description,
+                "lane_id": lane_id,
+                "estimated_cost": bid_data.budget,
+                "status": "open",
+                "created_by": default_user_id,
+                "created_at": bid_dict["created_at"],
+                "updated_at": bid_dict["updated_at"]
+            })
+            await record_bid_change(tx, default_user_id, after=("open", bid_data.budget))
+        
+        created_bid = map_bid(created_bid_data, bid_data)
         
         return BidResponse(
             bid=created_bid,
@@ -191,17 +160,259 @@ async def create_bid_dev(
         )
 
 
+@router.post("/batch", response_model=BidBatchResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("bids")
+async def create_bids_batch(
+    batch: BidBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db = Depends(get_async_db)
+):
+    """Create many bids, each over one or more lanes, in a single transaction"""
+    try:
+        if len(batch.bids) > settings.bid_batch_max_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A batch may contain at most {settings.bid_batch_max_size} bids"
+            )
+        
+        user_id = str(current_user.id)
+        now = datetime.utcnow()
+        results: List[Optional[BidBatchItemResult]] = [None] * len(batch.bids)
+        
+        def reject(index: int, bid_data: BidCreate, item_status: str, error: str):
+            results[index] = BidBatchItemResult(
+                index=index, status=item_status, name=bid_data.name,
+                lane_ids=bid_data.lane_ids, error=error
+            )
+        
+        # Validate lane ids up front; the first lane is the bid's primary lane
+        candidates = []
+        for index, bid_data in enumerate(batch.bids):
+            try:
+                lane_ids = list(dict.fromkeys(int(lane_id) for lane_id in bid_data.lane_ids))
+            except ValueError:
+                reject(index, bid_data, "invalid", "Lane ids must be integers")
+                continue
+            candidates.append((index, bid_data, lane_ids))
+        
+        all_lane_ids = sorted({lane_id for _, _, lane_ids in candidates for lane_id in lane_ids})
+        
+        async with db.transaction() as tx:
+            known_lanes = set()
+            for chunk in chunked(all_lane_ids, 1000):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                rows = await tx.execute_query(f"SELECT id FROM lanes WHERE id IN ({placeholders})", tuple(chunk))
+                known_lanes.update(int(row["id"]) for row in rows)
+            
+            # One set-based duplicate check against the caller's existing bids, locked until commit
+            primary_lanes = sorted({lane_ids[0] for _, _, lane_ids in candidates})
+            taken_lanes = set()
+            for chunk in chunked(primary_lanes, 1000):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                rows = await tx.execute_query(
+                    f"SELECT lane_id FROM bids WHERE created_by = %s AND lane_id IN ({placeholders})",
+                    (user_id, *chunk),
+                    for_update=True
+                )
+                taken_lanes.update(int(row["lane_id"]) for row in rows)
+            
+            accepted = []
+            for index, bid_data, lane_ids in candidates:
+                missing = [lane_id for lane_id in lane_ids if lane_id not in known_lanes]
+                if missing:
+                    reject(index, bid_data, "invalid", f"Unknown lane ids: {', '.join(map(str, missing))}")
+                elif lane_ids[0] in taken_lanes:
+                    reject(index, bid_data, "duplicate", "You already have a bid for this lane")
+                else:
+                    # Later items in the batch count as existing bids too
+                    taken_lanes.add(lane_ids[0])
+                    accepted.append((index, bid_data, lane_ids))
+            
+            if accepted:
+                await tx.bulk_insert(
+                    "bids",
+                    [(bid_data.name, bid_data.description, lane_ids[0], bid_data.budget, "open", user_id, now, now)
+                     for _, bid_data, lane_ids in accepted],
+                    columns=["title", "description", "lane_id", "estimated_cost", "status",
+                             "created_by", "created_at", "updated_at"]
+                )
+                
+                # Multi-row inserts don't guarantee consecutive ids, so read them back by primary lane
+                bid_ids = {}
+                for chunk in chunked([lane_ids[0] for _, _, lane_ids in accepted], 1000):
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    rows = await tx.execute_query(
+                        f"SELECT id, lane_id FROM bids WHERE created_by = %s AND lane_id IN ({placeholders})",
+                        (user_id, *chunk)
+                    )
+                    bid_ids.update({int(row["lane_id"]): row["id"] for row in rows})
+                
+                await tx.bulk_insert(
+                    "bid_lanes",
+                    [(bid_ids[lane_ids[0]], lane_id, now)
+                     for _, _, lane_ids in accepted for lane_id in lane_ids],
+                    columns=["bid_id", "lane_id", "created_at"]
+                )
+                await record_bid_changes(
+                    tx, [(user_id, None, ("open", bid_data.budget)) for _, bid_data, _ in accepted]
+                )
+                
+                for index, bid_data, lane_ids in accepted:
+                    results[index] = BidBatchItemResult(
+                        index=index, status="created", bid_id=str(bid_ids[lane_ids[0]]),
+                        name=bid_data.name, lane_ids=[str(lane_id) for lane_id in lane_ids]
+                    )
+        
+        created = len(accepted)
+        return BidBatchResponse(
+            created=created,
+            failed=len(results) - created,
+            results=results,
+            message=f"Created {created} of {len(results)} bids"
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating bid batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+BID_LIST_QUERY = """
+    SELECT 
+        b.*,
+        CONCAT(u.first_name, ' ', u.last_name) as user_name,
+        u.email as user_email,
+        CONCAT(l.origin_city, ', ', l.origin_state) as origin,
+        CONCAT(l.destination_city, ', ', l.destination_state) as destination,
+        l.distance_miles as distance,
+        'N/A' as volume
+    FROM bids b
+    LEFT JOIN users u ON b.created_by = u.id
+    LEFT JOIN lanes l ON b.lane_id = l.id
+    WHERE {where_clause}
+    ORDER BY b.created_at DESC, b.id DESC
+    LIMIT %s{offset_clause}
+"""
+
+
+def map_bid(bid_data: dict, request: Optional[BidCreate] = None) -> Bid:
+    """
+    Map a row of the simple bids table to the Bid model. Fields the table
+    doesn't store come from ``request`` when the bid was just created from
+    it, otherwise the same defaults as ``map_bid_summary``.
+    """
+    return Bid(
+        id=str(bid_data["id"]),
+        name=bid_data["title"],
+        description=bid_data["description"],
+        bid_type=request.bid_type if request else "contract",
+        priority=request.priority if request else "medium",
+        start_date=request.start_date if request else bid_data["created_at"],
+        end_date=request.end_date if request else bid_data["created_at"],
+        submission_deadline=request.submission_deadline if request else bid_data["created_at"],
+        budget=bid_data["estimated_cost"],
+        currency=request.currency if request else "USD",
+        requirements=request.requirements if request else None,
+        terms_conditions=request.terms_conditions if request else None,
+        is_template=request.is_template if request else False,
+        status=bid_data["status"],
+        created_by=str(bid_data["created_by"]),
+        created_at=bid_data["created_at"],
+        updated_at=bid_data["updated_at"],
+        total_responses=0,
+        total_lanes=1,
+        total_carriers=0
+    )
+
+
+def map_bid_summary(bid_data: dict) -> BidSummary:
+    """Map a row of the simple bids table to the BidSummary model"""
+    return BidSummary(
+        id=str(bid_data["id"]),
+        name=bid_data["title"],
+        bid_type="contract",  # Default since simple table doesn't store this
+        status=bid_data["status"],
+        priority="medium",    # Default since simple table doesn't store this
+        start_date=bid_data["created_at"],  # Simple table doesn't store bid dates
+        end_date=bid_data["created_at"],
+        submission_deadline=bid_data["created_at"],
+        total_responses=0,
+        total_lanes=1,
+        total_carriers=0,
+        created_at=bid_data["created_at"]
+    )
+
+
+async def list_bids(db, where_conditions: List[str], params: list,
+                    skip: int, limit: int, cursor: Optional[str], count: str) -> BidListResponse:
+    """
+    Page through bids newest first. With a ``cursor`` the page starts right
+    after the cursor's ``(created_at, id)`` and is served from
+    idx_bids_created_at_id without reading skipped rows; otherwise ``skip``
+    is applied as an OFFSET for older clients.
+    """
+    where_conditions = list(where_conditions)
+    params = list(params)
+    count_params = list(params)
+    count_where = " AND ".join(where_conditions) if where_conditions else "1=1"
+    
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        where_conditions.append("(b.created_at < %s OR (b.created_at = %s AND b.id < %s))")
+        params.extend([cursor_created_at, cursor_created_at, cursor_id])
+    
+    where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    
+    # Fetch one extra row to learn whether another page exists
+    query = BID_LIST_QUERY.format(where_clause=where_clause, offset_clause="" if cursor else " OFFSET %s")
+    params.append(limit + 1)
+    if not cursor:
+        params.append(skip)
+    bids_data = await db.execute_query(query, tuple(params))
+    
+    next_cursor = None
+    if len(bids_data) > limit:
+        bids_data = bids_data[:limit]
+        last = bids_data[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    
+    # Continuation pages skip the count so deep scrolling stays O(page size)
+    total = None
+    if not cursor:
+        total = await count_rows(db, "bids", count_where, count_params, mode=count, alias="b")
+    
+    return BidListResponse(
+        bids=[map_bid_summary(bid_data) for bid_data in bids_data],
+        total=total,
+        page=None if cursor else skip // limit + 1,
+        size=limit,
+        next_cursor=next_cursor
+    )
+
+
 @router.get("/", response_model=BidListResponse)
 async def get_bids(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: str = Query(settings.list_count_default_mode, pattern=COUNT_MODE_PATTERN),
     bid_status: Optional[str] = None,
     user_id: Optional[str] = None,
     lane_id: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
-    """Get list of bids with pagination and filtering"""
+    """Get list of bids with offset or cursor pagination and filtering"""
     try:
         # Build query with filters
         where_conditions = []
@@ -222,74 +433,10 @@ async def get_bids(
             where_conditions.append("b.created_by = %s")
             params.append(str(current_user.id))
         
-        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-        
-        # Build the main query - simplified to work with actual table structure
-        query = f"""
-            SELECT 
-                b.*,
-                CONCAT(u.first_name, ' ', u.last_name) as user_name,
-                u.email as user_email,
-                CONCAT(l.origin_city, ', ', l.origin_state) as origin,
-                CONCAT(l.destination_city, ', ', l.destination_state) as destination,
-                l.distance_miles as distance,
-                'N/A' as volume
-            FROM bids b
-            LEFT JOIN users u ON b.created_by = u.id
-            LEFT JOIN lanes l ON b.lane_id = l.id
-            WHERE {where_clause}
-            ORDER BY b.created_at DESC
-            LIMIT %s OFFSET %s
-        """
-        
-        params.extend([limit, skip])
-        
-        # Execute query
-        bids_data = db.execute_query(query, params)
-        
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM bids b WHERE {where_clause}"
-        count_params = params[:-2] if len(params) > 2 else []
-        total_count = db.execute_query(count_query, count_params)[0]["total"]
-        
-        # Convert database results to Bid objects - map to expected structure
-        bids = []
-        for bid_data in bids_data:
-            # Map database columns to Bid model fields
-            mapped_bid = {
-                "id": str(bid_data["id"]),
-                "name": bid_data["title"],
-                "description": bid_data["description"],
-                "bid_type": "contract",  # Default since simple table doesn't store this
-                "priority": "medium",    # Default since simple table doesn't store this
-                "start_date": datetime.utcnow(),  # Default since simple table doesn't store this
-                "end_date": datetime.utcnow(),    # Default since simple table doesn't store this
-                "submission_deadline": datetime.utcnow(),  # Default since simple table doesn't store this
-                "budget": bid_data["estimated_cost"],
-                "currency": "USD",  # Default since simple table doesn't store this
-                "requirements": None,
-                "terms_conditions": None,
-                "is_template": False,
-                "status": bid_data["status"],
-                "created_by": str(bid_data["created_by"]),
-                "created_at": bid_data["created_at"],
-                "updated_at": bid_data["updated_at"],
-                "published_at": None,
-                "closed_at": None,
-                "awarded_at": None,
-                "total_responses": 0,
-                "total_lanes": 1,
-                "total_carriers": 0
-            }
-            bids.append(Bid(**mapped_bid))
-        
-        return BidListResponse(
-            bids=bids,
-            total=total_count,
-            skip=skip,
-            limit=limit
-        )
+        return await list_bids(db, where_conditions, params, skip, limit, cursor, count)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting bids: {e}")
         raise HTTPException(
@@ -302,10 +449,12 @@ async def get_bids(
 async def get_bids_dev(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: str = Query(settings.list_count_default_mode, pattern=COUNT_MODE_PATTERN),
     bid_status: Optional[str] = None,
     user_id: Optional[str] = None,
     lane_id: Optional[str] = None,
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get list of bids (Development endpoint - no authentication required)"""
     try:
@@ -323,74 +472,10 @@ async def get_bids_dev(
             where_conditions.append("b.lane_id = %s")
             params.append(lane_id)
         
-        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-        
-        # Build the main query - simplified to work with actual table structure
-        query = f"""
-            SELECT 
-                b.*,
-                CONCAT(u.first_name, ' ', u.last_name) as user_name,
-                u.email as user_email,
-                CONCAT(l.origin_city, ', ', l.origin_state) as origin,
-                CONCAT(l.destination_city, ', ', l.destination_state) as destination,
-                l.distance_miles as distance,
-                'N/A' as volume
-            FROM bids b
-            LEFT JOIN users u ON b.created_by = u.id
-            LEFT JOIN lanes l ON b.lane_id = l.id
-            WHERE {where_clause}
-            ORDER BY b.created_at DESC
-            LIMIT %s OFFSET %s
-        """
-        
-        params.extend([limit, skip])
-        
-        # Execute query
-        bids_data = db.execute_query(query, params)
-        
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM bids b WHERE {where_clause}"
-        count_params = params[:-2] if len(params) > 2 else []
-        total_count = db.execute_query(count_query, count_params)[0]["total"]
-        
-        # Convert database results to Bid objects - map to expected structure
-        bids = []
-        for bid_data in bids_data:
-            # Map database columns to Bid model fields
-            mapped_bid = {
-                "id": str(bid_data["id"]),
-                "name": bid_data["title"],
-                "description": bid_data["description"],
-                "bid_type": "contract",  # Default since simple table doesn't store this
-                "priority": "medium",    # Default since simple table doesn't store this
-                "start_date": datetime.utcnow(),  # Default since simple table doesn't store this
-                "end_date": datetime.utcnow(),    # Default since simple table doesn't store this
-                "submission_deadline": datetime.utcnow(),  # Default since simple table doesn't store this
-                "budget": bid_data["estimated_cost"],
-                "currency": "USD",  # Default since simple table doesn't store this
-                "requirements": None,
-                "terms_conditions": None,
-                "is_template": False,
-                "status": bid_data["status"],
-                "created_by": str(bid_data["created_by"]),
-                "created_at": bid_data["created_at"],
-                "updated_at": bid_data["updated_at"],
-                "published_at": None,
-                "closed_at": None,
-                "awarded_at": None,
-                "total_responses": 0,
-                "total_lanes": 1,
-                "total_carriers": 0
-            }
-            bids.append(Bid(**mapped_bid))
-        
-        return BidListResponse(
-            bids=bids,
-            total=total_count,
-            skip=skip,
-            limit=limit
-        )
+        return await list_bids(db, where_conditions, params, skip, limit, cursor, count)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting bids: {e}")
         raise HTTPException(
@@ -399,11 +484,60 @@ async def get_bids_dev(
         )
 
 
+EXPORT_COLUMNS = ["id", "title", "description", "lane_id", "estimated_cost", "status", "created_by", "created_at", "updated_at"]
+
+
+@router.get("/export")
+async def export_bids(
+    bid_status: Optional[str] = None,
+    lane_id: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    db = Depends(get_async_db)
+):
+    """Export bids as CSV, streamed straight from a server-side cursor"""
+    where_conditions = []
+    params = []
+    
+    if bid_status:
+        where_conditions.append("status = %s")
+        params.append(bid_status)
+    if lane_id:
+        where_conditions.append("lane_id = %s")
+        params.append(lane_id)
+    
+    # Regular users can only export their own bids
+    if current_user.role != "manager":
+        where_conditions.append("created_by = %s")
+        params.append(str(current_user.id))
+    
+    where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM bids WHERE {where_clause} ORDER BY created_at DESC"
+    
+    async def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        async for bid in db.iter_query(query, tuple(params)):
+            writer.writerow([bid.get(column) for column in EXPORT_COLUMNS])
+            # Flush roughly every 64KB so the client sees steady progress
+            if buffer.tell() >= 65536:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+    
+    return StreamingResponse(
+        generate_csv(),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=bids.csv"}
+    )
+
+
 @router.get("/{bid_id}", response_model=BidResponse)
 async def get_bid(
     bid_id: str,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get a specific bid by ID"""
     try:
@@ -412,10 +546,10 @@ async def get_bid(
             query = "SELECT * FROM bids WHERE id = %s"
             params = (bid_id,)
         else:
-            query = "SELECT * FROM bids WHERE id = %s AND user_id = %s"
+            query = "SELECT * FROM bids WHERE id = %s AND created_by = %s"
             params = (bid_id, str(current_user.id))
         
-        bids = db.execute_query(query, params)
+        bids = await db.execute_query(query, params, prepared=True)
         
         if not bids:
             raise HTTPException(
@@ -423,7 +557,7 @@ async def get_bid(
                 detail="Bid not found"
             )
         
-        bid = Bid(**bids[0])
+        bid = map_bid(bids[0])
         return BidResponse(
             bid=bid,
             message="Bid retrieved successfully"
@@ -440,60 +574,64 @@ async def get_bid(
 
 
 @router.put("/{bid_id}", response_model=BidResponse)
+@invalidates("bids")
 async def update_bid(
     bid_id: str,
     bid_data: BidUpdate,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Update bid information"""
     try:
-        # Check if bid exists and user has permission
-        if current_user.role == "manager":
-            existing_bids = db.execute_query("SELECT id FROM bids WHERE id = %s", (bid_id,))
-        else:
-            existing_bids = db.execute_query(
-                "SELECT id FROM bids WHERE id = %s AND user_id = %s",
-                (bid_id, str(current_user.id))
-            )
-        
-        if not existing_bids:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Bid not found"
-            )
-        
-        # Prepare update data
-        update_fields = []
-        params = []
-        
-        if bid_data.amount is not None:
-            update_fields.append("amount = %s")
-            params.append(bid_data.amount)
-        if bid_data.notes is not None:
-            update_fields.append("notes = %s")
-            params.append(bid_data.notes)
+        # Prepare update data, mapped onto the bids table columns
+        changes = {}
+        
+        if bid_data.name is not None:
+            changes["title"] = bid_data.name
+        if bid_data.description is not None:
+            changes["description"] = bid_data.description
+        if bid_data.budget is not None:
+            changes["estimated_cost"] = bid_data.budget
         if bid_data.status is not None:
-            update_fields.append("status = %s")
-            params.append(bid_data.status)
+            changes["status"] = bid_data.status.value
         
-        if not update_fields:
+        if not changes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No fields to update"
             )
         
-        update_fields.append("updated_at = %s")
-        params.append(datetime.utcnow())
-        params.append(bid_id)
-        
-        # Update bid
-        query = f"UPDATE bids SET {', '.join(update_fields)} WHERE id = %s"
-        db.execute_update(query, tuple(params))
-        
-        # Get updated bid
-        updated_bids = db.execute_query("SELECT * FROM bids WHERE id = %s", (bid_id,))
-        updated_bid = Bid(**updated_bids[0])
+        changes["updated_at"] = datetime.utcnow()
+        
+        async with db.transaction() as tx:
+            # Check if bid exists and user has permission, locking it against concurrent writers.
+            # The locked row is also the base of the returned bid, so nothing is re-read after the write.
+            if current_user.role == "manager":
+                existing_bids = await tx.execute_query("SELECT * FROM bids WHERE id = %s", (bid_id,), for_update=True)
+            else:
+                existing_bids = await tx.execute_query(
+                    "SELECT * FROM bids WHERE id = %s AND created_by = %s",
+                    (bid_id, str(current_user.id)),
+                    for_update=True
+                )
+            
+            if not existing_bids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Bid not found"
+                )
+            
+            # Update bid
+            existing_bid = existing_bids[0]
+            updated_bid_data = await tx.update_returning("bids", existing_bid, changes)
+            
+            if "status" in changes or "estimated_cost" in changes:
+                await record_bid_change(
+                    tx, existing_bid["created_by"],
+                    before=(existing_bid["status"], existing_bid["estimated_cost"]),
+                    after=(updated_bid_data["status"], updated_bid_data["estimated_cost"])
+                )
+        updated_bid = map_bid(updated_bid_data)
         
         return BidResponse(
             bid=updated_bid,
@@ -511,31 +649,43 @@ async def update_bid(
 
 
 @router.delete("/{bid_id}")
+@invalidates("bids")
 async def delete_bid(
     bid_id: str,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Delete a bid"""
     try:
-        # Check if bid exists and user has permission
-        if current_user.role == "manager":
-            existing_bids = db.execute_query("SELECT id FROM bids WHERE id = %s", (bid_id,))
-        else:
-            existing_bids = db.execute_query(
-                "SELECT id FROM bids WHERE id = %s AND user_id = %s",
-                (bid_id, str(current_user.id))
+        async with db.transaction() as tx:
+            # Check if bid exists and user has permission
+            if current_user.role == "manager":
+                existing_bids = await tx.execute_query(
+                    "SELECT id, created_by, status, estimated_cost FROM bids WHERE id = %s",
+                    (bid_id,),
+                    for_update=True
+                )
+            else:
+                existing_bids = await tx.execute_query(
+                    "SELECT id, created_by, status, estimated_cost FROM bids WHERE id = %s AND created_by = %s",
+                    (bid_id, str(current_user.id)),
+                    for_update=True
+                )
+            
+            if not existing_bids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Bid not found"
+                )
+            
+            # Delete bid
+            await tx.execute_delete("DELETE FROM bids WHERE id = %s", (bid_id,))
+            existing_bid = existing_bids[0]
+            await record_bid_change(
+                tx, existing_bid["created_by"],
+                before=(existing_bid["status"], existing_bid["estimated_cost"])
             )
         
-        if not existing_bids:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Bid not found"
-            )
-        
-        # Delete bid
-        db.execute_update("DELETE FROM bids WHERE id = %s", (bid_id,))
-        
         return {"message": "Bid deleted successfully"}
         
     except HTTPException:
@@ -549,26 +699,38 @@ async def delete_bid(
 
 
 @router.post("/{bid_id}/accept")
+@invalidates("bids")
 async def accept_bid(
     bid_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Accept a bid (managers only)"""
     try:
-        # Check if bid exists
-        existing_bids = db.execute_query("SELECT id FROM bids WHERE id = %s", (bid_id,))
-        if not existing_bids:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Bid not found"
+        async with db.transaction() as tx:
+            # Check if bid exists, locking it so concurrent accept/reject calls serialize
+            existing_bids = await tx.execute_query(
+                "SELECT id, created_by, status, estimated_cost FROM bids WHERE id = %s",
+                (bid_id,),
+                for_update=True
+            )
+            if not existing_bids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Bid not found"
+                )
+            
+            # Accept bid
+            await tx.execute_update(
+                "UPDATE bids SET status = 'accepted', updated_at = %s WHERE id = %s",
+                (datetime.utcnow(), bid_id)
+            )
+            existing_bid = existing_bids[0]
+            await record_bid_change(
+                tx, existing_bid["created_by"],
+                before=(existing_bid["status"], existing_bid["estimated_cost"]),
+                after=("accepted", existing_bid["estimated_cost"])
             )
-        
-        # Accept bid
-        db.execute_update(
-            "UPDATE bids SET status = 'accepted', updated_at = %s WHERE id = %s",
-            (datetime.utcnow(), bid_id)
-        )
         
         return {"message": "Bid accepted successfully"}
         
@@ -583,26 +745,38 @@ async def accept_bid(
 
 
 @router.post("/{bid_id}/reject")
+@invalidates("bids")
 async def reject_bid(
     bid_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Reject a bid (managers only)"""
     try:
-        # Check if bid exists
-        existing_bids = db.execute_query("SELECT id FROM bids WHERE id = %s", (bid_id,))
-        if not existing_bids:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Bid not found"
+        async with db.transaction() as tx:
+            # Check if bid exists, locking it so concurrent accept/reject calls serialize
+            existing_bids = await tx.execute_query(
+                "SELECT id, created_by, status, estimated_cost FROM bids WHERE id = %s",
+                (bid_id,),
+                for_update=True
+            )
+            if not existing_bids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Bid not found"
+                )
+            
+            # Reject bid
+            await tx.execute_update(
+                "UPDATE bids SET status = 'rejected', updated_at = %s WHERE id = %s",
+                (datetime.utcnow(), bid_id)
+            )
+            existing_bid = existing_bids[0]
+            await record_bid_change(
+                tx, existing_bid["created_by"],
+                before=(existing_bid["status"], existing_bid["estimated_cost"]),
+                after=("rejected", existing_bid["estimated_cost"])
             )
-        
-        # Reject bid
-        db.execute_update(
-            "UPDATE bids SET status = 'rejected', updated_at = %s WHERE id = %s",
-            (datetime.utcnow(), bid_id)
-        )
         
         return {"message": "Bid rejected successfully"}
         
@@ -616,57 +790,27 @@ async def reject_bid(
         )
 
 
+def bid_stats_scope(user: User) -> str:
+    """Managers share one cached summary; everyone else's covers only their own bids"""
+    return "all" if user.role == "manager" else by_user(user)
+
+
 @router.get("/stats/summary", response_model=BidStats)
+@cached("bids:stats", tags=("bids",), vary=bid_stats_scope)
 async def get_bid_stats(
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get bid statistics summary"""
     try:
-        # Build where clause based on user role
-        if current_user.role == "manager":
-            where_clause = "1=1"
-            params = []
-        else:
-            where_clause = "user_id = %s"
-            params = [str(current_user.id)]
-        
-        # Get total bids
-        total_query = f"SELECT COUNT(*) as total FROM bids WHERE {where_clause}"
-        total_result = db.execute_query(total_query, tuple(params))
-        total = total_result[0]["total"] if total_result else 0
-        
-        # Get accepted bids
-        accepted_query = f"SELECT COUNT(*) as total FROM bids WHERE status = 'accepted' AND {where_clause}"
-        accepted_result = db.execute_query(accepted_query, tuple(params))
-        accepted = accepted_result[0]["total"] if accepted_result else 0
-        
-        # Get pending bids
-        pending_query = f"SELECT COUNT(*) as total FROM bids WHERE status = 'pending' AND {where_clause}"
-        pending_result = db.execute_query(pending_query, tuple(params))
-        pending = pending_result[0]["total"] if pending_result else 0
-        
-        # Get rejected bids
-        rejected_query = f"SELECT COUNT(*) as total FROM bids WHERE status = 'rejected' AND {where_clause}"
-        rejected_result = db.execute_query(rejected_query, tuple(params))
-        rejected = rejected_result[0]["total"] if rejected_result else 0
-        
-        # Get average bid amount
-        avg_query = f"SELECT AVG(amount) as avg_amount FROM bids WHERE amount IS NOT NULL AND {where_clause}"
-        avg_result = db.execute_query(avg_query, tuple(params))
-        avg_amount = float(avg_result[0]["avg_amount"]) if avg_result and avg_result[0]["avg_amount"] else 0.0
-        
-        return BidStats(
-            total_bids=total,
-            accepted_bids=accepted,
-            pending_bids=pending,
-            rejected_bids=rejected,
-            average_amount=round(avg_amount, 2)
-        )
+        # Managers see every bid; everyone else only their own
+        user_id = None if current_user.role == "manager" else str(current_user.id)
+        stats = await compute_bid_stats(db, user_id)
+        return BidStats(**stats)
         
     except Exception as e:
         logger.error(f"Error getting bid stats: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
-        ) 
\ No newline at end of file
+        )
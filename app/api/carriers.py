@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
 from app.auth.dependencies import get_current_active_user, get_current_manager_user
-from app.database import get_db
+from app.database import get_async_db
+from app.response_cache import cached, invalidates
+from app.config import settings
+from app.counts import count_rows, COUNT_MODE_PATTERN
 from app.models.carrier import (
     Carrier, CarrierCreate, CarrierUpdate, CarrierResponse, 
     CarrierListResponse, CarrierStats
@@ -16,15 +19,16 @@ router = APIRouter(prefix="/carriers", tags=["Carriers"])
 
 
 @router.post("/", response_model=CarrierResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("carriers")
 async def create_carrier(
     carrier_data: CarrierCreate,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Create a new carrier"""
     try:
         # Check if carrier already exists
-        existing_carriers = db.execute_query("SELECT id FROM carriers WHERE email = %s", (carrier_data.email,))
+        existing_carriers = await db.execute_query("SELECT id FROM carriers WHERE email = %s", (carrier_data.email,), prepared=True)
         if existing_carriers:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -38,13 +42,25 @@ async def create_carrier(
         carrier_dict["updated_at"] = datetime.utcnow()
         
         # Insert carrier into database
-        carrier_id = db.execute_insert(
-            "INSERT INTO carriers (company_name, contact_person, email, phone, address, city, state, country, postal_code, mc_number, dot_number, insurance_info, rating, status, created_by, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-            (carrier_data.company_name, carrier_data.contact_person, carrier_data.email, carrier_data.phone, carrier_data.address, carrier_data.city, carrier_data.state, carrier_data.country, carrier_data.postal_code, carrier_data.mc_number, carrier_data.dot_number, carrier_data.insurance_info, carrier_data.rating, carrier_data.status, carrier_dict["created_by"], carrier_dict["created_at"], carrier_dict["updated_at"])
-        )
-        
-        # Get the created carrier
-        created_carrier_data = db.execute_query("SELECT * FROM carriers WHERE id = %s", (carrier_id,))[0]
+        created_carrier_data = await db.insert_returning("carriers", {
+            "company_name": carrier_data.company_name,
+            "contact_person": carrier_data.contact_person,
+            "email": carrier_data.email,
+            "phone": carrier_data.phone,
+            "address": carrier_data.address,
+            "city": carrier_data.city,
+            "state": carrier_data.state,
+            "country": carrier_data.country,
+            "postal_code": carrier_data.postal_code,
+            "mc_number": carrier_data.mc_number,
+            "dot_number": carrier_data.dot_number,
+            "insurance_info": carrier_data.insurance_info,
+            "rating": carrier_data.rating,
+            "status": carrier_data.status,
+            "created_by": carrier_dict["created_by"],
+            "created_at": carrier_dict["created_at"],
+            "updated_at": carrier_dict["updated_at"]
+        })
         created_carrier = Carrier(**created_carrier_data)
         
         return CarrierResponse(
@@ -69,8 +85,9 @@ async def get_carriers(
     carrier_status: Optional[str] = None,
     carrier_type: Optional[str] = None,
     service_level: Optional[str] = None,
+    count: str = Query(settings.list_count_default_mode, pattern=COUNT_MODE_PATTERN),
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get list of carriers with pagination and filtering"""
     try:
@@ -90,15 +107,13 @@ async def get_carriers(
         
         where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
         
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM carriers WHERE {where_clause}"
-        count_result = db.execute_query(count_query, tuple(params))
-        total = count_result[0]["total"] if count_result else 0
+        # Get total count using the requested strategy
+        total = await count_rows(db, "carriers", where_clause, params, mode=count)
         
         # Get paginated results
         query = f"SELECT * FROM carriers WHERE {where_clause} ORDER BY created_at DESC LIMIT %s OFFSET %s"
         params.extend([limit, skip])
-        carriers_data = db.execute_query(query, tuple(params))
+        carriers_data = await db.execute_query(query, tuple(params))
         
         carriers = [Carrier(**carrier_data) for carrier_data in carriers_data]
         
@@ -121,11 +136,11 @@ async def get_carriers(
 async def get_carrier(
     carrier_id: str,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get a specific carrier by ID"""
     try:
-        carriers = db.execute_query("SELECT * FROM carriers WHERE id = %s", (carrier_id,))
+        carriers = await db.execute_query("SELECT * FROM carriers WHERE id = %s", (carrier_id,))
         
         if not carriers:
             raise HTTPException(
@@ -150,16 +165,17 @@ async def get_carrier(
 
 
 @router.put("/{carrier_id}", response_model=CarrierResponse)
+@invalidates("carriers")
 async def update_carrier(
     carrier_id: str,
     carrier_data: CarrierUpdate,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Update carrier information"""
     try:
         # Check if carrier exists
-        existing_carriers = db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
+        existing_carriers = await db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
         if not existing_carriers:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -225,10 +241,10 @@ async def update_carrier(
         
         # Update carrier
         query = f"UPDATE carriers SET {', '.join(update_fields)} WHERE id = %s"
-        db.execute_update(query, tuple(params))
+        await db.execute_update(query, tuple(params))
         
         # Get updated carrier
-        updated_carriers = db.execute_query("SELECT * FROM carriers WHERE id = %s", (carrier_id,))
+        updated_carriers = await db.execute_query("SELECT * FROM carriers WHERE id = %s", (carrier_id,))
         updated_carrier = Carrier(**updated_carriers[0])
         
         return CarrierResponse(
@@ -247,15 +263,16 @@ async def update_carrier(
 
 
 @router.delete("/{carrier_id}")
+@invalidates("carriers")
 async def delete_carrier(
     carrier_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Delete a carrier (soft delete by setting status to inactive)"""
     try:
         # Check if carrier exists
-        existing_carriers = db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
+        existing_carriers = await db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
         if not existing_carriers:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -263,7 +280,7 @@ async def delete_carrier(
             )
         
         # Soft delete carrier
-        db.execute_update(
+        await db.execute_update(
             "UPDATE carriers SET status = 'inactive', updated_at = %s WHERE id = %s",
             (datetime.utcnow(), carrier_id)
         )
@@ -281,15 +298,16 @@ async def delete_carrier(
 
 
 @router.post("/{carrier_id}/approve")
+@invalidates("carriers")
 async def approve_carrier(
     carrier_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Approve a carrier account"""
     try:
         # Check if carrier exists
-        existing_carriers = db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
+        existing_carriers = await db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
         if not existing_carriers:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -297,7 +315,7 @@ async def approve_carrier(
             )
         
         # Approve carrier
-        db.execute_update(
+        await db.execute_update(
             "UPDATE carriers SET status = 'active', updated_at = %s WHERE id = %s",
             (datetime.utcnow(), carrier_id)
         )
@@ -315,15 +333,16 @@ async def approve_carrier(
 
 
 @router.post("/{carrier_id}/suspend")
+@invalidates("carriers")
 async def suspend_carrier(
     carrier_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Suspend a carrier account"""
     try:
         # Check if carrier exists
-        existing_carriers = db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
+        existing_carriers = await db.execute_query("SELECT id FROM carriers WHERE id = %s", (carrier_id,))
         if not existing_carriers:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -331,7 +350,7 @@ async def suspend_carrier(
             )
         
         # Suspend carrier
-        db.execute_update(
+        await db.execute_update(
             "UPDATE carriers SET status = 'suspended', updated_at = %s WHERE id = %s",
             (datetime.utcnow(), carrier_id)
         )
@@ -349,30 +368,31 @@ async def suspend_carrier(
 
 
 @router.get("/stats/summary", response_model=CarrierStats)
+@cached("carriers:stats", tags=("carriers",))
 async def get_carrier_stats(
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get carrier statistics summary"""
     try:
         # Get total carriers
-        total_carriers = db.execute_query("SELECT COUNT(*) as total FROM carriers")
+        total_carriers = await db.execute_query("SELECT COUNT(*) as total FROM carriers")
         total = total_carriers[0]["total"] if total_carriers else 0
         
         # Get active carriers
-        active_carriers = db.execute_query("SELECT COUNT(*) as total FROM carriers WHERE status = 'active'")
+        active_carriers = await db.execute_query("SELECT COUNT(*) as total FROM carriers WHERE status = 'active'")
         active = active_carriers[0]["total"] if active_carriers else 0
         
         # Get pending carriers
-        pending_carriers = db.execute_query("SELECT COUNT(*) as total FROM carriers WHERE status = 'pending'")
+        pending_carriers = await db.execute_query("SELECT COUNT(*) as total FROM carriers WHERE status = 'pending'")
         pending = pending_carriers[0]["total"] if pending_carriers else 0
         
         # Get suspended carriers
-        suspended_carriers = db.execute_query("SELECT COUNT(*) as total FROM carriers WHERE status = 'suspended'")
+        suspended_carriers = await db.execute_query("SELECT COUNT(*) as total FROM carriers WHERE status = 'suspended'")
         suspended = suspended_carriers[0]["total"] if suspended_carriers else 0
         
         # Get average rating
-        rating_result = db.execute_query("SELECT AVG(rating) as avg_rating FROM carriers WHERE rating IS NOT NULL")
+        rating_result = await db.execute_query("SELECT AVG(rating) as avg_rating FROM carriers WHERE rating IS NOT NULL")
         avg_rating = float(rating_result[0]["avg_rating"]) if rating_result and rating_result[0]["avg_rating"] else 0.0
         
         return CarrierStats(
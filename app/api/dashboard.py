@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from app.auth.dependencies import get_current_active_user, get_current_manager_user
-from app.database import get_db
+from app.database import get_async_db
+from app.response_cache import cached
 from app.models.user import User
+from app.services.dashboard_summary import get_cached_overview, freshness, fetch_recent_activity
+from app.services.dashboard_stream import dashboard_broadcaster
 from datetime import datetime, timedelta
 import logging
 
@@ -14,85 +18,15 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 @router.get("/overview")
 async def get_dashboard_overview(
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get dashboard overview with key metrics"""
     try:
-        # Get counts from all major tables using MySQL with proper error handling
-        users_response = db.execute_query("SELECT COUNT(*) as count FROM users WHERE status = 'active'")
-        carriers_response = db.execute_query("SELECT COUNT(*) as count, SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as active_count FROM carriers")
-        lanes_response = db.execute_query("SELECT COUNT(*) as count, SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as active_count FROM lanes")
-        bids_response = db.execute_query("SELECT COUNT(*) as count, SUM(CASE WHEN status = 'open' THEN 1 ELSE 0 END) as open_count, SUM(CASE WHEN status = 'awarded' THEN 1 ELSE 0 END) as awarded_count, SUM(estimated_cost) as total_value FROM bids")
-        bid_responses_response = db.execute_query("SELECT COUNT(*) as count, SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_count FROM bid_responses")
-        claims_response = db.execute_query("SELECT COUNT(*) as count, SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_count, SUM(amount) as total_amount FROM insurance_claims")
-        
-        # Extract values safely with defaults
-        total_users = users_response[0]["count"] if users_response else 0
-        total_carriers = carriers_response[0]["count"] if carriers_response else 0
-        active_carriers = carriers_response[0]["active_count"] if carriers_response else 0
-        total_lanes = lanes_response[0]["count"] if lanes_response else 0
-        active_lanes = lanes_response[0]["active_count"] if lanes_response else 0
-        total_bids = bids_response[0]["count"] if bids_response else 0
-        open_bids = bids_response[0]["open_count"] if bids_response else 0
-        awarded_bids = bids_response[0]["awarded_count"] if bids_response else 0
-        total_responses = bid_responses_response[0]["count"] if bid_responses_response else 0
-        pending_responses = bid_responses_response[0]["pending_count"] if bid_responses_response else 0
-        total_claims = claims_response[0]["count"] if claims_response else 0
-        pending_claims = claims_response[0]["pending_count"] if claims_response else 0
-        
-        # Calculate financial metrics
-        total_bid_value = float(bids_response[0]["total_value"] or 0) if bids_response else 0.0
-        total_awarded_value = 0.0  # Will be calculated separately for accuracy
-        total_claims_value = float(claims_response[0]["total_amount"] or 0) if claims_response else 0.0
-        
-        # Get awarded bids value separately for accuracy
-        if awarded_bids > 0:
-            awarded_bids_value = db.execute_query(
-                "SELECT SUM(estimated_cost) as total FROM bids WHERE status = 'awarded'"
-            )
-            total_awarded_value = float(awarded_bids_value[0]["total"] or 0) if awarded_bids_value else 0.0
-        
-        # Calculate utilization percentages
-        carrier_utilization = (active_carriers / total_carriers * 100) if total_carriers > 0 else 0
-        lane_utilization = (active_lanes / total_lanes * 100) if total_lanes > 0 else 0
-        bid_success_rate = (awarded_bids / total_bids * 100) if total_bids > 0 else 0
-        
+        summary = await get_cached_overview(db)
         return {
             "message": "Dashboard overview retrieved successfully",
-            "overview": {
-                "users": {
-                    "total": total_users
-                },
-                "carriers": {
-                    "total": total_carriers,
-                    "active": active_carriers,
-                    "utilization_percentage": round(carrier_utilization, 2)
-                },
-                "lanes": {
-                    "total": total_lanes,
-                    "active": active_lanes,
-                    "utilization_percentage": round(lane_utilization, 2)
-                },
-                "bids": {
-                    "total": total_bids,
-                    "open": open_bids,
-                    "awarded": awarded_bids,
-                    "success_rate_percentage": round(bid_success_rate, 2)
-                },
-                "responses": {
-                    "total": total_responses,
-                    "pending": pending_responses
-                },
-                "claims": {
-                    "total": total_claims,
-                    "pending": pending_claims
-                },
-                "financial": {
-                    "total_bid_value": total_bid_value,
-                    "total_awarded_value": total_awarded_value,
-                    "total_claims_value": total_claims_value
-                }
-            }
+            "overview": summary["overview"],
+            "freshness": freshness(summary)
         }
         
     except Exception as e:
@@ -103,53 +37,28 @@ async def get_dashboard_overview(
         )
 
 
+@router.get("/stream")
+async def stream_dashboard(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Server-sent events: a dashboard snapshot, then deltas as bids, lanes, carriers and claims change"""
+    return StreamingResponse(
+        dashboard_broadcaster.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/recent-activity")
+@cached("dashboard:recent-activity", tags=("bids", "lanes", "carriers"))
 async def get_recent_activity(
     limit: int = Query(10, ge=1, le=50, description="Number of recent activities to return"),
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get recent activity across the system"""
     try:
-        # Get recent activities from various tables using UNION for better performance
-        recent_activities_query = """
-            (SELECT 'bid' as type, id, created_at, status, 
-                    CONCAT('Bid #', id, ' was ', status) as description
-             FROM bids 
-             ORDER BY created_at DESC 
-             LIMIT %s)
-            UNION ALL
-            (SELECT 'lane' as type, id, created_at, status,
-                    CONCAT('Lane #', id, ' was ', status) as description
-             FROM lanes 
-             ORDER BY created_at DESC 
-             LIMIT %s)
-            UNION ALL
-            (SELECT 'carrier' as type, id, created_at, status,
-                    CONCAT('Carrier #', id, ' was ', status) as description
-             FROM carriers 
-             ORDER BY created_at DESC 
-             LIMIT %s)
-            ORDER BY created_at DESC 
-            LIMIT %s
-        """
-        
-        limit_per_table = max(1, limit // 3)
-        recent_activities = db.execute_query(
-            recent_activities_query,
-            (limit_per_table, limit_per_table, limit_per_table, limit)
-        )
-        
-        # Format the response
-        formatted_activities = []
-        for activity in recent_activities:
-            formatted_activities.append({
-                "type": activity["type"],
-                "id": activity["id"],
-                "action": f"{activity['type'].title()} {activity['status']}",
-                "timestamp": activity["created_at"],
-                "description": activity["description"]
-            })
+        formatted_activities = await fetch_recent_activity(db, limit)
         
         return {
             "message": "Recent activity retrieved successfully",
@@ -166,10 +75,11 @@ async def get_recent_activity(
 
 
 @router.get("/performance-metrics")
+@cached("dashboard:performance-metrics", tags=("bids", "lanes", "carriers"))
 async def get_performance_metrics(
     period: str = Query("30d", description="Time period: 7d, 30d, 90d, 1y"),
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get performance metrics for the specified time period"""
     try:
@@ -195,7 +105,7 @@ async def get_performance_metrics(
                 (SELECT COUNT(*) FROM carriers WHERE created_at >= %s) as total_carriers
         """
         
-        metrics_result = db.execute_query(
+        metrics_result = await db.execute_query(
             metrics_query,
             (start_date, start_date, start_date, start_date)
         )
@@ -235,14 +145,15 @@ async def get_performance_metrics(
 
 
 @router.get("/carrier-performance")
+@cached("dashboard:carrier-performance", tags=("carriers", "bids"))
 async def get_carrier_performance(
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get carrier performance metrics"""
     try:
         # Get carrier performance data with improved query
-        carrier_stats = db.execute_query("""
+        carrier_stats = await db.execute_query("""
             SELECT 
                 c.id,
                 c.company_name,
@@ -290,10 +201,11 @@ async def get_carrier_performance(
 
 
 @router.get("/financial-summary")
+@cached("dashboard:financial-summary", tags=("bids", "claims"))
 async def get_financial_summary(
     period: str = Query("30d", description="Time period: 7d, 30d, 90d, 1y"),
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get financial summary for the specified time period (managers only)"""
     try:
@@ -319,7 +231,7 @@ async def get_financial_summary(
                 (SELECT SUM(amount) FROM insurance_claims WHERE created_at >= %s) as total_claims_value
         """
         
-        financial_result = db.execute_query(
+        financial_result = await db.execute_query(
             financial_query,
             (start_date, start_date, start_date, start_date)
         )
@@ -361,13 +273,13 @@ async def get_financial_summary(
 @router.get("/system-health")
 async def get_system_health(
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get system health metrics (managers only)"""
     try:
         # Check database connectivity
         try:
-            db.execute_query("SELECT 1 as health_check")
+            await db.execute_query("SELECT 1 as health_check")
             db_status = "healthy"
         except Exception:
             db_status = "unhealthy"
@@ -383,7 +295,7 @@ async def get_system_health(
                 (SELECT COUNT(*) FROM carriers WHERE (contact_person IS NULL OR contact_person = '') AND status = 'active') as carriers_without_contact
         """
         
-        metrics_result = db.execute_query(system_metrics_query)
+        metrics_result = await db.execute_query(system_metrics_query)
         metrics = metrics_result[0] if metrics_result else {}
         
         total_users = metrics.get("total_users", 0)
@@ -404,6 +316,7 @@ async def get_system_health(
             "message": "System health metrics retrieved successfully",
             "system_health": {
                 "database": db_status,
+                "database_pool": db.pool_stats(),
                 "data_quality_score": round(max(0, data_quality_score), 2),
                 "total_records": {
                     "users": total_users,
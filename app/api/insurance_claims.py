@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
 from app.auth.dependencies import get_current_active_user, get_current_manager_user
 from app.database import get_db
+from app.response_cache import invalidates
 from app.models.insurance_claim import (
     InsuranceClaim, InsuranceClaimCreate, InsuranceClaimUpdate, 
     InsuranceClaimResponse, InsuranceClaimListResponse, InsuranceClaimStats
@@ -17,6 +18,7 @@ router = APIRouter(prefix="/insurance-claims", tags=["Insurance Claims"])
 
 
 @router.post("/", response_model=InsuranceClaimResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("claims")
 async def create_insurance_claim(
     claim_data: InsuranceClaimCreate,
     current_user: User = Depends(get_current_active_user),
@@ -135,6 +137,7 @@ async def get_insurance_claim(
 
 
 @router.put("/{claim_id}", response_model=InsuranceClaimResponse)
+@invalidates("claims")
 async def update_insurance_claim(
     claim_id: str,
     claim_data: InsuranceClaimUpdate,
@@ -181,6 +184,7 @@ async def update_insurance_claim(
 
 
 @router.delete("/{claim_id}")
+@invalidates("claims")
 async def delete_insurance_claim(
     claim_id: str,
     current_user: User = Depends(get_current_manager_user),
@@ -212,6 +216,7 @@ async def delete_insurance_claim(
 
 
 @router.post("/{claim_id}/approve")
+@invalidates("claims")
 async def approve_insurance_claim(
     claim_id: str,
     current_user: User = Depends(get_current_manager_user),
@@ -256,6 +261,7 @@ async def approve_insurance_claim(
 
 
 @router.post("/{claim_id}/reject")
+@invalidates("claims")
 async def reject_insurance_claim(
     claim_id: str,
     current_user: User = Depends(get_current_manager_user),
@@ -300,6 +306,7 @@ async def reject_insurance_claim(
 
 
 @router.post("/{claim_id}/settle")
+@invalidates("claims")
 async def settle_insurance_claim(
     claim_id: str,
     settlement_amount: float,
@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
 from app.auth.dependencies import get_current_active_user, get_current_manager_user
-from app.database import get_db
+from app.database import get_async_db
+from app.response_cache import cached, invalidates
+from app.config import settings
+from app.counts import count_rows, COUNT_MODE_PATTERN
 from app.models.lane import (
     Lane, LaneCreate, LaneUpdate, LaneResponse, LaneListResponse,
-    LaneStats, LaneFilter
+    LaneStats, LaneStatus, LaneType, VolumeUnit
 )
 from app.models.user import User
+from app.services.geo import lane_distance_km, KM_PER_MILE
 from datetime import datetime
 import logging
 
@@ -15,29 +20,86 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/lanes", tags=["Lanes"])
 
 
+async def _lane_distance_miles(db, origin_location_id: str, destination_location_id: str) -> Optional[float]:
+    """Great-circle distance between two locations_master locations in miles, if both have coordinates"""
+    distance_km = await lane_distance_km(db, origin_location_id, destination_location_id)
+    return distance_km / KM_PER_MILE if distance_km is not None else None
+
+
+def _whole_miles(distance_miles: Optional[float]) -> Optional[int]:
+    # lanes.distance_miles is an INT column
+    return int(round(distance_miles)) if distance_miles is not None else None
+
+
+def _transit_days(hours: Optional[int]) -> Optional[int]:
+    # lanes stores transit time in whole days
+    return -(-hours // 24) if hours is not None else None
+
+
+def _lane_from_row(lane_row: Dict[str, Any], lane_data: Optional[BaseModel] = None) -> Lane:
+    """
+    Map a row of the simple lanes table to the Lane model. Fields the table
+    does not store come from the request when it sent them, else defaults.
+    """
+    sent = lane_data.model_dump(exclude_none=True) if lane_data is not None else {}
+    transit_days = lane_row.get("estimated_transit_days")
+    return Lane(**{
+        # Defaults since the simple table doesn't store these
+        "name": f"{lane_row['origin_city']}, {lane_row['origin_state']} - "
+                f"{lane_row['destination_city']}, {lane_row['destination_state']}",
+        "origin_zip": "00000",
+        "destination_zip": "00000",
+        "lane_type": LaneType.TRUCKLOAD,
+        "volume": 0,
+        "volume_unit": VolumeUnit.LOADS,
+        "frequency": "",
+        **sent,
+        "id": str(lane_row["id"]),
+        "origin_city": lane_row["origin_city"],
+        "origin_state": lane_row["origin_state"],
+        "destination_city": lane_row["destination_city"],
+        "destination_state": lane_row["destination_state"],
+        "origin_location_id": lane_row.get("origin_location_id"),
+        "destination_location_id": lane_row.get("destination_location_id"),
+        "distance_miles": lane_row.get("distance_miles"),
+        "estimated_transit_time_hours": transit_days * 24 if transit_days is not None else None,
+        "status": lane_row.get("status") or LaneStatus.ACTIVE,
+        "created_at": lane_row["created_at"],
+        "updated_at": lane_row["updated_at"]
+    })
+
+
 @router.post("/", response_model=LaneResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("lanes")
 async def create_lane(
     lane_data: LaneCreate,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Create a new lane"""
     try:
-        # Create lane data
-        lane_dict = lane_data.dict()
-        lane_dict["created_by"] = str(current_user.id)
-        lane_dict["created_at"] = datetime.utcnow()
-        lane_dict["updated_at"] = datetime.utcnow()
-        
-        # Insert lane into database
-        lane_id = db.execute_insert(
-            "INSERT INTO lanes (origin, destination, equipment_type, weight, volume, pickup_date, delivery_date, special_requirements, status, created_by, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-            (lane_data.origin, lane_data.destination, lane_data.equipment_type, lane_data.weight, lane_data.volume, lane_data.pickup_date, lane_data.delivery_date, lane_data.special_requirements, lane_data.status, lane_dict["created_by"], lane_dict["created_at"], lane_dict["updated_at"])
-        )
-        
-        # Get the created lane
-        created_lane_data = db.execute_query("SELECT * FROM lanes WHERE id = %s", (lane_id,))[0]
-        created_lane = Lane(**created_lane_data)
+        now = datetime.utcnow()
+        
+        # Measure the lane from its locations when no distance was given
+        distance_miles = lane_data.distance_miles
+        if distance_miles is None and lane_data.origin_location_id and lane_data.destination_location_id:
+            distance_miles = await _lane_distance_miles(db, lane_data.origin_location_id,
+                                                        lane_data.destination_location_id)
+        
+        # Insert lane into database - map to simple lanes table structure
+        created_lane_data = await db.insert_returning("lanes", {
+            "origin_city": lane_data.origin_city,
+            "origin_state": lane_data.origin_state,
+            "destination_city": lane_data.destination_city,
+            "destination_state": lane_data.destination_state,
+            "origin_location_id": lane_data.origin_location_id,
+            "destination_location_id": lane_data.destination_location_id,
+            "distance_miles": _whole_miles(distance_miles),
+            "estimated_transit_days": _transit_days(lane_data.estimated_transit_time_hours),
+            "created_at": now,
+            "updated_at": now
+        }, defaults={"status": "active"})
+        created_lane = _lane_from_row(created_lane_data, lane_data)
         
         return LaneResponse(
             lane=created_lane,
@@ -62,8 +124,9 @@ async def get_lanes(
     equipment_type: Optional[str] = None,
     origin: Optional[str] = None,
     destination: Optional[str] = None,
+    count: str = Query(settings.list_count_default_mode, pattern=COUNT_MODE_PATTERN),
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get list of lanes with pagination and filtering"""
     try:
@@ -86,15 +149,13 @@ async def get_lanes(
         
         where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
         
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM lanes WHERE {where_clause}"
-        count_result = db.execute_query(count_query, tuple(params))
-        total = count_result[0]["total"] if count_result else 0
+        # Get total count using the requested strategy
+        total = await count_rows(db, "lanes", where_clause, params, mode=count)
         
         # Get paginated results
         query = f"SELECT * FROM lanes WHERE {where_clause} ORDER BY created_at DESC LIMIT %s OFFSET %s"
         params.extend([limit, skip])
-        lanes_data = db.execute_query(query, tuple(params))
+        lanes_data = await db.execute_query(query, tuple(params))
         
         lanes = [Lane(**lane_data) for lane_data in lanes_data]
         
@@ -117,11 +178,11 @@ async def get_lanes(
 async def get_lane(
     lane_id: str,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get a specific lane by ID"""
     try:
-        lanes = db.execute_query("SELECT * FROM lanes WHERE id = %s", (lane_id,))
+        lanes = await db.execute_query("SELECT * FROM lanes WHERE id = %s", (lane_id,))
         
         if not lanes:
             raise HTTPException(
@@ -146,71 +207,69 @@ async def get_lane(
 
 
 @router.put("/{lane_id}", response_model=LaneResponse)
+@invalidates("lanes")
 async def update_lane(
     lane_id: str,
     lane_data: LaneUpdate,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Update lane information"""
     try:
-        # Check if lane exists
-        existing_lanes = db.execute_query("SELECT id FROM lanes WHERE id = %s", (lane_id,))
-        if not existing_lanes:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Lane not found"
-            )
-        
-        # Prepare update data
-        update_fields = []
-        params = []
-        
-        if lane_data.origin is not None:
-            update_fields.append("origin = %s")
-            params.append(lane_data.origin)
-        if lane_data.destination is not None:
-            update_fields.append("destination = %s")
-            params.append(lane_data.destination)
-        if lane_data.equipment_type is not None:
-            update_fields.append("equipment_type = %s")
-            params.append(lane_data.equipment_type)
-        if lane_data.weight is not None:
-            update_fields.append("weight = %s")
-            params.append(lane_data.weight)
-        if lane_data.volume is not None:
-            update_fields.append("volume = %s")
-            params.append(lane_data.volume)
-        if lane_data.pickup_date is not None:
-            update_fields.append("pickup_date = %s")
-            params.append(lane_data.pickup_date)
-        if lane_data.delivery_date is not None:
-            update_fields.append("delivery_date = %s")
-            params.append(lane_data.delivery_date)
-        if lane_data.special_requirements is not None:
-            update_fields.append("special_requirements = %s")
-            params.append(lane_data.special_requirements)
+        # Prepare update data, mapped onto the lanes table columns
+        changes = {}
+        
+        if lane_data.origin_city is not None:
+            changes["origin_city"] = lane_data.origin_city
+        if lane_data.origin_state is not None:
+            changes["origin_state"] = lane_data.origin_state
+        if lane_data.destination_city is not None:
+            changes["destination_city"] = lane_data.destination_city
+        if lane_data.destination_state is not None:
+            changes["destination_state"] = lane_data.destination_state
+        if lane_data.origin_location_id is not None:
+            changes["origin_location_id"] = lane_data.origin_location_id
+        if lane_data.destination_location_id is not None:
+            changes["destination_location_id"] = lane_data.destination_location_id
+        if lane_data.distance_miles is not None:
+            changes["distance_miles"] = _whole_miles(lane_data.distance_miles)
+        if lane_data.estimated_transit_time_hours is not None:
+            changes["estimated_transit_days"] = _transit_days(lane_data.estimated_transit_time_hours)
         if lane_data.status is not None:
-            update_fields.append("status = %s")
-            params.append(lane_data.status)
+            changes["status"] = lane_data.status.value
         
-        if not update_fields:
+        if not changes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No fields to update"
             )
         
-        update_fields.append("updated_at = %s")
-        params.append(datetime.utcnow())
-        params.append(lane_id)
-        
-        # Update lane
-        query = f"UPDATE lanes SET {', '.join(update_fields)} WHERE id = %s"
-        db.execute_update(query, tuple(params))
-        
-        # Get updated lane
-        updated_lanes = db.execute_query("SELECT * FROM lanes WHERE id = %s", (lane_id,))
-        updated_lane = Lane(**updated_lanes[0])
+        changes["updated_at"] = datetime.utcnow()
+        
+        async with db.transaction() as tx:
+            # Check if lane exists, locking it against concurrent writers.
+            # The locked row is also the base of the returned lane, so nothing is re-read after the write.
+            existing_lanes = await tx.execute_query("SELECT * FROM lanes WHERE id = %s", (lane_id,), for_update=True)
+            if not existing_lanes:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Lane not found"
+                )
+            existing_lane = existing_lanes[0]
+            
+            # Re-measure a lane whose locations moved unless the caller sent its distance
+            if lane_data.distance_miles is None and ("origin_location_id" in changes
+                                                     or "destination_location_id" in changes):
+                origin = changes.get("origin_location_id", existing_lane.get("origin_location_id"))
+                destination = changes.get("destination_location_id", existing_lane.get("destination_location_id"))
+                if origin and destination:
+                    distance_miles = await _lane_distance_miles(tx, origin, destination)
+                    if distance_miles is not None:
+                        changes["distance_miles"] = _whole_miles(distance_miles)
+            
+            # Update lane
+            updated_lane_data = await tx.update_returning("lanes", existing_lane, changes)
+        updated_lane = _lane_from_row(updated_lane_data, lane_data)
         
         return LaneResponse(
             lane=updated_lane,
@@ -228,15 +287,16 @@ async def update_lane(
 
 
 @router.delete("/{lane_id}")
+@invalidates("lanes")
 async def delete_lane(
     lane_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Delete a lane (soft delete by setting status to inactive)"""
     try:
         # Check if lane exists
-        existing_lanes = db.execute_query("SELECT id FROM lanes WHERE id = %s", (lane_id,))
+        existing_lanes = await db.execute_query("SELECT id FROM lanes WHERE id = %s", (lane_id,))
         if not existing_lanes:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -244,7 +304,7 @@ async def delete_lane(
             )
         
         # Soft delete lane
-        db.execute_update(
+        await db.execute_update(
             "UPDATE lanes SET status = 'inactive', updated_at = %s WHERE id = %s",
             (datetime.utcnow(), lane_id)
         )
@@ -262,15 +322,16 @@ async def delete_lane(
 
 
 @router.post("/{lane_id}/publish")
+@invalidates("lanes")
 async def publish_lane(
     lane_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Publish a lane to make it visible to carriers"""
     try:
         # Check if lane exists
-        existing_lanes = db.execute_query("SELECT id FROM lanes WHERE id = %s", (lane_id,))
+        existing_lanes = await db.execute_query("SELECT id FROM lanes WHERE id = %s", (lane_id,))
         if not existing_lanes:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -285,7 +346,7 @@ async def publish_lane(
             )
         
         # Update lane status
-        db.execute_update(
+        await db.execute_update(
             "UPDATE lanes SET status = 'published', published_at = %s, updated_at = %s WHERE id = %s",
             (datetime.utcnow(), datetime.utcnow(), lane_id)
         )
@@ -303,15 +364,16 @@ async def publish_lane(
 
 
 @router.post("/{lane_id}/close")
+@invalidates("lanes")
 async def close_lane(
     lane_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Close a lane to stop accepting bids"""
     try:
         # Check if lane exists
-        existing_lanes = db.execute_query("SELECT id FROM lanes WHERE id = %s", (lane_id,))
+        existing_lanes = await db.execute_query("SELECT id FROM lanes WHERE id = %s", (lane_id,))
         if not existing_lanes:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -326,7 +388,7 @@ async def close_lane(
             )
         
         # Update lane status
-        db.execute_update(
+        await db.execute_update(
             "UPDATE lanes SET status = 'closed', closed_at = %s, updated_at = %s WHERE id = %s",
             (datetime.utcnow(), datetime.utcnow(), lane_id)
         )
@@ -344,30 +406,31 @@ async def close_lane(
 
 
 @router.get("/stats/summary", response_model=LaneStats)
+@cached("lanes:stats", tags=("lanes",))
 async def get_lane_stats(
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get lane statistics summary"""
     try:
         # Get total lanes
-        total_lanes = db.execute_query("SELECT COUNT(*) as total FROM lanes")
+        total_lanes = await db.execute_query("SELECT COUNT(*) as total FROM lanes")
         total = total_lanes[0]["total"] if total_lanes else 0
         
         # Get published lanes
-        published_lanes = db.execute_query("SELECT COUNT(*) as total FROM lanes WHERE status = 'published'")
+        published_lanes = await db.execute_query("SELECT COUNT(*) as total FROM lanes WHERE status = 'published'")
         published = published_lanes[0]["total"] if published_lanes else 0
         
         # Get open lanes
-        open_lanes = db.execute_query("SELECT COUNT(*) as total FROM lanes WHERE status = 'open'")
+        open_lanes = await db.execute_query("SELECT COUNT(*) as total FROM lanes WHERE status = 'open'")
         open_count = open_lanes[0]["total"] if open_lanes else 0
         
         # Get closed lanes
-        closed_lanes = db.execute_query("SELECT COUNT(*) as total FROM lanes WHERE status = 'closed'")
+        closed_lanes = await db.execute_query("SELECT COUNT(*) as total FROM lanes WHERE status = 'closed'")
         closed = closed_lanes[0]["total"] if closed_lanes else 0
         
         # Get lanes by equipment type
-        equipment_stats = db.execute_query(
+        equipment_stats = await db.execute_query(
             "SELECT equipment_type, COUNT(*) as count FROM lanes GROUP BY equipment_type"
         )
         lanes_by_equipment = {row["equipment_type"]: row["count"] for row in equipment_stats}
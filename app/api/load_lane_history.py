@@ -15,9 +15,30 @@ from app.models.load_lane_history import (
 )
 from app.auth.dependencies import get_current_user
 from app.models.user import User
+from app.services.geo import haversine_km
 
 router = APIRouter(prefix="/api/v1/load-lane-history", tags=["Load/Lane History"])
 
+
+def fill_distance_and_rate(db_load: LoadLaneHistoryDB):
+    """
+    Fill in a missing ``distance_km`` from the origin/destination coordinates
+    and a missing ``rate_per_km`` from the total cost over that distance
+    """
+    coordinates = (db_load.origin_latitude, db_load.origin_longitude,
+                   db_load.destination_latitude, db_load.destination_longitude)
+    if db_load.distance_km is None and all(value is not None for value in coordinates):
+        db_load.distance_km = Decimal(str(round(float(haversine_km(*coordinates)), 2)))
+    if db_load.rate_per_km is None and db_load.distance_km and db_load.total_cost is not None:
+        db_load.rate_per_km = (Decimal(db_load.total_cost) / Decimal(db_load.distance_km)).quantize(Decimal("0.01"))
+
+
+# Stored rate per km, else total cost over distance for loads recorded without one
+effective_rate_per_km = func.coalesce(
+    LoadLaneHistoryDB.rate_per_km,
+    LoadLaneHistoryDB.total_cost / func.nullif(LoadLaneHistoryDB.distance_km, 0)
+)
+
 @router.post("/", response_model=LoadLaneHistoryResponse)
 async def create_load_lane_history(
     load_data: LoadLaneHistoryCreate,
@@ -42,6 +63,7 @@ async def create_load_lane_history(
             **load_data.dict(),
             created_by=current_user.id
         )
+        fill_distance_and_rate(db_load)
         
         db.add(db_load)
         db.commit()
@@ -154,6 +176,7 @@ async def update_load_lane_history(
         update_data = load_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_load, field, value)
+        fill_distance_and_rate(db_load)
         
         db_load.updated_at = datetime.utcnow()
         
@@ -221,9 +244,8 @@ async def get_load_lane_history_summary(
         ).scalar()
         
         # Calculate average rate per km
-        avg_rate_query = query.filter(LoadLaneHistoryDB.rate_per_km.isnot(None))
-        average_rate_per_km = avg_rate_query.with_entities(
-            func.avg(LoadLaneHistoryDB.rate_per_km)
+        average_rate_per_km = query.with_entities(
+            func.avg(effective_rate_per_km)
         ).scalar()
         
         # Calculate on-time delivery rate
@@ -255,7 +277,7 @@ async def get_load_lane_history_summary(
             LoadLaneHistoryDB.origin_location,
             LoadLaneHistoryDB.destination_location,
             func.count(LoadLaneHistoryDB.id).label('count'),
-            func.avg(LoadLaneHistoryDB.rate_per_km).label('avg_rate')
+            func.avg(effective_rate_per_km).label('avg_rate')
         ).filter(
             LoadLaneHistoryDB.origin_location.isnot(None),
             LoadLaneHistoryDB.destination_location.isnot(None)
@@ -271,7 +293,7 @@ async def get_load_lane_history_summary(
             LoadLaneHistoryDB.carrier_name,
             func.count(LoadLaneHistoryDB.id).label('count'),
             func.sum(LoadLaneHistoryDB.total_cost).label('total_cost'),
-            func.avg(LoadLaneHistoryDB.rate_per_km).label('avg_rate')
+            func.avg(effective_rate_per_km).label('avg_rate')
         ).filter(
             LoadLaneHistoryDB.carrier_name.isnot(None)
         ).group_by(
@@ -339,9 +361,9 @@ async def get_lane_performance_analytics(
             LoadLaneHistoryDB.mode,
             LoadLaneHistoryDB.equipment_type,
             func.count(LoadLaneHistoryDB.id).label('total_loads'),
-            func.avg(LoadLaneHistoryDB.rate_per_km).label('avg_rate_per_km'),
-            func.min(LoadLaneHistoryDB.rate_per_km).label('min_rate_per_km'),
-            func.max(LoadLaneHistoryDB.rate_per_km).label('max_rate_per_km'),
+            func.avg(effective_rate_per_km).label('avg_rate_per_km'),
+            func.min(effective_rate_per_km).label('min_rate_per_km'),
+            func.max(effective_rate_per_km).label('max_rate_per_km'),
             func.avg(LoadLaneHistoryDB.total_cost).label('avg_total_cost'),
             func.avg(LoadLaneHistoryDB.distance_km).label('avg_distance'),
             func.avg(
@@ -353,7 +375,7 @@ async def get_lane_performance_analytics(
         ).filter(
             LoadLaneHistoryDB.origin_location.isnot(None),
             LoadLaneHistoryDB.destination_location.isnot(None),
-            LoadLaneHistoryDB.rate_per_km.isnot(None)
+            effective_rate_per_km.isnot(None)
         ).group_by(
             LoadLaneHistoryDB.origin_location,
             LoadLaneHistoryDB.destination_location,
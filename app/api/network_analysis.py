@@ -1,27 +1,114 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from app.auth.dependencies import get_current_active_user, get_current_manager_user
-from app.database import get_db
+from app.database import get_async_db
+from app.counts import count_rows
 from app.models.network_analysis import (
-    NetworkAnalysis, NetworkAnalysisCreate, NetworkAnalysisUpdate,
+    NetworkAnalysis, NetworkAnalysisCreate, NetworkAnalysisUpdate, NetworkAnalysisSummary,
     NetworkAnalysisResponse, NetworkAnalysisListResponse, NetworkOptimizationRequest,
-    NetworkAnalysisStats, NetworkAnalysisSearchParams, AnalysisResult, AnalysisSummary
+    NetworkAnalysisStats, NetworkAnalysisSearchParams, AnalysisResult, AnalysisSummary,
+    TopCarriersRequest, AnalysisStatus
 )
 from app.models.user import User
-from supabase import Client
+from app.services.carrier_scoring import ScoringFeatures, top_k
+from app.services.geo import carrier_lane_distances_km, lane_rows_distance_km
+from app.services.analysis_jobs import analysis_jobs, JobQueueFullError
+from app.services.route_optimizer import optimize_network, SolverUnavailableError
+from app.services.spatial_index import location_index
 from datetime import datetime, timedelta
+import json
 import logging
+import math
+import uuid
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/network-analysis", tags=["Network Analysis"])
 
 
+# Columns of network_analysis stored as JSON
+JSON_COLUMNS = ("metrics", "filters", "parameters", "results", "summary", "recommendations")
+
+# Request fields written as-is; dates and status are handled by the caller
+ANALYSIS_FIELDS = ("name", "analysis_type", "description", "metrics", "filters", "parameters", "notes")
+
+
+def _finite_or_none(value) -> Optional[float]:
+    """JSON-safe distance: unknown (NaN) becomes None"""
+    return round(float(value), 2) if math.isfinite(value) else None
+
+
+def _json_column(value):
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _analysis_columns(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """network_analysis column values for request ``fields`` dumped in JSON mode"""
+    return {
+        field: json.dumps(fields[field]) if field in JSON_COLUMNS and fields[field] is not None else fields[field]
+        for field in ANALYSIS_FIELDS if field in fields
+    }
+
+
+def _analysis_from_row(analysis_row: Dict[str, Any]) -> NetworkAnalysis:
+    """Map a network_analysis row (JSON columns as text) to the NetworkAnalysis model"""
+    analysis = {column: _json_column(value) if column in JSON_COLUMNS else value
+                for column, value in analysis_row.items()}
+    analysis["id"] = str(analysis["id"])
+    analysis["created_by"] = str(analysis["created_by"]) if analysis.get("created_by") is not None else ""
+    if analysis.get("execution_time_seconds") is not None:
+        analysis["execution_time_seconds"] = float(analysis["execution_time_seconds"])
+    return NetworkAnalysis(**analysis)
+
+
+def _analysis_filters(analysis_type: Optional[str] = None, status: Optional[str] = None,
+                      created_by: Optional[str] = None,
+                      start_date_from: Optional[datetime] = None, start_date_to: Optional[datetime] = None,
+                      end_date_from: Optional[datetime] = None,
+                      end_date_to: Optional[datetime] = None) -> Tuple[str, List[Any]]:
+    """WHERE clause and parameters for the list and search filters"""
+    conditions = []
+    params = []
+    for column, operator, value in (
+        ("analysis_type", "=", analysis_type),
+        ("status", "=", status),
+        ("created_by", "=", created_by),
+        ("start_date", ">=", start_date_from),
+        ("start_date", "<=", start_date_to),
+        ("end_date", ">=", end_date_from),
+        ("end_date", "<=", end_date_to)
+    ):
+        if value is not None:
+            conditions.append(f"{column} {operator} %s")
+            params.append(value)
+    return " AND ".join(conditions) if conditions else "1=1", params
+
+
+async def _page_of_analyses(db, where_clause: str, params: List[Any], skip: int,
+                            limit: int) -> Tuple[int, List[NetworkAnalysis]]:
+    total = await count_rows(db, "network_analysis", where_clause, params)
+    rows = await db.execute_query(
+        f"SELECT * FROM network_analysis WHERE {where_clause} ORDER BY created_at DESC LIMIT %s OFFSET %s",
+        (*params, limit, skip)
+    )
+    return total, [_analysis_from_row(row) for row in rows]
+
+
+async def _count_by_status(db, table: str) -> Dict[str, int]:
+    """Row count of ``table`` per status, aggregated by the server"""
+    rows = await db.execute_query(f"SELECT status, COUNT(*) as total FROM {table} GROUP BY status")
+    counts: Dict[str, int] = {}
+    for row in rows:
+        row_status = row.get("status") or "unknown"
+        counts[row_status] = counts.get(row_status, 0) + int(row["total"])
+    return counts
+
+
 @router.post("/", response_model=NetworkAnalysisResponse, status_code=status.HTTP_201_CREATED)
 async def create_network_analysis(
     analysis_data: NetworkAnalysisCreate,
     current_user: User = Depends(get_current_manager_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Create a new network analysis"""
     try:
@@ -33,30 +120,29 @@ async def create_network_analysis(
             )
         
         # Check if analysis with same name exists
-        existing_analysis = db.table("network_analysis").select("id").eq("name", analysis_data.name).execute()
-        if existing_analysis.data:
+        existing_analysis = await db.execute_query(
+            "SELECT id FROM network_analysis WHERE name = %s", (analysis_data.name,)
+        )
+        if existing_analysis:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Analysis with this name already exists"
             )
         
-        # Create analysis data
-        analysis_dict = analysis_data.dict()
-        analysis_dict["created_by"] = str(current_user.id)
-        analysis_dict["created_at"] = datetime.utcnow().isoformat()
-        analysis_dict["updated_at"] = datetime.utcnow().isoformat()
-        analysis_dict["status"] = "pending"
-        
-        # Insert analysis into database
-        response = db.table("network_analysis").insert(analysis_dict).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create network analysis"
-            )
-        
-        created_analysis = NetworkAnalysis(**response.data[0])
+        # The key is a UUID, so it is generated here rather than read back
+        now = datetime.utcnow()
+        analysis_row = {
+            "id": str(uuid.uuid4()),
+            **_analysis_columns(analysis_data.model_dump(mode="json")),
+            "start_date": analysis_data.start_date,
+            "end_date": analysis_data.end_date,
+            "status": AnalysisStatus.PENDING.value,
+            "created_by": current_user.id,
+            "created_at": now,
+            "updated_at": now
+        }
+        created_analysis_data = await db.insert_returning("network_analysis", analysis_row)
+        created_analysis = _analysis_from_row({**created_analysis_data, "id": analysis_row["id"]})
         
         logger.info(f"Network analysis '{analysis_data.name}' created by user {current_user.id}")
         
@@ -85,35 +171,21 @@ async def get_network_analyses(
     start_date_from: Optional[datetime] = Query(None, description="Filter by start date from"),
     start_date_to: Optional[datetime] = Query(None, description="Filter by start date to"),
     current_user: User = Depends(get_current_active_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get list of network analyses with pagination and filtering"""
     try:
-        query = db.table("network_analysis").select("*")
-        
-        # Apply filters
-        if analysis_type:
-            query = query.eq("analysis_type", analysis_type)
-        if analysis_status:
-            query = query.eq("status", analysis_status)
-        if created_by:
-            query = query.eq("created_by", created_by)
-        if start_date_from:
-            query = query.gte("start_date", start_date_from.isoformat())
-        if start_date_to:
-            query = query.lte("start_date", start_date_to.isoformat())
-        
-        # Get total count
-        count_response = query.execute()
-        total = len(count_response.data)
-        
-        # Apply pagination
-        response = query.range(skip, skip + limit - 1).execute()
-        
-        analyses = [NetworkAnalysis(**analysis_data) for analysis_data in response.data]
+        where_clause, params = _analysis_filters(
+            analysis_type=analysis_type,
+            status=analysis_status,
+            created_by=created_by,
+            start_date_from=start_date_from,
+            start_date_to=start_date_to
+        )
+        total, analyses = await _page_of_analyses(db, where_clause, params, skip, limit)
         
         return NetworkAnalysisListResponse(
-            network_analyses=analyses,
+            network_analyses=[NetworkAnalysisSummary(**analysis.model_dump()) for analysis in analyses],
             total=total,
             page=skip // limit + 1,
             size=limit
@@ -131,19 +203,19 @@ async def get_network_analyses(
 async def get_network_analysis(
     analysis_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get a specific network analysis by ID"""
     try:
-        response = db.table("network_analysis").select("*").eq("id", analysis_id).execute()
+        rows = await db.execute_query("SELECT * FROM network_analysis WHERE id = %s", (analysis_id,))
         
-        if not response.data:
+        if not rows:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Network analysis not found"
             )
         
-        analysis = NetworkAnalysis(**response.data[0])
+        analysis = _analysis_from_row(rows[0])
         return NetworkAnalysisResponse(
             network_analysis=analysis,
             message="Network analysis retrieved successfully"
@@ -164,48 +236,65 @@ async def update_network_analysis(
     analysis_id: str,
     analysis_data: NetworkAnalysisUpdate,
     current_user: User = Depends(get_current_manager_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Update a network analysis"""
     try:
-        # Check if analysis exists
-        existing_analysis = db.table("network_analysis").select("*").eq("id", analysis_id).execute()
-        if not existing_analysis.data:
+        # Running and completing are the job runner's transitions (see /start)
+        if analysis_data.status in (AnalysisStatus.IN_PROGRESS, AnalysisStatus.COMPLETED):
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Network analysis not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Status '{analysis_data.status.value}' is set by running the analysis"
             )
         
-        # Validate date range if both dates are provided
-        if analysis_data.start_date and analysis_data.end_date:
-            if analysis_data.start_date >= analysis_data.end_date:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Start date must be before end date"
-                )
-        
-        # Check if analysis is in progress or completed (cannot modify)
-        current_status = existing_analysis.data[0].get("status")
-        if current_status in ["in_progress", "completed"]:
+        # Prepare update data
+        sent = analysis_data.model_dump(mode="json", exclude_unset=True)
+        changes = _analysis_columns(sent)
+        for column in ("start_date", "end_date"):
+            if column in sent:
+                changes[column] = getattr(analysis_data, column)
+        if "status" in sent:
+            changes["status"] = sent["status"]
+        
+        if not changes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot modify analysis with status '{current_status}'"
+                detail="No fields to update"
             )
         
-        # Prepare update data
-        update_dict = analysis_data.dict(exclude_unset=True)
-        update_dict["updated_at"] = datetime.utcnow().isoformat()
-        
-        # Update analysis
-        response = db.table("network_analysis").update(update_dict).eq("id", analysis_id).execute()
+        changes["updated_at"] = datetime.utcnow()
         
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update network analysis"
+        async with db.transaction() as tx:
+            # Check if analysis exists, locking it so a concurrent /start cannot slip in between
+            existing_analysis = await tx.execute_query(
+                "SELECT * FROM network_analysis WHERE id = %s", (analysis_id,), for_update=True
             )
-        
-        updated_analysis = NetworkAnalysis(**response.data[0])
+            if not existing_analysis:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Network analysis not found"
+                )
+            
+            # Check if analysis is in progress or completed (cannot modify)
+            current_status = existing_analysis[0].get("status")
+            if current_status in ["in_progress", "completed"]:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot modify analysis with status '{current_status}'"
+                )
+            
+            # Validate the date range the row will have
+            start_date = changes.get("start_date", existing_analysis[0].get("start_date"))
+            end_date = changes.get("end_date", existing_analysis[0].get("end_date"))
+            if start_date and end_date and start_date >= end_date:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Start date must be before end date"
+                )
+            
+            # Update analysis
+            updated_analysis_data = await tx.update_returning("network_analysis", existing_analysis[0], changes)
+        updated_analysis = _analysis_from_row(updated_analysis_data)
         logger.info(f"Network analysis {analysis_id} updated by user {current_user.id}")
         
         return NetworkAnalysisResponse(
@@ -227,28 +316,31 @@ async def update_network_analysis(
 async def delete_network_analysis(
     analysis_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Delete a network analysis (managers only)"""
     try:
-        # Check if analysis exists
-        existing_analysis = db.table("network_analysis").select("*").eq("id", analysis_id).execute()
-        if not existing_analysis.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Network analysis not found"
-            )
-        
-        # Check if analysis is in progress (cannot delete)
-        current_status = existing_analysis.data[0].get("status")
-        if current_status == "in_progress":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot delete analysis that is currently in progress"
+        async with db.transaction() as tx:
+            # Check if analysis exists
+            existing_analysis = await tx.execute_query(
+                "SELECT status FROM network_analysis WHERE id = %s", (analysis_id,), for_update=True
             )
-        
-        # Delete analysis
-        db.table("network_analysis").delete().eq("id", analysis_id).execute()
+            if not existing_analysis:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Network analysis not found"
+                )
+            
+            # Check if analysis is in progress (cannot delete)
+            current_status = existing_analysis[0].get("status")
+            if current_status == "in_progress":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot delete analysis that is currently in progress"
+                )
+            
+            # Delete analysis
+            await tx.execute_delete("DELETE FROM network_analysis WHERE id = %s", (analysis_id,))
         
         logger.info(f"Network analysis {analysis_id} deleted by user {current_user.id}")
         
@@ -264,47 +356,63 @@ async def delete_network_analysis(
         )
 
 
-@router.post("/{analysis_id}/start")
+@router.post("/{analysis_id}/start", status_code=status.HTTP_202_ACCEPTED)
 async def start_network_analysis(
     analysis_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
-    """Start a network analysis execution"""
+    """Queue a network analysis for background execution"""
     try:
         # Check if analysis exists
-        existing_analysis = db.table("network_analysis").select("*").eq("id", analysis_id).execute()
-        if not existing_analysis.data:
+        existing_analysis = await db.execute_query("SELECT * FROM network_analysis WHERE id = %s", (analysis_id,))
+        if not existing_analysis:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Network analysis not found"
             )
         
-        current_status = existing_analysis.data[0].get("status")
-        if current_status != "pending":
+        current_status = existing_analysis[0].get("status")
+        # Failed analyses (including those abandoned by a dead worker) may be rerun
+        if current_status not in ("pending", "failed"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot start analysis with status '{current_status}'"
             )
         
-        # Update status to in_progress
-        update_data = {
-            "status": "in_progress",
-            "started_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        }
+        if not analysis_jobs.has_capacity():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many network analyses are running; try again later"
+            )
         
-        response = db.table("network_analysis").update(update_data).eq("id", analysis_id).execute()
+        # Only one caller wins the transition to in_progress
+        updated = await db.execute_update(
+            "UPDATE network_analysis SET status = 'in_progress', failed_at = NULL, error_message = NULL, "
+            "updated_at = %s WHERE id = %s AND status = %s",
+            (datetime.utcnow(), analysis_id, current_status)
+        )
+        if not updated:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Network analysis was started concurrently"
+            )
         
-        if not response.data:
+        try:
+            job = analysis_jobs.submit(existing_analysis[0])
+        except JobQueueFullError:
+            await db.execute_update(
+                "UPDATE network_analysis SET status = 'pending' WHERE id = %s AND status = 'in_progress'",
+                (analysis_id,)
+            )
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to start network analysis"
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many network analyses are running; try again later"
             )
         
-        logger.info(f"Network analysis {analysis_id} started by user {current_user.id}")
+        logger.info(f"Network analysis {analysis_id} queued by user {current_user.id}")
         
-        return {"message": "Network analysis started successfully", "status": "in_progress"}
+        return {"message": "Network analysis started successfully", "status": "in_progress", "job": job.snapshot()}
         
     except HTTPException:
         raise
@@ -316,59 +424,77 @@ async def start_network_analysis(
         )
 
 
-@router.post("/{analysis_id}/complete")
-async def complete_network_analysis(
+@router.get("/{analysis_id}/progress")
+async def get_network_analysis_progress(
     analysis_id: str,
-    results: Dict[str, Any],
-    current_user: User = Depends(get_current_manager_user),
-    db: Client = Depends(get_db)
+    current_user: User = Depends(get_current_active_user),
+    db = Depends(get_async_db)
 ):
-    """Complete a network analysis with results"""
+    """Status of a network analysis, with live progress when this worker is running it"""
     try:
-        # Check if analysis exists
-        existing_analysis = db.table("network_analysis").select("*").eq("id", analysis_id).execute()
-        if not existing_analysis.data:
+        rows = await db.execute_query(
+            "SELECT id, status, started_at, completed_at, failed_at, error_message, execution_time_seconds "
+            "FROM network_analysis WHERE id = %s",
+            (analysis_id,)
+        )
+        if not rows:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Network analysis not found"
             )
         
-        current_status = existing_analysis.data[0].get("status")
-        if current_status != "in_progress":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot complete analysis with status '{current_status}'"
-            )
-        
-        # Calculate execution time
-        started_at = datetime.fromisoformat(existing_analysis.data[0].get("started_at", ""))
-        execution_time = (datetime.utcnow() - started_at).total_seconds()
-        
-        # Update status to completed
-        update_data = {
-            "status": "completed",
-            "completed_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
-            "results": results,
-            "execution_time_seconds": execution_time
+        job = analysis_jobs.get(analysis_id)
+        return {
+            "analysis": rows[0],
+            # None when another worker runs the job; the row status still applies
+            "job": job.snapshot() if job is not None else None
         }
         
-        response = db.table("network_analysis").update(update_data).eq("id", analysis_id).execute()
-        
-        if not response.data:
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting network analysis progress: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.post("/{analysis_id}/cancel")
+async def cancel_network_analysis(
+    analysis_id: str,
+    current_user: User = Depends(get_current_manager_user),
+    db = Depends(get_async_db)
+):
+    """Cancel a pending or running network analysis"""
+    try:
+        updated = await db.execute_update(
+            "UPDATE network_analysis SET status = 'cancelled', error_message = 'Cancelled', updated_at = %s "
+            "WHERE id = %s AND status IN ('pending', 'in_progress')",
+            (datetime.utcnow(), analysis_id)
+        )
+        if not updated:
+            existing_analysis = await db.execute_query("SELECT status FROM network_analysis WHERE id = %s", (analysis_id,))
+            if not existing_analysis:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Network analysis not found"
+                )
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to complete network analysis"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot cancel analysis with status '{existing_analysis[0]['status']}'"
             )
         
-        logger.info(f"Network analysis {analysis_id} completed by user {current_user.id}")
+        # Stop it now if it runs here; other workers stop at the job's next checkpoint
+        analysis_jobs.cancel(analysis_id)
+        logger.info(f"Network analysis {analysis_id} cancelled by user {current_user.id}")
         
-        return {"message": "Network analysis completed successfully", "status": "completed"}
+        return {"message": "Network analysis cancelled successfully", "status": "cancelled"}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error completing network analysis: {e}")
+        logger.error(f"Error cancelling network analysis: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -380,41 +506,30 @@ async def fail_network_analysis(
     analysis_id: str,
     error_message: str,
     current_user: User = Depends(get_current_manager_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Mark a network analysis as failed"""
     try:
-        # Check if analysis exists
-        existing_analysis = db.table("network_analysis").select("*").eq("id", analysis_id).execute()
-        if not existing_analysis.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Network analysis not found"
-            )
-        
-        current_status = existing_analysis.data[0].get("status")
-        if current_status not in ["pending", "in_progress"]:
+        now = datetime.utcnow()
+        updated = await db.execute_update(
+            "UPDATE network_analysis SET status = 'failed', failed_at = %s, updated_at = %s, error_message = %s "
+            "WHERE id = %s AND status IN ('pending', 'in_progress')",
+            (now, now, error_message, analysis_id)
+        )
+        if not updated:
+            existing_analysis = await db.execute_query("SELECT status FROM network_analysis WHERE id = %s", (analysis_id,))
+            if not existing_analysis:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Network analysis not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot fail analysis with status '{current_status}'"
-            )
-        
-        # Update status to failed
-        update_data = {
-            "status": "failed",
-            "failed_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
-            "error_message": error_message
-        }
-        
-        response = db.table("network_analysis").update(update_data).eq("id", analysis_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to mark network analysis as failed"
+                detail=f"Cannot fail analysis with status '{existing_analysis[0]['status']}'"
             )
         
+        # A job running it here stops now; elsewhere it stops at its next checkpoint
+        analysis_jobs.cancel(analysis_id)
         logger.warning(f"Network analysis {analysis_id} marked as failed by user {current_user.id}: {error_message}")
         
         return {"message": "Network analysis marked as failed", "status": "failed"}
@@ -432,55 +547,43 @@ async def fail_network_analysis(
 @router.get("/stats/summary", response_model=NetworkAnalysisStats)
 async def get_network_analysis_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get network analysis statistics"""
     try:
-        # Get all analyses
-        response = db.table("network_analysis").select("*").execute()
-        analyses = response.data or []
-        
-        # Calculate stats
-        total_analyses = len(analyses)
-        pending_analyses = len([a for a in analyses if a.get("status") == "pending"])
-        in_progress_analyses = len([a for a in analyses if a.get("status") == "in_progress"])
-        completed_analyses = len([a for a in analyses if a.get("status") == "completed"])
-        failed_analyses = len([a for a in analyses if a.get("status") == "failed"])
-        
-        # Calculate average execution time
-        execution_times = [a.get("execution_time_seconds", 0) for a in analyses if a.get("execution_time_seconds")]
-        average_execution_time = sum(execution_times) / len(execution_times) if execution_times else 0
-        
-        # Count by type and status
+        # Counts by type and status in one grouped pass
+        groups = await db.execute_query(
+            "SELECT analysis_type, status, COUNT(*) as total FROM network_analysis GROUP BY analysis_type, status"
+        )
         analyses_by_type = {}
         analyses_by_status = {}
+        for group in groups:
+            analysis_type = group.get("analysis_type") or "unknown"
+            analysis_status = group.get("status") or "unknown"
+            analyses_by_type[analysis_type] = analyses_by_type.get(analysis_type, 0) + int(group["total"])
+            analyses_by_status[analysis_status] = analyses_by_status.get(analysis_status, 0) + int(group["total"])
         
-        for analysis in analyses:
-            analysis_type = analysis.get("analysis_type", "unknown")
-            status = analysis.get("status", "unknown")
-            
-            analyses_by_type[analysis_type] = analyses_by_type.get(analysis_type, 0) + 1
-            analyses_by_status[status] = analyses_by_status.get(status, 0) + 1
+        # Calculate average execution time
+        timing = await db.execute_query(
+            "SELECT AVG(execution_time_seconds) as average FROM network_analysis WHERE execution_time_seconds > 0"
+        )
+        average_execution_time = float(timing[0]["average"] or 0) if timing else 0.0
         
         # Get top metrics (most used)
-        all_metrics = []
-        for analysis in analyses:
-            if analysis.get("metrics"):
-                all_metrics.extend(analysis.get("metrics", []))
-        
         metric_counts = {}
-        for metric in all_metrics:
-            metric_counts[metric] = metric_counts.get(metric, 0) + 1
+        async for analysis in db.iter_query("SELECT metrics FROM network_analysis WHERE metrics IS NOT NULL"):
+            for metric in _json_column(analysis["metrics"]) or []:
+                metric_counts[metric] = metric_counts.get(metric, 0) + 1
         
         top_metrics = sorted(metric_counts.items(), key=lambda x: x[1], reverse=True)[:5]
         top_metrics = [metric for metric, count in top_metrics]
         
         return NetworkAnalysisStats(
-            total_analyses=total_analyses,
-            pending_analyses=pending_analyses,
-            in_progress_analyses=in_progress_analyses,
-            completed_analyses=completed_analyses,
-            failed_analyses=failed_analyses,
+            total_analyses=sum(analyses_by_status.values()),
+            pending_analyses=analyses_by_status.get("pending", 0),
+            in_progress_analyses=analyses_by_status.get("in_progress", 0),
+            completed_analyses=analyses_by_status.get("completed", 0),
+            failed_analyses=analyses_by_status.get("failed", 0),
             average_execution_time=round(average_execution_time, 2),
             analyses_by_type=analyses_by_type,
             analyses_by_status=analyses_by_status,
@@ -499,92 +602,109 @@ async def get_network_analysis_stats(
 async def optimize_routes(
     optimization_request: NetworkOptimizationRequest,
     current_user: User = Depends(get_current_active_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
-    """Optimize routes based on given parameters"""
+    """
+    Assign lanes to carriers at minimum total cost, respecting carrier
+    capacity and lane volume (see ``app.services.route_optimizer``)
+    """
     try:
-        # Get relevant data for optimization
-        lanes_response = db.table("lanes").select("*").eq("status", "active").execute()
-        carriers_response = db.table("carriers").select("*").eq("status", "active").execute()
+        status_filter = "" if optimization_request.include_inactive else " WHERE status = 'active'"
+        lanes = await db.execute_query(f"SELECT * FROM lanes{status_filter}")
+        carriers = await db.execute_query(f"SELECT * FROM carriers{status_filter}")
         
-        if not lanes_response.data:
+        if not lanes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No active lanes found for optimization"
             )
         
-        if not carriers_response.data:
+        if not carriers:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No active carriers found for optimization"
             )
         
-        # Perform route optimization (simplified algorithm)
-        optimized_routes = []
+        result, distances = await optimize_network(
+            db, lanes, carriers,
+            use_lane_volume=optimization_request.use_lane_volume,
+            carrier_capacity=optimization_request.carrier_capacity,
+            candidates_per_lane=optimization_request.candidates_per_lane,
+            weights=optimization_request.scoring_weights.dict(),
+            enforce_operating_radius=optimization_request.enforce_operating_radius
+        )
+        lane_distances = await lane_rows_distance_km(db, lanes)
         
-        for lane in lanes_response.data:
-            # Find best carrier for each lane based on criteria
-            best_carrier = None
-            best_score = 0
-            
-            for carrier in carriers_response.data:
-                score = 0
-                
-                # Score based on carrier type match
-                if carrier.get("carrier_type") == lane.get("lane_type"):
-                    score += 3
-                
-                # Score based on service level
-                if carrier.get("service_level") == "premium":
-                    score += 2
-                elif carrier.get("service_level") == "express":
-                    score += 1
-                
-                # Score based on rating
-                if carrier.get("rating"):
-                    score += carrier.get("rating", 0)
-                
-                # Score based on operating radius
-                if carrier.get("operating_radius"):
-                    # Calculate distance between origin and carrier location
-                    # This is a simplified calculation
-                    distance = 500  # Placeholder
-                    if distance <= carrier.get("operating_radius", 0):
-                        score += 1
-                
-                if score > best_score:
-                    best_score = score
-                    best_carrier = carrier
-            
-            if best_carrier:
-                optimized_routes.append({
-                    "lane_id": lane["id"],
-                    "lane_name": f"{lane.get('origin_city', '')} to {lane.get('destination_city', '')}",
-                    "carrier_id": best_carrier["id"],
-                    "carrier_name": best_carrier["name"],
-                    "score": best_score,
-                    "estimated_cost": lane.get("estimated_cost", 0),
-                    "estimated_duration": lane.get("estimated_duration", 0)
-                })
+        optimized_routes = []
+        for lane_index, carrier_index, volume, unit_cost, score in zip(
+            result["lane_index"], result["carrier_index"], result["volume"],
+            result["unit_cost"], result["score"]
+        ):
+            lane = lanes[lane_index]
+            carrier = carriers[carrier_index]
+            optimized_routes.append({
+                "lane_id": lane["id"],
+                "lane_name": f"{lane.get('origin_city', '')} to {lane.get('destination_city', '')}",
+                "carrier_id": carrier["id"],
+                "carrier_name": carrier.get("name") or carrier.get("company_name"),
+                "score": float(score),
+                "assigned_volume": round(float(volume), 4),
+                "unit_cost": float(unit_cost),
+                "distance_km": lane_distances[lane_index],
+                "carrier_distance_km": _finite_or_none(distances[lane_index, carrier_index]),
+                "estimated_cost": lane.get("estimated_cost", 0),
+                "estimated_duration": lane.get("estimated_duration", 0)
+            })
         
         # Sort by score (highest first)
         optimized_routes.sort(key=lambda x: x["score"], reverse=True)
+        total_routes = len(optimized_routes)
         
         # Limit results if max_routes specified
         if optimization_request.max_routes:
             optimized_routes = optimized_routes[:optimization_request.max_routes]
         
-        logger.info(f"Route optimization completed for user {current_user.id}, found {len(optimized_routes)} routes")
+        unassigned_lanes = [
+            {"lane_id": lanes[index]["id"], "unassigned_volume": round(float(volume), 4)}
+            for index, volume in enumerate(result["unassigned"]) if volume > 0
+        ]
+        # Slack per capacity-limited carrier; a positive shadow price means
+        # one more load of capacity there would lower the total cost
+        carrier_slack = [
+            {
+                "carrier_id": carriers[index]["id"],
+                "used": round(float(result["used"][index]), 4),
+                "slack": round(float(result["slack"][index]), 4),
+                "shadow_price": round(float(result["shadow_price"][index]), 4)
+            }
+            for index in range(len(carriers)) if math.isfinite(result["slack"][index])
+        ]
+        
+        logger.info(f"Route optimization completed for user {current_user.id}, "
+                    f"assigned {total_routes} routes in {result['solver']['solve_seconds']}s")
         
         return {
             "message": "Route optimization completed successfully",
-            "total_routes": len(optimized_routes),
+            "total_routes": total_routes,
             "optimized_routes": optimized_routes,
+            "objective_value": result["objective_value"],
+            "assignment_cost": result["assignment_cost"],
+            "assigned_volume": round(float(result["volume"].sum()), 4),
+            "unassigned_volume": round(float(result["unassigned"].sum()), 4),
+            "unassigned_lanes": unassigned_lanes,
+            "carrier_slack": carrier_slack,
+            "solver": result["solver"],
             "optimization_parameters": optimization_request.dict()
         }
         
     except HTTPException:
         raise
+    except SolverUnavailableError as e:
+        logger.error(f"Route optimization unavailable: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Route optimization solver is not installed"
+        )
     except Exception as e:
         logger.error(f"Error optimizing routes: {e}")
         raise HTTPException(
@@ -593,29 +713,167 @@ async def optimize_routes(
         )
 
 
+@router.post("/top-carriers")
+async def get_top_carriers(
+    request: TopCarriersRequest,
+    current_user: User = Depends(get_current_active_user),
+    db = Depends(get_async_db)
+):
+    """Rank the best-scoring carriers for each lane"""
+    try:
+        status_filter = "" if request.include_inactive else " WHERE status = 'active'"
+        lanes = await db.execute_query(f"SELECT * FROM lanes{status_filter}")
+        carriers = await db.execute_query(f"SELECT * FROM carriers{status_filter}")
+        if request.lane_ids:
+            wanted = set(request.lane_ids)
+            lanes = [lane for lane in lanes if lane["id"] in wanted]
+        
+        if not lanes or not carriers:
+            return {"total_lanes": len(lanes), "lanes": [], "scoring_weights": request.scoring_weights.dict()}
+        
+        distances = await carrier_lane_distances_km(db, lanes, carriers)
+        scores = ScoringFeatures(lanes, carriers).score(request.scoring_weights.dict(), distances)
+        if request.enforce_operating_radius:
+            await location_index.ensure_fresh()
+            # Out-of-radius carriers drop out with the other non-candidates below
+            scores[~location_index.operating_radius_mask(lanes, carriers)] = 0
+        best, best_scores = top_k(scores, request.k)
+        
+        ranked = []
+        for lane_index, (lane, carrier_indexes, carrier_scores) in enumerate(zip(lanes, best, best_scores)):
+            ranked.append({
+                "lane_id": lane["id"],
+                "lane_name": f"{lane.get('origin_city', '')} to {lane.get('destination_city', '')}",
+                "carriers": [
+                    {
+                        "carrier_id": carriers[index]["id"],
+                        "carrier_name": carriers[index].get("name") or carriers[index].get("company_name"),
+                        "score": float(score),
+                        "distance_km": _finite_or_none(distances[lane_index, index])
+                    }
+                    # Pairs scoring nothing are not candidates
+                    for index, score in zip(carrier_indexes, carrier_scores) if score > 0
+                ]
+            })
+        
+        return {
+            "total_lanes": len(ranked),
+            "lanes": ranked,
+            "scoring_weights": request.scoring_weights.dict()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error ranking carriers: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+def _resolve_point(latitude: Optional[float], longitude: Optional[float],
+                   location_id: Optional[str]) -> tuple:
+    """Query point from explicit coordinates or an indexed location id"""
+    if location_id:
+        point = location_index.coordinates(location_id)
+        if point is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Location not found or has no coordinates"
+            )
+        return point
+    if latitude is None or longitude is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either location_id or both latitude and longitude"
+        )
+    return latitude, longitude
+
+
+@router.get("/locations/nearest")
+async def get_nearest_locations(
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    location_id: Optional[str] = Query(None, description="Search around this locations_master location"),
+    n: int = Query(5, ge=1, le=100),
+    hubs_only: bool = Query(False, description="Only consolidation hubs"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Closest locations (or consolidation hubs) to a point, nearest first"""
+    try:
+        await location_index.ensure_fresh()
+        point = _resolve_point(latitude, longitude, location_id)
+        locations = location_index.nearest(point[0], point[1], n=n, hubs_only=hubs_only)
+        return {
+            "origin": {"latitude": point[0], "longitude": point[1]},
+            "total": len(locations),
+            "locations": locations
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding nearest locations: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/locations/within-radius")
+async def get_locations_within_radius(
+    km: float = Query(..., gt=0, le=5000, description="Search radius in kilometres"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    location_id: Optional[str] = Query(None, description="Search around this locations_master location"),
+    hubs_only: bool = Query(False, description="Only consolidation hubs"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Every location (or consolidation hub) within ``km`` of a point, nearest first"""
+    try:
+        await location_index.ensure_fresh()
+        point = _resolve_point(latitude, longitude, location_id)
+        locations = location_index.within_radius(point[0], point[1], km, hubs_only=hubs_only)
+        return {
+            "origin": {"latitude": point[0], "longitude": point[1]},
+            "total": len(locations),
+            "locations": locations
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding locations within radius: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
 @router.post("/analyze-network-efficiency")
 async def analyze_network_efficiency(
     current_user: User = Depends(get_current_active_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Analyze overall network efficiency"""
     try:
-        # Get network data
-        lanes_response = db.table("lanes").select("*").execute()
-        carriers_response = db.table("carriers").select("*").execute()
-        bids_response = db.table("bids").select("*").execute()
-        bid_responses_response = db.table("bid_responses").select("*").execute()
-        
-        lanes = lanes_response.data or []
-        carriers = carriers_response.data or []
-        bids = bids_response.data or []
-        bid_responses = bid_responses_response.data or []
-        
-        # Calculate efficiency metrics
-        total_lanes = len(lanes)
-        active_lanes = len([l for l in lanes if l.get("status") == "active"])
-        total_carriers = len(carriers)
-        active_carriers = len([c for c in carriers if c.get("status") == "active"])
+        # Get network counts in one round trip
+        counts = (await db.execute_query("""
+            SELECT
+                (SELECT COUNT(*) FROM lanes) as total_lanes,
+                (SELECT COUNT(*) FROM lanes WHERE status = 'active') as active_lanes,
+                (SELECT COUNT(*) FROM carriers) as total_carriers,
+                (SELECT COUNT(*) FROM carriers WHERE status = 'active') as active_carriers,
+                (SELECT COUNT(*) FROM bids) as total_bids,
+                (SELECT COUNT(*) FROM bids WHERE status = 'awarded') as awarded_bids,
+                (SELECT COALESCE(SUM(estimated_cost), 0) FROM bids) as total_bid_value,
+                (SELECT COALESCE(SUM(estimated_cost), 0) FROM bids WHERE status = 'awarded') as total_awarded_value
+        """))[0]
+        total_lanes = int(counts["total_lanes"])
+        active_lanes = int(counts["active_lanes"])
+        total_carriers = int(counts["total_carriers"])
+        active_carriers = int(counts["active_carriers"])
+        total_bids = int(counts["total_bids"])
+        awarded_bids = int(counts["awarded_bids"])
         
         # Calculate lane utilization
         lane_utilization = (active_lanes / total_lanes * 100) if total_lanes > 0 else 0
@@ -624,27 +882,21 @@ async def analyze_network_efficiency(
         carrier_utilization = (active_carriers / total_carriers * 100) if total_carriers > 0 else 0
         
         # Calculate bid success rate
-        total_bids = len(bids)
-        awarded_bids = len([b for b in bids if b.get("status") == "awarded"])
         bid_success_rate = (awarded_bids / total_bids * 100) if total_bids > 0 else 0
         
-        # Calculate average response time
-        response_times = []
-        for bid in bids:
-            if bid.get("status") == "awarded":
-                bid_responses_for_bid = [br for br in bid_responses if br.get("bid_id") == bid["id"]]
-                if bid_responses_for_bid:
-                    # Calculate time between bid creation and first response
-                    bid_created = datetime.fromisoformat(bid.get("created_at", ""))
-                    first_response = min([datetime.fromisoformat(br.get("created_at", "")) for br in bid_responses_for_bid])
-                    response_time = (first_response - bid_created).total_seconds() / 3600  # in hours
-                    response_times.append(response_time)
-        
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
+        # Calculate average response time: bid creation to first response, awarded bids only
+        response_times = await db.execute_query("""
+            SELECT AVG(TIMESTAMPDIFF(SECOND, b.created_at, r.first_response_at)) / 3600 as hours
+            FROM bids b
+            JOIN (SELECT bid_id, MIN(created_at) as first_response_at FROM bid_responses GROUP BY bid_id) r
+                ON r.bid_id = b.id
+            WHERE b.status = 'awarded'
+        """)
+        avg_response_time = float(response_times[0]["hours"] or 0) if response_times else 0
         
         # Calculate cost efficiency
-        total_bid_value = sum(b.get("estimated_cost", 0) for b in bids)
-        total_awarded_value = sum(b.get("estimated_cost", 0) for b in bids if b.get("status") == "awarded")
+        total_bid_value = float(counts["total_bid_value"])
+        total_awarded_value = float(counts["total_awarded_value"])
         cost_efficiency = (total_awarded_value / total_bid_value * 100) if total_bid_value > 0 else 0
         
         logger.info(f"Network efficiency analysis completed for user {current_user.id}")
@@ -678,7 +930,7 @@ async def analyze_network_efficiency(
 async def generate_network_report(
     report_type: str = Query(..., description="Type of report: summary, detailed, or custom"),
     current_user: User = Depends(get_current_active_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Generate a comprehensive network report"""
     try:
@@ -688,71 +940,48 @@ async def generate_network_report(
                 detail="Invalid report type. Must be 'summary', 'detailed', or 'custom'"
             )
         
-        # Get all relevant data
-        lanes_response = db.table("lanes").select("*").execute()
-        carriers_response = db.table("carriers").select("*").execute()
-        bids_response = db.table("bids").select("*").execute()
-        bid_responses_response = db.table("bid_responses").select("*").execute()
-        
-        lanes = lanes_response.data or []
-        carriers = carriers_response.data or []
-        bids = bids_response.data or []
-        bid_responses = bid_responses_response.data or []
-        
-        # Generate report based on type
-        if report_type == "summary":
-            report = {
-                "report_type": "summary",
-                "generated_at": datetime.utcnow().isoformat(),
-                "summary": {
-                    "total_lanes": len(lanes),
-                    "total_carriers": len(carriers),
-                    "total_bids": len(bids),
-                    "total_responses": len(bid_responses),
-                    "active_lanes": len([l for l in lanes if l.get("status") == "active"]),
-                    "active_carriers": len([c for c in carriers if c.get("status") == "active"]),
-                    "open_bids": len([b for b in bids if b.get("status") == "open"])
-                }
-            }
-        elif report_type == "detailed":
-            report = {
-                "report_type": "detailed",
-                "generated_at": datetime.utcnow().isoformat(),
-                "summary": {
-                    "total_lanes": len(lanes),
-                    "total_carriers": len(carriers),
-                    "total_bids": len(bids),
-                    "total_responses": len(bid_responses)
-                },
-                "lanes_by_status": {},
-                "carriers_by_type": {},
-                "bids_by_status": {},
-                "responses_by_status": {}
-            }
-            
-            # Detailed breakdowns
-            for lane in lanes:
-                status = lane.get("status", "unknown")
-                report["lanes_by_status"][status] = report["lanes_by_status"].get(status, 0) + 1
-            
-            for carrier in carriers:
-                carrier_type = carrier.get("carrier_type", "unknown")
-                report["carriers_by_type"][carrier_type] = report["carriers_by_type"].get(carrier_type, 0) + 1
-            
-            for bid in bids:
-                status = bid.get("status", "unknown")
-                report["bids_by_status"][status] = report["bids_by_status"].get(status, 0) + 1
-            
-            for response in bid_responses:
-                status = response.get("status", "unknown")
-                report["responses_by_status"][status] = report["responses_by_status"].get(status, 0) + 1
-        
-        else:  # custom
+        if report_type == "custom":
             report = {
                 "report_type": "custom",
                 "generated_at": datetime.utcnow().isoformat(),
                 "message": "Custom report generation not implemented yet"
             }
+        else:
+            # One GROUP BY per table; only the per-status counts cross the wire
+            lanes_by_status = await _count_by_status(db, "lanes")
+            carriers_by_status = await _count_by_status(db, "carriers")
+            bids_by_status = await _count_by_status(db, "bids")
+            responses_by_status = await _count_by_status(db, "bid_responses")
+            
+            summary = {
+                "total_lanes": sum(lanes_by_status.values()),
+                "total_carriers": sum(carriers_by_status.values()),
+                "total_bids": sum(bids_by_status.values()),
+                "total_responses": sum(responses_by_status.values())
+            }
+            
+            if report_type == "summary":
+                summary.update({
+                    "active_lanes": lanes_by_status.get("active", 0),
+                    "active_carriers": carriers_by_status.get("active", 0),
+                    "open_bids": bids_by_status.get("open", 0)
+                })
+                report = {
+                    "report_type": "summary",
+                    "generated_at": datetime.utcnow().isoformat(),
+                    "summary": summary
+                }
+            else:
+                report = {
+                    "report_type": "detailed",
+                    "generated_at": datetime.utcnow().isoformat(),
+                    "summary": summary,
+                    "lanes_by_status": lanes_by_status,
+                    # carriers has no carrier_type column, so every carrier is of unknown type
+                    "carriers_by_type": {"unknown": summary["total_carriers"]} if summary["total_carriers"] else {},
+                    "bids_by_status": bids_by_status,
+                    "responses_by_status": responses_by_status
+                }
         
         logger.info(f"Network report '{report_type}' generated for user {current_user.id}")
         
@@ -777,36 +1006,12 @@ async def search_network_analyses(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     current_user: User = Depends(get_current_active_user),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Search network analyses with advanced filtering"""
     try:
-        query = db.table("network_analysis").select("*")
-        
-        # Apply search filters
-        if search_params.analysis_type:
-            query = query.eq("analysis_type", search_params.analysis_type)
-        if search_params.status:
-            query = query.eq("status", search_params.status)
-        if search_params.created_by:
-            query = query.eq("created_by", search_params.created_by)
-        if search_params.start_date_from:
-            query = query.gte("start_date", search_params.start_date_from.isoformat())
-        if search_params.start_date_to:
-            query = query.lte("start_date", search_params.start_date_to.isoformat())
-        if search_params.end_date_from:
-            query = query.gte("end_date", search_params.end_date_from.isoformat())
-        if search_params.end_date_to:
-            query = query.lte("end_date", search_params.end_date_to.isoformat())
-        
-        # Get total count
-        count_response = query.execute()
-        total = len(count_response.data)
-        
-        # Apply pagination
-        response = query.range(skip, skip + limit - 1).execute()
-        
-        analyses = [NetworkAnalysis(**analysis_data) for analysis_data in response.data]
+        where_clause, params = _analysis_filters(**search_params.model_dump(mode="json"))
+        total, analyses = await _page_of_analyses(db, where_clause, params, skip, limit)
         
         return {
             "message": "Search completed successfully",
@@ -822,4 +1027,4 @@ async def search_network_analyses(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
-        ) 
\ No newline at end of file
+        )
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
-from app.auth.dependencies import get_current_active_user, get_current_manager_user
-from app.database import get_db
+from app.auth.dependencies import get_current_active_user, get_current_manager_user, invalidate_cached_user
+from app.database import get_async_db
+from app.response_cache import invalidates
+from app.config import settings
+from app.counts import count_rows, COUNT_MODE_PATTERN
 from app.models.user import User, UserCreate, UserUpdate, UserResponse, UserListResponse
 from datetime import datetime
 import logging
@@ -17,8 +20,9 @@ async def get_users(
     limit: int = Query(10, ge=1, le=100),
     role: Optional[str] = None,
     user_status: Optional[str] = None,
+    count: str = Query(settings.list_count_default_mode, pattern=COUNT_MODE_PATTERN),
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get list of users with pagination and filtering"""
     try:
@@ -35,15 +39,13 @@ async def get_users(
         
         where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
         
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM users WHERE {where_clause}"
-        count_result = db.execute_query(count_query, tuple(params))
-        total = count_result[0]["total"] if count_result else 0
+        # Get total count using the requested strategy
+        total = await count_rows(db, "users", where_clause, params, mode=count)
         
         # Get paginated results
         query = f"SELECT * FROM users WHERE {where_clause} ORDER BY created_at DESC LIMIT %s OFFSET %s"
         params.extend([limit, skip])
-        users_data = db.execute_query(query, tuple(params))
+        users_data = await db.execute_query(query, tuple(params))
         
         users = [User(**user_data) for user_data in users_data]
         
@@ -66,7 +68,7 @@ async def get_users(
 async def get_user(
     user_id: str,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Get a specific user by ID"""
     try:
@@ -77,7 +79,7 @@ async def get_user(
                 detail="Not authorized to view this user"
             )
         
-        users = db.execute_query("SELECT * FROM users WHERE id = %s", (user_id,))
+        users = await db.execute_query("SELECT * FROM users WHERE id = %s", (user_id,), prepared=True)
         
         if not users:
             raise HTTPException(
@@ -102,11 +104,12 @@ async def get_user(
 
 
 @router.put("/{user_id}", response_model=UserResponse)
+@invalidates("users")
 async def update_user(
     user_id: str,
     user_data: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Update user information"""
     try:
@@ -118,7 +121,7 @@ async def update_user(
             )
         
         # Check if user exists
-        existing_users = db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,))
+        existing_users = await db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,), prepared=True)
         if not existing_users:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -154,10 +157,11 @@ async def update_user(
         
         # Update user
         query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = %s"
-        db.execute_update(query, tuple(params))
+        await db.execute_update(query, tuple(params))
+        invalidate_cached_user(user_id)
         
         # Get updated user
-        updated_users = db.execute_query("SELECT * FROM users WHERE id = %s", (user_id,))
+        updated_users = await db.execute_query("SELECT * FROM users WHERE id = %s", (user_id,), prepared=True)
         updated_user = User(**updated_users[0])
         
         return UserResponse(
@@ -176,15 +180,16 @@ async def update_user(
 
 
 @router.delete("/{user_id}")
+@invalidates("users")
 async def delete_user(
     user_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Delete a user (soft delete by setting status to inactive)"""
     try:
         # Check if user exists
-        existing_users = db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,))
+        existing_users = await db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,), prepared=True)
         if not existing_users:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -192,10 +197,11 @@ async def delete_user(
             )
         
         # Soft delete user
-        db.execute_update(
+        await db.execute_update(
             "UPDATE users SET status = 'inactive', updated_at = %s WHERE id = %s",
             (datetime.utcnow(), user_id)
         )
+        invalidate_cached_user(user_id)
         
         return {"message": "User deleted successfully"}
         
@@ -210,15 +216,16 @@ async def delete_user(
 
 
 @router.post("/{user_id}/activate")
+@invalidates("users")
 async def activate_user(
     user_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Activate a user account"""
     try:
         # Check if user exists
-        existing_users = db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,))
+        existing_users = await db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,), prepared=True)
         if not existing_users:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -226,10 +233,11 @@ async def activate_user(
             )
         
         # Activate user
-        db.execute_update(
+        await db.execute_update(
             "UPDATE users SET status = 'active', is_active = true, updated_at = %s WHERE id = %s",
             (datetime.utcnow(), user_id)
         )
+        invalidate_cached_user(user_id)
         
         return {"message": "User activated successfully"}
         
@@ -244,15 +252,16 @@ async def activate_user(
 
 
 @router.post("/{user_id}/deactivate")
+@invalidates("users")
 async def deactivate_user(
     user_id: str,
     current_user: User = Depends(get_current_manager_user),
-    db = Depends(get_db)
+    db = Depends(get_async_db)
 ):
     """Deactivate a user account"""
     try:
         # Check if user exists
-        existing_users = db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,))
+        existing_users = await db.execute_query("SELECT id FROM users WHERE id = %s", (user_id,), prepared=True)
         if not existing_users:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -267,10 +276,11 @@ async def deactivate_user(
             )
         
         # Deactivate user
-        db.execute_update(
+        await db.execute_update(
             "UPDATE users SET status = 'inactive', is_active = false, updated_at = %s WHERE id = %s",
             (datetime.utcnow(), user_id)
         )
+        invalidate_cached_user(user_id)
         
         return {"message": "User deactivated successfully"}
         
@@ -1,6 +1,9 @@
 # Authentication Package
 from .jwt_handler import create_access_token, verify_token
-from .password_handler import verify_password, get_password_hash
+from .password_handler import (
+    verify_password, get_password_hash, verify_password_async, get_password_hash_async,
+    PasswordPoolBusyError
+)
 from .dependencies import get_current_user, get_current_active_user
 
 __all__ = [
@@ -8,6 +11,9 @@ __all__ = [
     "verify_token", 
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "PasswordPoolBusyError",
     "get_current_user",
     "get_current_active_user"
 ] 
\ No newline at end of file
@@ -1,9 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.auth.jwt_handler import verify_token
+from app.cache import TTLCache
+from app.config import settings
 from app.models.user import User, UserStatus
-from app.database import get_db
-from supabase import Client
+from app.database import get_async_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,10 +12,22 @@ logger = logging.getLogger(__name__)
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Authenticated users by id, so most requests skip the users lookup
+user_cache = TTLCache(
+    max_size=settings.user_cache_max_size,
+    ttl=settings.user_cache_ttl_seconds,
+    name="users"
+)
+
+
+def invalidate_cached_user(user_id):
+    """Forget a cached user after their row changes"""
+    user_cache.invalidate(str(user_id))
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Client = Depends(get_db)
+    db = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user from JWT token"""
     credentials_exception = HTTPException(
@@ -34,14 +47,18 @@ async def get_current_user(
         if user_id is None:
             raise credentials_exception
         
+        user = user_cache.get(str(user_id))
+        if user is not None:
+            return user
+        
         # Get user from database
-        response = db.table("users").select("*").eq("id", user_id).execute()
+        users = await db.execute_query("SELECT * FROM users WHERE id = %s", (user_id,), prepared=True)
         
-        if not response.data:
+        if not users:
             raise credentials_exception
         
-        user_data = response.data[0]
-        user = User(**user_data)
+        user = User(**users[0])
+        user_cache.set(str(user_id), user)
         
         return user
         
@@ -1,12 +1,22 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
+from app.cache import TTLCache
 from app.config import settings
 from app.models.user import User
+import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Verified payloads keyed by token digest; each entry expires with its token
+token_cache = TTLCache(
+    max_size=settings.token_cache_max_size,
+    ttl=settings.token_cache_ttl_seconds,
+    name="tokens"
+)
+
 
 def create_access_token(
     data: dict, 
@@ -38,13 +48,21 @@ def create_access_token(
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify JWT token and return payload"""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        # Callers get their own copy so the cached payload can't be mutated
+        return dict(payload)
+    
     try:
         payload = jwt.decode(
             token, 
             settings.secret_key, 
             algorithms=[settings.algorithm]
         )
-        return payload
+        exp = payload.get("exp")
+        token_cache.set(key, payload, expires_at=exp if isinstance(exp, (int, float)) else None)
+        return dict(payload)
     except JWTError as e:
         logger.error(f"JWT token verification failed: {e}")
         return None
@@ -85,8 +103,6 @@ def is_token_expired(token: str) -> bool:
         return True
     
     try:
-        exp_timestamp = int(exp)
-        exp_datetime = datetime.fromtimestamp(exp_timestamp)
-        return datetime.utcnow() > exp_datetime
+        return time.time() > int(exp)
     except (ValueError, TypeError):
         return True 
\ No newline at end of file
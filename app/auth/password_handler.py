@@ -1,5 +1,11 @@
 from passlib.context import CryptContext
+from app.config import settings
+from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -7,6 +13,98 @@ logger = logging.getLogger(__name__)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class PasswordPoolBusyError(Exception):
+    """Raised when too many hash/verify jobs are already waiting"""
+
+
+class PasswordWorkerPool:
+    """
+    Dedicated bounded thread pool for bcrypt. The bcrypt backend releases the
+    GIL while hashing, so threads keep the event loop free without the
+    pickling overhead of a process pool. Jobs beyond ``max_queue`` waiting
+    ones are rejected instead of piling up behind a login burst.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_pending": 0,
+            "total_wait_seconds": 0.0,
+            "total_run_seconds": 0.0,
+            "max_run_seconds": 0.0,
+        }
+
+    def _timed(self, func, args, queued_at: float):
+        started = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            finished = time.monotonic()
+            with self._lock:
+                self._stats["total_wait_seconds"] += started - queued_at
+                self._stats["total_run_seconds"] += finished - started
+                self._stats["max_run_seconds"] = max(self._stats["max_run_seconds"], finished - started)
+
+    async def run(self, func, *args):
+        """Run ``func(*args)`` on the pool, or raise PasswordPoolBusyError if saturated"""
+        with self._lock:
+            # Jobs beyond the worker count are the ones actually queued
+            if self._pending >= self.max_workers + self.max_queue:
+                self._stats["rejected"] += 1
+                raise PasswordPoolBusyError("Password worker pool is saturated")
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["max_pending"] = max(self._stats["max_pending"], self._pending)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, self._timed, func, args, time.monotonic())
+        except Exception:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+        with self._lock:
+            self._stats["completed"] += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and timing counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            pending = self._pending
+        finished = stats["completed"] + stats["failed"]
+        stats.update({
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(pending, self.max_workers),
+            "queued": max(0, pending - self.max_workers),
+            "avg_wait_seconds": round(stats["total_wait_seconds"] / finished, 6) if finished else 0.0,
+            "avg_run_seconds": round(stats["total_run_seconds"] / finished, 6) if finished else 0.0,
+        })
+        return stats
+
+    def shutdown(self):
+        """Stop accepting work and let running jobs finish"""
+        self._executor.shutdown(wait=False)
+
+
+password_pool = PasswordWorkerPool(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
     try:
@@ -25,6 +123,16 @@ def get_password_hash(password: str) -> str:
         raise
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt worker pool instead of the event loop"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bcrypt worker pool instead of the event loop"""
+    return await password_pool.run(get_password_hash, password)
+
+
 def validate_password_strength(password: str) -> dict:
     """Validate password strength and return validation result"""
     errors = []
@@ -0,0 +1,91 @@
+"""
+In-Process Caching for RouteCraft Backend
+"""
+from typing import Any, Dict, Hashable, Optional
+from collections import OrderedDict
+import threading
+import time
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after ``ttl`` seconds, or at
+    an explicit per-entry deadline. Expired entries are dropped lazily on
+    access; the least recently used entry goes when the cache is full.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0, name: str = "cache"):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            expires_at: Optional[float] = None):
+        """
+        Store ``value``. ``expires_at`` is a ``time.time()`` timestamp and
+        wins over ``ttl`` when it is sooner; the cache-wide TTL is the default.
+        """
+        now = time.monotonic()
+        lifetime = self.ttl if ttl is None else ttl
+        if expires_at is not None:
+            lifetime = min(lifetime, expires_at - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, now + lifetime)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop one entry; returns whether it was present"""
+        with self._lock:
+            found = self._entries.pop(key, _MISSING) is not _MISSING
+            if found:
+                self._stats["invalidations"] += 1
+            return found
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size and lifetime counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({"name": self.name, "size": len(self._entries),
+                          "max_size": self.max_size, "ttl_seconds": self.ttl})
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,46 @@
+"""
+In-Process Change Feed for RouteCraft Backend
+
+Write endpoints announce which tables they changed (see
+``app.response_cache.invalidates``); listeners such as the live dashboard
+stream react to it. Listeners run synchronously on the publishing request,
+so they must only record the change and return.
+"""
+from typing import Callable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[Tuple[str, ...]], None]
+
+
+class ChangeFeed:
+    """Fan-out of "these tables changed" notifications to registered listeners"""
+
+    def __init__(self):
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener):
+        """Register ``listener(tables)``; a no-op if it is already registered"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener):
+        """Stop notifying ``listener``"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, *tables: str):
+        """Tell every listener that ``tables`` changed"""
+        if not tables:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(tables)
+            except Exception as e:
+                # A broken listener must not fail the write that published
+                logger.error(f"Change feed listener failed: {e}")
+
+
+# Global change feed instance
+change_feed = ChangeFeed()
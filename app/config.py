@@ -15,6 +15,12 @@ class Settings(BaseSettings):
     secret_key: str = Field("your-secret-key-here", alias="SECRET_KEY")
     algorithm: str = Field("HS256", alias="ALGORITHM")
     access_token_expire_minutes: int = Field(30, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+    token_cache_ttl_seconds: float = Field(300.0, alias="TOKEN_CACHE_TTL_SECONDS")  # upper bound; entries also expire at the token's exp
+    token_cache_max_size: int = Field(10000, alias="TOKEN_CACHE_MAX_SIZE")
+    user_cache_ttl_seconds: float = Field(60.0, alias="USER_CACHE_TTL_SECONDS")  # how long an authenticated user row is reused
+    user_cache_max_size: int = Field(10000, alias="USER_CACHE_MAX_SIZE")
+    password_hash_workers: int = Field(4, alias="PASSWORD_HASH_WORKERS")  # threads dedicated to bcrypt
+    password_hash_max_queue: int = Field(64, alias="PASSWORD_HASH_MAX_QUEUE")  # waiting hash jobs before requests get 503
     
     # MySQL Configuration
     mysql_host: str = Field("localhost", alias="MYSQL_HOST")
@@ -22,10 +28,53 @@ class Settings(BaseSettings):
     mysql_password: str = Field("routecraft_password", alias="MYSQL_PASSWORD")
     mysql_database: str = Field("routecraft", alias="MYSQL_DATABASE")
     mysql_port: int = Field(3306, alias="MYSQL_PORT")
+    mysql_pool_min_size: int = Field(1, alias="MYSQL_POOL_MIN_SIZE")
+    mysql_pool_max_size: int = Field(10, alias="MYSQL_POOL_MAX_SIZE")
+    mysql_pool_timeout: float = Field(5.0, alias="MYSQL_POOL_TIMEOUT")  # seconds to wait for a free connection
+    mysql_pool_recycle: int = Field(3600, alias="MYSQL_POOL_RECYCLE")  # max connection lifetime in seconds
+    mysql_pool_ping_interval: float = Field(30.0, alias="MYSQL_POOL_PING_INTERVAL")  # ping idle connections older than this on borrow
+    mysql_replica_hosts: List[str] = Field([], alias="MYSQL_REPLICA_HOSTS")  # read replicas as "host" or "host:port"
+    mysql_statement_cache_size: int = Field(32, alias="MYSQL_STATEMENT_CACHE_SIZE")  # prepared statements kept per connection; 0 disables
+    database_async_backend: str = Field("aiomysql", alias="DATABASE_ASYNC_BACKEND")  # aiomysql or thread
+    slow_query_threshold_ms: float = Field(500.0, alias="SLOW_QUERY_THRESHOLD_MS")  # log statements slower than this; 0 disables
+    list_count_default_mode: str = Field("exact", alias="LIST_COUNT_DEFAULT_MODE")  # none, estimate, cached or exact
+    count_cache_ttl_seconds: float = Field(30.0, alias="COUNT_CACHE_TTL_SECONDS")  # reuse of cached/estimated totals per filter set
+    count_cache_max_size: int = Field(1000, alias="COUNT_CACHE_MAX_SIZE")
+    query_stats_max_fingerprints: int = Field(500, alias="QUERY_STATS_MAX_FINGERPRINTS")  # distinct statements tracked before grouping as <other>
+    
+    # Bid batches
+    bid_batch_max_size: int = Field(1000, alias="BID_BATCH_MAX_SIZE")  # most bids accepted by POST /bids/batch
+    
+    # Statistics
+    bid_stats_table_enabled: bool = Field(False, alias="BID_STATS_TABLE_ENABLED")  # serve bid stats from the bid_user_stats rollup
+    dashboard_summary_enabled: bool = Field(False, alias="DASHBOARD_SUMMARY_ENABLED")  # serve the dashboard overview from the dashboard_summary row
+    dashboard_summary_refresh_seconds: float = Field(30.0, alias="DASHBOARD_SUMMARY_REFRESH_SECONDS")  # how often the summary row is recomputed
+    dashboard_cache_ttl_seconds: float = Field(5.0, alias="DASHBOARD_CACHE_TTL_SECONDS")  # reuse of a computed dashboard overview
+    dashboard_stream_debounce_seconds: float = Field(1.0, alias="DASHBOARD_STREAM_DEBOUNCE_SECONDS")  # writes within this window produce one live update
+    dashboard_stream_poll_seconds: float = Field(30.0, alias="DASHBOARD_STREAM_POLL_SECONDS")  # recompute interval that picks up other workers' writes
+    dashboard_stream_heartbeat_seconds: float = Field(15.0, alias="DASHBOARD_STREAM_HEARTBEAT_SECONDS")  # keepalive comment on idle streams
+    dashboard_stream_max_pending: int = Field(16, alias="DASHBOARD_STREAM_MAX_PENDING")  # queued events per viewer before it is resynced
+    
+    # Network Analysis
+    location_index_refresh_seconds: float = Field(60.0, alias="LOCATION_INDEX_REFRESH_SECONDS")  # how often the in-memory location index picks up locations_master changes
+    analysis_job_max_concurrency: int = Field(2, alias="ANALYSIS_JOB_MAX_CONCURRENCY")  # network analyses computed at once per worker
+    analysis_job_max_queued: int = Field(20, alias="ANALYSIS_JOB_MAX_QUEUED")  # started analyses waiting for a slot before /start is refused
+    analysis_job_timeout_seconds: float = Field(600.0, alias="ANALYSIS_JOB_TIMEOUT_SECONDS")  # an analysis running longer is marked failed
+    analysis_job_heartbeat_seconds: float = Field(30.0, alias="ANALYSIS_JOB_HEARTBEAT_SECONDS")  # how often a worker marks its analyses alive; three missed beats and another worker fails them
     
     # Redis Configuration
     redis_url: str = Field("redis://localhost:6379", alias="REDIS_URL")
     
+    # Response Cache
+    response_cache_enabled: bool = Field(True, alias="RESPONSE_CACHE_ENABLED")  # cache dashboard and stats responses
+    response_cache_redis_enabled: bool = Field(True, alias="RESPONSE_CACHE_REDIS_ENABLED")  # share entries through Redis; false keeps them in-process
+    response_cache_key_prefix: str = Field("routecraft:cache", alias="RESPONSE_CACHE_KEY_PREFIX")
+    response_cache_default_ttl_seconds: float = Field(30.0, alias="RESPONSE_CACHE_DEFAULT_TTL_SECONDS")
+    response_cache_l1_ttl_seconds: float = Field(2.0, alias="RESPONSE_CACHE_L1_TTL_SECONDS")  # in-process tier; bounds staleness after another worker invalidates
+    response_cache_l1_max_size: int = Field(1000, alias="RESPONSE_CACHE_L1_MAX_SIZE")
+    response_cache_lock_timeout_seconds: float = Field(5.0, alias="RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS")  # how long other workers wait on one computing a miss
+    response_cache_redis_timeout_seconds: float = Field(0.5, alias="RESPONSE_CACHE_REDIS_TIMEOUT_SECONDS")
+    
     # CORS Configuration
     allowed_origins: List[str] = Field(["http://localhost:3000", "http://localhost:5173", "http://localhost:8080"], alias="ALLOWED_ORIGINS")
     
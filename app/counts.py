@@ -0,0 +1,87 @@
+"""
+Total-Count Strategies for RouteCraft List Endpoints
+
+``COUNT(*)`` with the page's WHERE clause is often the most expensive half of
+a list request. Clients pick how much they need via ``count=``:
+
+- ``none``: skip the count entirely
+- ``estimate``: the optimizer's row estimate (table statistics or EXPLAIN)
+- ``cached``: an exact count, reused for the same filters for a short TTL
+- ``exact``: always run ``COUNT(*)``
+"""
+from app.cache import TTLCache
+from app.config import settings
+from app.database_mysql import quote_identifier
+from typing import Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+COUNT_MODES = ("none", "estimate", "cached", "exact")
+
+COUNT_MODE_PATTERN = "^(" + "|".join(COUNT_MODES) + ")$"
+
+count_cache = TTLCache(
+    max_size=settings.count_cache_max_size,
+    ttl=settings.count_cache_ttl_seconds,
+    name="counts"
+)
+
+
+async def _exact_count(db, from_sql: str, where_clause: str, params: Sequence) -> int:
+    result = await db.execute_query(f"SELECT COUNT(*) as total FROM {from_sql} WHERE {where_clause}", tuple(params))
+    return int(result[0]["total"]) if result else 0
+
+
+async def _estimated_count(db, table: str, from_sql: str, where_clause: str, params: Sequence) -> int:
+    if where_clause == "1=1":
+        # Unfiltered: InnoDB's table statistics, no scan at all
+        result = await db.execute_query(
+            "SELECT TABLE_ROWS as total FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,)
+        )
+        return int(result[0]["total"] or 0) if result else 0
+
+    # Filtered: rows the optimizer expects to examine, scaled by its filter estimate
+    plan = await db.execute_query(f"EXPLAIN SELECT 1 FROM {from_sql} WHERE {where_clause}", tuple(params))
+    if not plan:
+        return 0
+    rows = float(plan[0].get("rows") or 0)
+    filtered = float(plan[0].get("filtered") or 100)
+    return int(round(rows * filtered / 100))
+
+
+async def count_rows(db, table: str, where_clause: str = "1=1", params: Sequence = (),
+                     mode: str = "exact", alias: Optional[str] = None) -> Optional[int]:
+    """
+    Count rows of ``table`` matching ``where_clause`` using the requested
+    strategy. Returns None for ``mode="none"``. ``alias`` is the table alias
+    the WHERE clause refers to, if any.
+    """
+    if mode == "none":
+        return None
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {mode}")
+
+    from_sql = quote_identifier(table) + (f" {quote_identifier(alias)}" if alias else "")
+
+    if mode == "exact":
+        return await _exact_count(db, from_sql, where_clause, params)
+
+    key = (mode, table, alias, where_clause, tuple(params))
+    total = count_cache.get(key)
+    if total is not None:
+        return total
+
+    if mode == "estimate":
+        try:
+            total = await _estimated_count(db, table, from_sql, where_clause, params)
+        except Exception as e:
+            logger.warning(f"Count estimate for {table} failed, counting exactly: {e}")
+            total = await _exact_count(db, from_sql, where_clause, params)
+    else:
+        total = await _exact_count(db, from_sql, where_clause, params)
+
+    count_cache.set(key, total)
+    return total
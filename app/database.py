@@ -2,14 +2,15 @@
 Database Connection Module for RouteCraft Backend
 Uses MySQL as the primary database
 """
-from app.database_mysql import MySQLDatabase
+from app.database_mysql import db
+from app.database_async import async_db
 from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Global database instance
-db_instance = MySQLDatabase()
+# Share the global instance so the whole app draws from a single connection pool
+db_instance = db
 
 def get_db():
     """Dependency to get database connection"""
@@ -17,4 +18,8 @@ def get_db():
 
 def get_connection():
     """Get a database connection context manager"""
-    return db_instance.get_connection() 
\ No newline at end of file
+    return db_instance.get_connection()
+
+def get_async_db():
+    """Dependency to get the async database used by route handlers"""
+    return async_db
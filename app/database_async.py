@@ -0,0 +1,572 @@
+"""
+Async Database Module for RouteCraft Backend
+
+Route handlers are ``async def``; awaiting these backends keeps a slow query
+from blocking the event loop for every other request on the worker.
+"""
+from app.database_mysql import (
+    MySQLDatabase, Transaction, db as sync_db, DEFAULT_CHUNK_SIZE, DEFAULT_STREAM_BATCH_SIZE,
+    chunked, prepare_bulk_rows, build_bulk_insert, with_for_update,
+    normalize_row, build_insert, build_update, inserted_row,
+    parse_host, record_write, reads_pinned_to_primary
+)
+from app.database_pool import PoolTimeoutError
+from app.query_stats import query_stats
+from app.config import settings
+from typing import Dict, Any, List, Optional, Sequence, AsyncIterator
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import itertools
+import logging
+
+try:
+    import aiomysql
+except ImportError:  # pragma: no cover - optional dependency
+    aiomysql = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTransaction:
+    """Unit of work bound to a single aiomysql connection"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def execute_query(self, query: str, params: tuple = None,
+                            for_update: bool = False) -> List[Dict[str, Any]]:
+        """Execute a SELECT, optionally locking the matched rows until commit"""
+        if for_update:
+            query = with_for_update(query)
+        async with self.connection.cursor(aiomysql.DictCursor) as cursor:
+            with query_stats.measure(query, params, connected=True) as timer:
+                await cursor.execute(query, params or ())
+                results = list(await cursor.fetchall())
+                timer.rows = len(results)
+            return results
+
+    async def _execute_write(self, query: str, params: tuple = None):
+        async with self.connection.cursor() as cursor:
+            with query_stats.measure(query, params, connected=True) as timer:
+                await cursor.execute(query, params or ())
+                timer.rows = cursor.rowcount
+            return cursor.lastrowid, cursor.rowcount
+
+    async def execute_insert(self, query: str, params: tuple = None) -> int:
+        """Execute an INSERT and return the last insert ID"""
+        return (await self._execute_write(query, params))[0]
+
+    async def execute_update(self, query: str, params: tuple = None) -> int:
+        """Execute an UPDATE and return the number of affected rows"""
+        return (await self._execute_write(query, params))[1]
+
+    async def execute_delete(self, query: str, params: tuple = None) -> int:
+        """Execute a DELETE and return the number of affected rows"""
+        return (await self._execute_write(query, params))[1]
+
+    async def insert_returning(self, table: str, row: Dict[str, Any],
+                               defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """INSERT one row and return it as persisted, without reading it back"""
+        row = normalize_row(row)
+        row_id = await self.execute_insert(*build_insert(table, row))
+        return inserted_row(row, row_id, defaults)
+
+    async def update_returning(self, table: str, current: Dict[str, Any], changes: Dict[str, Any],
+                               key: str = "id") -> Dict[str, Any]:
+        """UPDATE the row ``current`` (as previously read) and return it with ``changes`` applied"""
+        changes = normalize_row(changes)
+        await self.execute_update(*build_update(table, changes, current[key], key))
+        return {**current, **changes}
+
+    async def execute_many(self, query: str, seq_params: Sequence[tuple]) -> int:
+        """Execute one statement for many parameter sets and return the affected row count"""
+        seq_params = list(seq_params)
+        async with self.connection.cursor() as cursor:
+            with query_stats.measure(query, seq_params[:1], connected=True) as timer:
+                await cursor.executemany(query, seq_params)
+                timer.rows = cursor.rowcount
+            return cursor.rowcount
+
+    async def bulk_insert(self, table: str, rows: Sequence, columns: Optional[Sequence[str]] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, ignore_duplicates: bool = False) -> List[int]:
+        """Multi-row INSERT inside the transaction; returns per-chunk inserted counts"""
+        columns, values = prepare_bulk_rows(rows, columns)
+        counts = []
+        async with self.connection.cursor() as cursor:
+            for chunk in chunked(values, chunk_size):
+                query = build_bulk_insert(table, columns, len(chunk), ignore_duplicates)
+                params = [value for row in chunk for value in row]
+                with query_stats.measure(query, params, connected=True) as timer:
+                    await cursor.execute(query, params)
+                    timer.rows = cursor.rowcount
+                counts.append(cursor.rowcount)
+        return counts
+
+    async def commit(self):
+        """Commit the work so far and continue in a fresh transaction"""
+        await self.connection.commit()
+        await self.connection.begin()
+
+    async def rollback(self):
+        """Discard the work so far and continue in a fresh transaction"""
+        await self.connection.rollback()
+        await self.connection.begin()
+
+
+class AsyncMySQLDatabase:
+    """asyncio-native MySQL backend built on aiomysql with its own pool"""
+
+    def __init__(self, host: str = None, user: str = None,
+                 password: str = None, database: str = None):
+        if aiomysql is None:
+            raise RuntimeError("aiomysql is not installed")
+
+        self.config = {
+            'host': host or settings.mysql_host,
+            'user': user or settings.mysql_user,
+            'password': password or settings.mysql_password,
+            'db': database or settings.mysql_database,
+            'port': settings.mysql_port,
+            'charset': 'utf8mb4',
+            'autocommit': True,
+            'minsize': settings.mysql_pool_min_size,
+            'maxsize': settings.mysql_pool_max_size,
+            'pool_recycle': settings.mysql_pool_recycle
+        }
+        self.timeout = settings.mysql_pool_timeout
+        self.replica_configs = []
+        for entry in settings.mysql_replica_hosts:
+            replica_host, replica_port = parse_host(entry, settings.mysql_port)
+            self.replica_configs.append(dict(self.config, host=replica_host, port=replica_port))
+        self._replica_counter = itertools.count()
+        self._pool = None
+        self._replica_pools = [None] * len(self.replica_configs)
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self, replica: Optional[int] = None):
+        if replica is None:
+            if self._pool is None:
+                async with self._pool_lock:
+                    if self._pool is None:
+                        self._pool = await aiomysql.create_pool(**self.config)
+            return self._pool
+        if self._replica_pools[replica] is None:
+            async with self._pool_lock:
+                if self._replica_pools[replica] is None:
+                    self._replica_pools[replica] = await aiomysql.create_pool(**self.replica_configs[replica])
+        return self._replica_pools[replica]
+
+    async def _acquire(self, replica: Optional[int] = None):
+        try:
+            pool = await self._get_pool(replica)
+            return pool, await asyncio.wait_for(pool.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(msg=f"Timed out after {self.timeout}s waiting for a database connection")
+
+    @asynccontextmanager
+    async def get_connection(self, read: bool = False, timer=None):
+        """
+        Async context manager that borrows a connection from the pool. Reads go
+        to a replica (round-robin) until the request writes; a replica that
+        cannot hand out a connection falls back to the primary. ``timer`` is
+        marked connected once the connection is in hand.
+        """
+        acquired = None
+        if not read:
+            record_write()
+        elif self.replica_configs and not reads_pinned_to_primary():
+            replica = next(self._replica_counter) % len(self.replica_configs)
+            try:
+                acquired = await self._acquire(replica)
+            except (PoolTimeoutError, aiomysql.Error, OSError) as e:
+                logger.warning(f"Replica {self.replica_configs[replica]['host']} unavailable, reading from primary: {e}")
+        if acquired is None:
+            try:
+                acquired = await self._acquire()
+            except aiomysql.Error as e:
+                logger.error(f"Error connecting to MySQL: {e}")
+                raise
+        pool, connection = acquired
+        if timer is not None:
+            timer.connected()
+        try:
+            yield connection
+        finally:
+            pool.release(connection)
+
+    async def execute_query(self, query: str, params: tuple = None,
+                            prepared: bool = False) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT query and return results. ``prepared`` is accepted for
+        API parity only: aiomysql speaks the text protocol and cannot prepare.
+        """
+        with query_stats.measure(query, params) as timer:
+            async with self.get_connection(read=True, timer=timer) as connection:
+                async with connection.cursor(aiomysql.DictCursor) as cursor:
+                    try:
+                        await cursor.execute(query, params or ())
+                        results = list(await cursor.fetchall())
+                        timer.rows = len(results)
+                        return results
+                    except aiomysql.Error as e:
+                        logger.error(f"Error executing query: {e}")
+                        raise
+
+    @asynccontextmanager
+    async def transaction(self, isolation_level: Optional[str] = None):
+        """
+        Run a block of statements on one pooled connection in one transaction.
+        Commits when the block exits normally and rolls back on any exception.
+        """
+        async with self.get_connection() as connection:
+            if isolation_level:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}")
+            await connection.begin()
+            try:
+                yield AsyncTransaction(connection)
+                await connection.commit()
+            except BaseException:
+                await connection.rollback()
+                raise
+
+    async def iter_query(self, query: str, params: tuple = None,
+                         batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a SELECT through a server-side cursor, fetching ``batch_size`` rows at a time"""
+        # Execution time covers the whole stream, including consumer time between batches
+        with query_stats.measure(query, params) as timer:
+            async with self.get_connection(read=True, timer=timer) as connection:
+                exhausted = False
+                cursor = await connection.cursor(aiomysql.SSDictCursor)
+                try:
+                    await cursor.execute(query, params or ())
+                    while True:
+                        rows = await cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        timer.rows += len(rows)
+                        for row in rows:
+                            yield row
+                    exhausted = True
+                    await cursor.close()
+                except aiomysql.Error as e:
+                    logger.error(f"Error streaming query: {e}")
+                    raise
+                finally:
+                    if not exhausted:
+                        # Closing drops the half-read result instead of draining it;
+                        # the pool discards closed connections on release.
+                        connection.close()
+
+    async def _execute_write(self, query: str, params: tuple, kind: str):
+        with query_stats.measure(query, params) as timer:
+            async with self.get_connection(timer=timer) as connection:
+                async with connection.cursor() as cursor:
+                    try:
+                        await cursor.execute(query, params or ())
+                        await connection.commit()
+                        timer.rows = cursor.rowcount
+                        return cursor.lastrowid if kind == "insert" else cursor.rowcount
+                    except aiomysql.Error as e:
+                        logger.error(f"Error executing {kind}: {e}")
+                        await connection.rollback()
+                        raise
+
+    async def execute_insert(self, query: str, params: tuple = None) -> int:
+        """Execute an INSERT query and return the last insert ID"""
+        return await self._execute_write(query, params, "insert")
+
+    async def execute_update(self, query: str, params: tuple = None) -> int:
+        """Execute an UPDATE query and return the number of affected rows"""
+        return await self._execute_write(query, params, "update")
+
+    async def execute_delete(self, query: str, params: tuple = None) -> int:
+        """Execute a DELETE query and return the number of affected rows"""
+        return await self._execute_write(query, params, "delete")
+
+    async def insert_returning(self, table: str, row: Dict[str, Any],
+                               defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """INSERT one row and return it as persisted, without reading it back"""
+        row = normalize_row(row)
+        row_id = await self.execute_insert(*build_insert(table, row))
+        return inserted_row(row, row_id, defaults)
+
+    async def update_returning(self, table: str, current: Dict[str, Any], changes: Dict[str, Any],
+                               key: str = "id") -> Dict[str, Any]:
+        """UPDATE the row ``current`` (as previously read) and return it with ``changes`` applied"""
+        changes = normalize_row(changes)
+        await self.execute_update(*build_update(table, changes, current[key], key))
+        return {**current, **changes}
+
+    async def execute_many(self, query: str, seq_params: Sequence[tuple],
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+        """Execute one statement for many parameter sets, committing once per chunk"""
+        seq_params = list(seq_params)
+        counts = []
+        with query_stats.measure(query, seq_params[:1]) as timer:
+            async with self.get_connection(timer=timer) as connection:
+                async with connection.cursor() as cursor:
+                    for index, chunk in enumerate(chunked(seq_params, chunk_size)):
+                        await connection.begin()
+                        try:
+                            await cursor.executemany(query, chunk)
+                            await connection.commit()
+                        except aiomysql.Error as e:
+                            logger.error(f"Error executing batch chunk {index}: {e}")
+                            await connection.rollback()
+                            raise
+                        counts.append(cursor.rowcount)
+                        timer.rows += cursor.rowcount
+        return counts
+
+    async def bulk_insert(self, table: str, rows: Sequence, columns: Optional[Sequence[str]] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, ignore_duplicates: bool = False) -> List[int]:
+        """Insert many rows using multi-row VALUES statements, one commit per chunk"""
+        columns, values = prepare_bulk_rows(rows, columns)
+        counts = []
+        if not values:
+            return counts
+        async with self.get_connection() as connection:
+            async with connection.cursor() as cursor:
+                for index, chunk in enumerate(chunked(values, chunk_size)):
+                    query = build_bulk_insert(table, columns, len(chunk), ignore_duplicates)
+                    params = [value for row in chunk for value in row]
+                    try:
+                        with query_stats.measure(query, params, connected=True) as timer:
+                            await cursor.execute(query, params)
+                            await connection.commit()
+                            timer.rows = cursor.rowcount
+                    except aiomysql.Error as e:
+                        logger.error(f"Error bulk inserting chunk {index} into {table}: {e}")
+                        await connection.rollback()
+                        raise
+                    counts.append(cursor.rowcount)
+        return counts
+
+    def _describe_pool(self, pool, config: Dict[str, Any], name: str) -> Dict[str, Any]:
+        if pool is None:
+            return {"name": name, "size": 0, "idle": 0, "in_use": 0,
+                    "min_size": config['minsize'], "max_size": config['maxsize']}
+        return {
+            "name": name,
+            "size": pool.size,
+            "idle": pool.freesize,
+            "in_use": pool.size - pool.freesize,
+            "min_size": pool.minsize,
+            "max_size": pool.maxsize
+        }
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool occupancy"""
+        stats = self._describe_pool(self._pool, self.config, "aiomysql")
+        stats["replicas"] = [
+            self._describe_pool(pool, config, f"aiomysql_replica_{index}")
+            for index, (pool, config) in enumerate(zip(self._replica_pools, self.replica_configs))
+        ]
+        return stats
+
+    async def close(self):
+        """Close the pools and wait for connections to be released"""
+        for pool in [self._pool, *self._replica_pools]:
+            if pool is not None:
+                pool.close()
+                await pool.wait_closed()
+        self._pool = None
+        self._replica_pools = [None] * len(self.replica_configs)
+
+
+class ThreadTransaction:
+    """Awaitable view of a sync Transaction whose statements run on the worker pool"""
+
+    def __init__(self, transaction: Transaction, run):
+        self._transaction = transaction
+        self._run = run
+
+    async def execute_query(self, query: str, params: tuple = None,
+                            for_update: bool = False) -> List[Dict[str, Any]]:
+        """Execute a SELECT, optionally locking the matched rows until commit"""
+        return await self._run(self._transaction.execute_query, query, params, for_update)
+
+    async def execute_insert(self, query: str, params: tuple = None) -> int:
+        """Execute an INSERT and return the last insert ID"""
+        return await self._run(self._transaction.execute_insert, query, params)
+
+    async def execute_update(self, query: str, params: tuple = None) -> int:
+        """Execute an UPDATE and return the number of affected rows"""
+        return await self._run(self._transaction.execute_update, query, params)
+
+    async def execute_delete(self, query: str, params: tuple = None) -> int:
+        """Execute a DELETE and return the number of affected rows"""
+        return await self._run(self._transaction.execute_delete, query, params)
+
+    async def insert_returning(self, table: str, row: Dict[str, Any],
+                               defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """INSERT one row and return it as persisted, without reading it back"""
+        return await self._run(self._transaction.insert_returning, table, row, defaults)
+
+    async def update_returning(self, table: str, current: Dict[str, Any], changes: Dict[str, Any],
+                               key: str = "id") -> Dict[str, Any]:
+        """UPDATE the row ``current`` (as previously read) and return it with ``changes`` applied"""
+        return await self._run(self._transaction.update_returning, table, current, changes, key)
+
+    async def execute_many(self, query: str, seq_params: Sequence[tuple]) -> int:
+        """Execute one statement for many parameter sets and return the affected row count"""
+        return await self._run(self._transaction.execute_many, query, seq_params)
+
+    async def bulk_insert(self, table: str, rows: Sequence, columns: Optional[Sequence[str]] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, ignore_duplicates: bool = False) -> List[int]:
+        """Multi-row INSERT inside the transaction; returns per-chunk inserted counts"""
+        return await self._run(self._transaction.bulk_insert, table, rows, columns, chunk_size, ignore_duplicates)
+
+    async def commit(self):
+        """Commit the work so far and continue in a fresh transaction"""
+        await self._run(self._transaction.commit)
+
+    async def rollback(self):
+        """Discard the work so far and continue in a fresh transaction"""
+        await self._run(self._transaction.rollback)
+
+
+class ThreadPoolDatabase:
+    """
+    Fallback async adapter that runs a synchronous MySQLDatabase on a bounded
+    thread pool, so blocking driver calls never run on the event loop thread.
+
+    Work that needs a connection first takes one of ``mysql_pool_max_size``
+    slots on the event loop, and a transaction or stream keeps its slot until
+    it ends. Worker threads therefore never block checking out a connection,
+    so callers queued for one cannot starve a transaction that already holds
+    a connection of the thread its next statement needs.
+    """
+
+    def __init__(self, database: MySQLDatabase, max_workers: int = None):
+        self.db = database
+        self.timeout = settings.mysql_pool_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.mysql_pool_max_size,
+            thread_name_prefix="routecraft-db"
+        )
+        self._connections = asyncio.Semaphore(settings.mysql_pool_max_size)
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        # Carry request-scoped context variables into the worker thread
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, functools.partial(ctx.run, func, *args, **kwargs))
+
+    @asynccontextmanager
+    async def _connection_slot(self):
+        try:
+            await asyncio.wait_for(self._connections.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(msg=f"Timed out after {self.timeout}s waiting for a database connection")
+        try:
+            yield
+        finally:
+            self._connections.release()
+
+    async def _call(self, func, *args, **kwargs):
+        """Run one self-contained call (its own checkout) in a connection slot"""
+        async with self._connection_slot():
+            return await self._run(func, *args, **kwargs)
+
+    async def execute_query(self, query: str, params: tuple = None,
+                            prepared: bool = False) -> List[Dict[str, Any]]:
+        """Execute a SELECT query and return results"""
+        return await self._call(self.db.execute_query, query, params, prepared)
+
+    @asynccontextmanager
+    async def transaction(self, isolation_level: Optional[str] = None):
+        """
+        Run a block of statements on one pooled connection in one transaction.
+        Commits when the block exits normally and rolls back on any exception.
+        """
+        async with self._connection_slot():
+            context = self.db.transaction(isolation_level)
+            transaction = await self._run(context.__enter__)
+            try:
+                yield ThreadTransaction(transaction, self._run)
+            except BaseException as e:
+                await self._run(context.__exit__, type(e), e, e.__traceback__)
+                raise
+            else:
+                await self._run(context.__exit__, None, None, None)
+
+    async def iter_query(self, query: str, params: tuple = None,
+                         batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a SELECT, pulling one batch at a time from a worker thread"""
+        async with self._connection_slot():
+            batches = self.db.iter_query_batches(query, params, batch_size)
+            try:
+                while True:
+                    rows = await self._run(next, batches, None)
+                    if rows is None:
+                        break
+                    for row in rows:
+                        yield row
+            finally:
+                await self._run(batches.close)
+
+    async def execute_insert(self, query: str, params: tuple = None) -> int:
+        """Execute an INSERT query and return the last insert ID"""
+        return await self._call(self.db.execute_insert, query, params)
+
+    async def execute_update(self, query: str, params: tuple = None) -> int:
+        """Execute an UPDATE query and return the number of affected rows"""
+        return await self._call(self.db.execute_update, query, params)
+
+    async def execute_delete(self, query: str, params: tuple = None) -> int:
+        """Execute a DELETE query and return the number of affected rows"""
+        return await self._call(self.db.execute_delete, query, params)
+
+    async def insert_returning(self, table: str, row: Dict[str, Any],
+                               defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """INSERT one row and return it as persisted, without reading it back"""
+        return await self._call(self.db.insert_returning, table, row, defaults)
+
+    async def update_returning(self, table: str, current: Dict[str, Any], changes: Dict[str, Any],
+                               key: str = "id") -> Dict[str, Any]:
+        """UPDATE the row ``current`` (as previously read) and return it with ``changes`` applied"""
+        return await self._call(self.db.update_returning, table, current, changes, key)
+
+    async def execute_many(self, query: str, seq_params: Sequence[tuple],
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+        """Execute one statement for many parameter sets, committing once per chunk"""
+        return await self._call(self.db.execute_many, query, seq_params, chunk_size)
+
+    async def bulk_insert(self, table: str, rows: Sequence, columns: Optional[Sequence[str]] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, ignore_duplicates: bool = False) -> List[int]:
+        """Insert many rows using multi-row VALUES statements, one commit per chunk"""
+        return await self._call(self.db.bulk_insert, table, rows, columns, chunk_size, ignore_duplicates)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool occupancy and counters"""
+        return self.db.pool_stats()
+
+    async def close(self):
+        """Shut down the worker threads and close idle connections"""
+        self._executor.shutdown(wait=False)
+        self.db.close()
+
+
+def create_async_database():
+    """Build the configured async backend, falling back to the thread pool adapter"""
+    backend = settings.database_async_backend.lower()
+    if backend == "aiomysql":
+        if aiomysql is not None:
+            return AsyncMySQLDatabase()
+        logger.warning("aiomysql is not installed; falling back to thread pool database backend")
+    elif backend != "thread":
+        logger.warning(f"Unknown DATABASE_ASYNC_BACKEND '{backend}'; using thread pool backend")
+    return ThreadPoolDatabase(sync_db)
+
+
+# Global async database instance
+async_db = create_async_database()
+
+def get_async_db():
+    """Dependency function to get the async database"""
+    return async_db
@@ -2,16 +2,310 @@
 MySQL Database Connection Module for RouteCraft Backend
 """
 import mysql.connector
-from mysql.connector import Error
-from typing import Dict, Any, List, Optional
+from mysql.connector import Error, errors
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Iterable, Iterator
+from collections import OrderedDict
+from contextvars import ContextVar
+import itertools
 import logging
+import re
+import threading
 from contextlib import contextmanager
+from app.database_pool import ConnectionPool
+from app.query_stats import query_stats
 
 logger = logging.getLogger(__name__)
 
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+DEFAULT_CHUNK_SIZE = 1000
+
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+# Per-request read-your-writes state; set by ``request_scope`` and shared by
+# reference with worker threads that copy the caller's context.
+_request_state: ContextVar[Optional[Dict[str, bool]]] = ContextVar("db_request_state", default=None)
+
+
+@contextmanager
+def request_scope():
+    """Track writes for one request so later reads in it see them"""
+    token = _request_state.set({"wrote": False})
+    try:
+        yield
+    finally:
+        _request_state.reset(token)
+
+
+def record_write():
+    """Pin the rest of the current request's reads to the primary"""
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+def reads_pinned_to_primary() -> bool:
+    """True once the current request has written to the primary"""
+    state = _request_state.get()
+    return bool(state and state["wrote"])
+
+
+def parse_host(entry: str, default_port: int) -> Tuple[str, int]:
+    """Split a ``host`` or ``host:port`` entry"""
+    host, _, port = entry.strip().partition(":")
+    return host, int(port) if port else default_port
+
+
+def quote_identifier(name: str) -> str:
+    """Backtick-quote a table or column name, rejecting anything that isn't a plain identifier"""
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return f"`{name}`"
+
+
+def chunked(items: Sequence, chunk_size: int) -> Iterable[Sequence]:
+    """Yield consecutive slices of ``items`` with at most ``chunk_size`` elements"""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def prepare_bulk_rows(rows: Sequence, columns: Optional[Sequence[str]] = None) -> Tuple[List[str], List[tuple]]:
+    """
+    Normalise bulk insert input to (columns, value tuples).
+
+    Rows may be dicts (columns default to the first row's keys) or sequences,
+    in which case ``columns`` is required.
+    """
+    rows = list(rows)
+    if not rows:
+        return list(columns or []), []
+    if isinstance(rows[0], dict):
+        columns = list(columns or rows[0].keys())
+        values = [tuple(row.get(column) for column in columns) for row in rows]
+    else:
+        if not columns:
+            raise ValueError("columns are required when rows are sequences")
+        columns = list(columns)
+        values = [tuple(row) for row in rows]
+        if any(len(row) != len(columns) for row in values):
+            raise ValueError("every row must have one value per column")
+    return columns, values
+
+
+def build_bulk_insert(table: str, columns: Sequence[str], row_count: int,
+                      ignore_duplicates: bool = False) -> str:
+    """Build a multi-row ``INSERT ... VALUES (...), (...)`` statement"""
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    return "INSERT {ignore}INTO {table} ({columns}) VALUES {values}".format(
+        ignore="IGNORE " if ignore_duplicates else "",
+        table=quote_identifier(table),
+        columns=", ".join(quote_identifier(column) for column in columns),
+        values=", ".join([placeholders] * row_count)
+    )
+
+
+def with_for_update(query: str) -> str:
+    """Append a row-locking clause to a SELECT"""
+    return f"{query.rstrip().rstrip(';')} FOR UPDATE"
+
+
+def normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Drop sub-second precision from datetimes. The schema's TIMESTAMP columns
+    store whole seconds, so this makes the values we write exactly the values
+    a later SELECT would read back.
+    """
+    return {column: value.replace(microsecond=0) if isinstance(value, datetime) else value
+            for column, value in row.items()}
+
+
+def build_insert(table: str, row: Dict[str, Any]) -> Tuple[str, tuple]:
+    """Build a single-row ``INSERT`` from a column -> value dict"""
+    if not row:
+        raise ValueError("row must have at least one column")
+    query = "INSERT INTO {table} ({columns}) VALUES ({values})".format(
+        table=quote_identifier(table),
+        columns=", ".join(quote_identifier(column) for column in row),
+        values=", ".join(["%s"] * len(row))
+    )
+    return query, tuple(row.values())
+
+
+def build_update(table: str, changes: Dict[str, Any], key_value: Any, key: str = "id") -> Tuple[str, tuple]:
+    """Build a single-row ``UPDATE ... WHERE key = %s`` from a column -> value dict"""
+    if not changes:
+        raise ValueError("changes must have at least one column")
+    query = "UPDATE {table} SET {assignments} WHERE {key} = %s".format(
+        table=quote_identifier(table),
+        assignments=", ".join(f"{quote_identifier(column)} = %s" for column in changes),
+        key=quote_identifier(key)
+    )
+    return query, tuple(changes.values()) + (key_value,)
+
+
+def inserted_row(row: Dict[str, Any], row_id: Any, defaults: Optional[Dict[str, Any]] = None,
+                 key: str = "id") -> Dict[str, Any]:
+    """
+    The row as persisted: server-side column ``defaults`` the caller relies
+    on, overlaid with the written values and the generated key.
+    """
+    return {**(defaults or {}), **row, key: row_id}
+
+
+class Transaction:
+    """
+    Unit of work bound to a single pooled connection. Every statement runs in
+    the same transaction; nothing is committed until the block exits cleanly
+    or ``commit()`` is called explicitly.
+    """
+    
+    def __init__(self, connection):
+        self.connection = connection
+    
+    def execute_query(self, query: str, params: tuple = None,
+                      for_update: bool = False) -> List[Dict[str, Any]]:
+        """Execute a SELECT, optionally locking the matched rows until commit"""
+        if for_update:
+            query = with_for_update(query)
+        cursor = self.connection.cursor(dictionary=True)
+        try:
+            with query_stats.measure(query, params, connected=True) as timer:
+                cursor.execute(query, params or ())
+                results = cursor.fetchall()
+                timer.rows = len(results)
+            return results
+        finally:
+            cursor.close()
+    
+    def _execute_write(self, query: str, params: tuple = None) -> Tuple[int, int]:
+        cursor = self.connection.cursor()
+        try:
+            with query_stats.measure(query, params, connected=True) as timer:
+                cursor.execute(query, params or ())
+                timer.rows = cursor.rowcount
+            return cursor.lastrowid, cursor.rowcount
+        finally:
+            cursor.close()
+    
+    def execute_insert(self, query: str, params: tuple = None) -> int:
+        """Execute an INSERT and return the last insert ID"""
+        return self._execute_write(query, params)[0]
+    
+    def execute_update(self, query: str, params: tuple = None) -> int:
+        """Execute an UPDATE and return the number of affected rows"""
+        return self._execute_write(query, params)[1]
+    
+    def execute_delete(self, query: str, params: tuple = None) -> int:
+        """Execute a DELETE and return the number of affected rows"""
+        return self._execute_write(query, params)[1]
+    
+    def insert_returning(self, table: str, row: Dict[str, Any],
+                         defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """INSERT one row and return it as persisted, without reading it back"""
+        row = normalize_row(row)
+        row_id = self.execute_insert(*build_insert(table, row))
+        return inserted_row(row, row_id, defaults)
+    
+    def update_returning(self, table: str, current: Dict[str, Any], changes: Dict[str, Any],
+                         key: str = "id") -> Dict[str, Any]:
+        """UPDATE the row ``current`` (as previously read) and return it with ``changes`` applied"""
+        changes = normalize_row(changes)
+        self.execute_update(*build_update(table, changes, current[key], key))
+        return {**current, **changes}
+    
+    def execute_many(self, query: str, seq_params: Sequence[tuple]) -> int:
+        """Execute one statement for many parameter sets and return the affected row count"""
+        seq_params = list(seq_params)
+        cursor = self.connection.cursor()
+        try:
+            with query_stats.measure(query, seq_params[:1], connected=True) as timer:
+                cursor.executemany(query, seq_params)
+                timer.rows = cursor.rowcount
+            return cursor.rowcount
+        finally:
+            cursor.close()
+    
+    def bulk_insert(self, table: str, rows: Sequence, columns: Optional[Sequence[str]] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, ignore_duplicates: bool = False) -> List[int]:
+        """Multi-row INSERT inside the transaction; returns per-chunk inserted counts"""
+        columns, values = prepare_bulk_rows(rows, columns)
+        counts = []
+        cursor = self.connection.cursor()
+        try:
+            for chunk in chunked(values, chunk_size):
+                query = build_bulk_insert(table, columns, len(chunk), ignore_duplicates)
+                params = [value for row in chunk for value in row]
+                with query_stats.measure(query, params, connected=True) as timer:
+                    cursor.execute(query, params)
+                    timer.rows = cursor.rowcount
+                counts.append(cursor.rowcount)
+            return counts
+        finally:
+            cursor.close()
+    
+    def commit(self):
+        """Commit the work so far and continue in a fresh transaction"""
+        self.connection.commit()
+        self.connection.start_transaction()
+    
+    def rollback(self):
+        """Discard the work so far and continue in a fresh transaction"""
+        self.connection.rollback()
+        self.connection.start_transaction()
+
+
+class StatementCache:
+    """
+    LRU of server-side prepared statements for one connection, keyed by SQL
+    text. Each entry is a prepared cursor; evicting it closes the statement
+    on the server.
+    """
+    
+    def __init__(self, connection, max_size: int):
+        self.connection = connection
+        self.max_size = max_size
+        self._cursors = OrderedDict()
+    
+    def get(self, query: str) -> Tuple[Any, str, bool]:
+        """
+        Return ``(cursor, sql, hit)`` for ``query``. Callers must execute the
+        returned ``sql`` object: the driver only skips re-preparing when it is
+        handed the identical string it prepared last time.
+        """
+        entry = self._cursors.get(query)
+        if entry is not None:
+            self._cursors.move_to_end(query)
+            return entry[0], entry[1], True
+        
+        while len(self._cursors) >= self.max_size:
+            _, (cursor, _) = self._cursors.popitem(last=False)
+            self._close_cursor(cursor)
+        cursor = self.connection.cursor(prepared=True, dictionary=True)
+        self._cursors[query] = (cursor, query)
+        return cursor, query, False
+    
+    def discard(self, query: str):
+        """Drop one statement, e.g. after the server rejected it"""
+        entry = self._cursors.pop(query, None)
+        if entry is not None:
+            self._close_cursor(entry[0])
+    
+    def _close_cursor(self, cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
+    
+    def __len__(self):
+        return len(self._cursors)
+
+
 class MySQLDatabase:
     def __init__(self, host: str = None, user: str = None, 
-                 password: str = None, database: str = None):
+                 password: str = None, database: str = None, port: int = None):
         from app.config import settings
         
         self.config = {
@@ -19,34 +313,138 @@ class MySQLDatabase:
             'user': user or settings.mysql_user,
             'password': password or settings.mysql_password,
             'database': database or settings.mysql_database,
-            'port': settings.mysql_port,
+            'port': port or settings.mysql_port,
             'charset': 'utf8mb4',
-            'autocommit': True,
-            'pool_name': 'routecraft_pool',
-            'pool_size': 5
+            'autocommit': True
         }
+        
+        self.pool = ConnectionPool(
+            self.config,
+            min_size=settings.mysql_pool_min_size,
+            max_size=settings.mysql_pool_max_size,
+            timeout=settings.mysql_pool_timeout,
+            recycle=settings.mysql_pool_recycle,
+            ping_interval=settings.mysql_pool_ping_interval,
+            name='routecraft_pool'
+        )
+        
+        self.replica_pools = []
+        for index, entry in enumerate(settings.mysql_replica_hosts):
+            replica_host, replica_port = parse_host(entry, settings.mysql_port)
+            self.replica_pools.append(ConnectionPool(
+                dict(self.config, host=replica_host, port=replica_port),
+                min_size=settings.mysql_pool_min_size,
+                max_size=settings.mysql_pool_max_size,
+                timeout=settings.mysql_pool_timeout,
+                recycle=settings.mysql_pool_recycle,
+                ping_interval=settings.mysql_pool_ping_interval,
+                name=f'routecraft_replica_{index}'
+            ))
+        self._replica_counter = itertools.count()
+        
+        self.statement_cache_size = settings.mysql_statement_cache_size
+        self._statement_lock = threading.Lock()
+        self._statement_stats = {"hits": 0, "misses": 0, "evictions": 0, "errors": 0}
     
-    @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        connection = None
+    def _acquire(self, read: bool = False):
+        """
+        Borrow from a replica (round-robin) for reads, unless the request has
+        already written, and from the primary otherwise. A replica that cannot
+        hand out a connection falls back to the primary.
+        """
+        if not read:
+            record_write()
+        elif self.replica_pools and not reads_pinned_to_primary():
+            pool = self.replica_pools[next(self._replica_counter) % len(self.replica_pools)]
+            try:
+                return pool, pool.acquire()
+            except Error as e:
+                logger.warning(f"Replica pool '{pool.name}' unavailable, reading from primary: {e}")
         try:
-            connection = mysql.connector.connect(**self.config)
-            yield connection
+            return self.pool, self.pool.acquire()
         except Error as e:
             logger.error(f"Error connecting to MySQL: {e}")
             raise
+    
+    @contextmanager
+    def _borrow(self, read: bool = False):
+        """Borrow a pooled connection, discarding it if the server connection failed"""
+        pool, pooled = self._acquire(read)
+        discard = False
+        try:
+            yield pooled
+        except (errors.OperationalError, errors.InterfaceError):
+            # The connection itself is suspect; don't hand it to the next caller
+            discard = True
+            raise
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            pool.release(pooled, discard=discard)
+    
+    @contextmanager
+    def get_connection(self, read: bool = False):
+        """
+        Context manager that borrows a connection from the pool. Pass
+        ``read=True`` for read-only work that may be served by a replica.
+        """
+        with self._borrow(read) as pooled:
+            yield pooled.raw
     
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
-        """Execute a SELECT query and return results"""
+    @contextmanager
+    def _timed(self, query: str, params=None, read: bool = False):
+        """Borrow a connection for one statement, recording wait and execution time"""
+        with query_stats.measure(query, params) as timer:
+            with self._borrow(read) as pooled:
+                timer.connected()
+                yield pooled, timer
+    
+    @contextmanager
+    def transaction(self, isolation_level: Optional[str] = None):
+        """
+        Run a block of statements on one pooled connection in one transaction.
+        Commits when the block exits normally and rolls back on any exception.
+        """
         with self.get_connection() as connection:
-            cursor = connection.cursor(dictionary=True)
+            connection.start_transaction(isolation_level=isolation_level)
+            try:
+                yield Transaction(connection)
+                connection.commit()
+            except BaseException:
+                # Includes a cancelled async caller (ThreadPoolDatabase)
+                connection.rollback()
+                raise
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool occupancy and counters"""
+        stats = self.pool.stats()
+        stats["replicas"] = [pool.stats() for pool in self.replica_pools]
+        with self._statement_lock:
+            stats["statement_cache"] = dict(self._statement_stats, max_size=self.statement_cache_size)
+        return stats
+    
+    def _count_statement(self, key: str, amount: int = 1):
+        with self._statement_lock:
+            self._statement_stats[key] += amount
+    
+    def close(self):
+        """Close idle pooled connections"""
+        self.pool.close()
+        for pool in self.replica_pools:
+            pool.close()
+    
+    def execute_query(self, query: str, params: tuple = None,
+                      prepared: bool = False) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT query and return results. With ``prepared=True`` the
+        statement is prepared once per connection and reused from its cache.
+        """
+        if prepared and self.statement_cache_size > 0:
+            return self._execute_prepared(query, params)
+        with self._timed(query, params, read=True) as (pooled, timer):
+            cursor = pooled.raw.cursor(dictionary=True)
             try:
                 cursor.execute(query, params or ())
                 results = cursor.fetchall()
+                timer.rows = len(results)
                 return results
             except Error as e:
                 logger.error(f"Error executing query: {e}")
@@ -54,13 +452,82 @@ class MySQLDatabase:
             finally:
                 cursor.close()
     
+    def _execute_prepared(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        with self._timed(query, params, read=True) as (pooled, timer):
+            if pooled.statements is None:
+                pooled.statements = StatementCache(pooled.raw, self.statement_cache_size)
+            cache = pooled.statements
+            size_before = len(cache)
+            cursor, sql, hit = cache.get(query)
+            if hit:
+                self._count_statement("hits")
+            else:
+                self._count_statement("misses")
+                evicted = size_before + 1 - len(cache)
+                if evicted:
+                    self._count_statement("evictions", evicted)
+            try:
+                cursor.execute(sql, params or ())
+                results = cursor.fetchall()
+                timer.rows = len(results)
+                return results
+            except Error as e:
+                # Don't keep a statement the server refused (e.g. after a schema change)
+                cache.discard(query)
+                self._count_statement("errors")
+                logger.error(f"Error executing prepared query: {e}")
+                raise
+    
+    def iter_query_batches(self, query: str, params: tuple = None,
+                           batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream a SELECT through an unbuffered (server-side) cursor, yielding
+        lists of at most ``batch_size`` rows so memory stays flat regardless
+        of result size. The connection is held until the generator finishes.
+        """
+        # Execution time covers the whole stream, including time the consumer
+        # spends between batches.
+        with query_stats.measure(query, params) as timer:
+            pool, pooled = self._acquire(read=True)
+            timer.connected()
+            exhausted = False
+            try:
+                cursor = pooled.raw.cursor(dictionary=True, buffered=False)
+                try:
+                    cursor.execute(query, params or ())
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        timer.rows += len(rows)
+                        yield rows
+                    exhausted = True
+                except Error as e:
+                    logger.error(f"Error streaming query: {e}")
+                    raise
+                finally:
+                    if exhausted:
+                        cursor.close()
+            finally:
+                # A half-read unbuffered result would poison the next borrower;
+                # drop the connection rather than draining millions of rows.
+                pool.release(pooled, discard=not exhausted)
+    
+    def iter_query(self, query: str, params: tuple = None,
+                   batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream a SELECT row by row, fetching ``batch_size`` rows at a time"""
+        for rows in self.iter_query_batches(query, params, batch_size):
+            yield from rows
+    
     def execute_insert(self, query: str, params: tuple = None) -> int:
         """Execute an INSERT query and return the last insert ID"""
-        with self.get_connection() as connection:
+        with self._timed(query, params) as (pooled, timer):
+            connection = pooled.raw
             cursor = connection.cursor()
             try:
                 cursor.execute(query, params or ())
                 connection.commit()
+                timer.rows = cursor.rowcount
                 return cursor.lastrowid
             except Error as e:
                 logger.error(f"Error executing insert: {e}")
@@ -71,11 +538,13 @@ class MySQLDatabase:
     
     def execute_update(self, query: str, params: tuple = None) -> int:
         """Execute an UPDATE query and return the number of affected rows"""
-        with self.get_connection() as connection:
+        with self._timed(query, params) as (pooled, timer):
+            connection = pooled.raw
             cursor = connection.cursor()
             try:
                 cursor.execute(query, params or ())
                 connection.commit()
+                timer.rows = cursor.rowcount
                 return cursor.rowcount
             except Error as e:
                 logger.error(f"Error executing update: {e}")
@@ -84,13 +553,33 @@ class MySQLDatabase:
             finally:
                 cursor.close()
     
+    def insert_returning(self, table: str, row: Dict[str, Any],
+                         defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        INSERT one row and return it as persisted: the written values, the
+        generated id and any server ``defaults`` the caller passes. MySQL has
+        no ``RETURNING``, so this saves the usual re-``SELECT``.
+        """
+        row = normalize_row(row)
+        row_id = self.execute_insert(*build_insert(table, row))
+        return inserted_row(row, row_id, defaults)
+    
+    def update_returning(self, table: str, current: Dict[str, Any], changes: Dict[str, Any],
+                         key: str = "id") -> Dict[str, Any]:
+        """UPDATE the row ``current`` (as previously read) and return it with ``changes`` applied"""
+        changes = normalize_row(changes)
+        self.execute_update(*build_update(table, changes, current[key], key))
+        return {**current, **changes}
+    
     def execute_delete(self, query: str, params: tuple = None) -> int:
         """Execute a DELETE query and return the number of affected rows"""
-        with self.get_connection() as connection:
+        with self._timed(query, params) as (pooled, timer):
+            connection = pooled.raw
             cursor = connection.cursor()
             try:
                 cursor.execute(query, params or ())
                 connection.commit()
+                timer.rows = cursor.rowcount
                 return cursor.rowcount
             except Error as e:
                 logger.error(f"Error executing delete: {e}")
@@ -99,6 +588,65 @@ class MySQLDatabase:
             finally:
                 cursor.close()
 
+    def execute_many(self, query: str, seq_params: Sequence[tuple],
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+        """
+        Execute one statement for many parameter sets, committing once per
+        chunk. INSERTs are rewritten by the driver into multi-row statements.
+        Returns the affected row count of each chunk.
+        """
+        seq_params = list(seq_params)
+        counts = []
+        with self._timed(query, seq_params[:1]) as (pooled, timer):
+            connection = pooled.raw
+            cursor = connection.cursor()
+            try:
+                for index, chunk in enumerate(chunked(seq_params, chunk_size)):
+                    connection.start_transaction()
+                    try:
+                        cursor.executemany(query, chunk)
+                        connection.commit()
+                    except Error as e:
+                        logger.error(f"Error executing batch chunk {index}: {e}")
+                        connection.rollback()
+                        raise
+                    counts.append(cursor.rowcount)
+                    timer.rows += cursor.rowcount
+                return counts
+            finally:
+                cursor.close()
+    
+    def bulk_insert(self, table: str, rows: Sequence, columns: Optional[Sequence[str]] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, ignore_duplicates: bool = False) -> List[int]:
+        """
+        Insert many rows using multi-row VALUES statements, one commit per
+        chunk. Rows are dicts or sequences matching ``columns``. Returns the
+        inserted row count of each chunk.
+        """
+        columns, values = prepare_bulk_rows(rows, columns)
+        counts = []
+        if not values:
+            return counts
+        with self.get_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                for index, chunk in enumerate(chunked(values, chunk_size)):
+                    query = build_bulk_insert(table, columns, len(chunk), ignore_duplicates)
+                    params = [value for row in chunk for value in row]
+                    try:
+                        with query_stats.measure(query, params, connected=True) as timer:
+                            cursor.execute(query, params)
+                            connection.commit()
+                            timer.rows = cursor.rowcount
+                    except Error as e:
+                        logger.error(f"Error bulk inserting chunk {index} into {table}: {e}")
+                        connection.rollback()
+                        raise
+                    counts.append(cursor.rowcount)
+                return counts
+            finally:
+                cursor.close()
+
 # Global database instance
 db = MySQLDatabase()
 
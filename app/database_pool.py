@@ -0,0 +1,230 @@
+"""
+MySQL Connection Pool for RouteCraft Backend
+"""
+import mysql.connector
+from mysql.connector import Error
+from typing import Dict, Any, Optional
+from collections import deque
+from contextlib import contextmanager
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Error):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class PooledConnection:
+    """A raw MySQL connection plus the bookkeeping the pool needs"""
+
+    __slots__ = ("raw", "created_at", "last_used", "statements")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # Per-connection prepared statement cache, created lazily by the database layer
+        self.statements = None
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of MySQL connections.
+
+    Unlike ``mysql.connector.pooling.MySQLConnectionPool`` (which fails
+    immediately when exhausted) callers wait up to ``timeout`` seconds for a
+    connection to be returned. Idle connections are health-checked on borrow
+    and recycled once they are older than ``recycle`` seconds.
+    """
+
+    def __init__(self, config: Dict[str, Any], min_size: int = 1, max_size: int = 10,
+                 timeout: float = 5.0, recycle: int = 3600, ping_interval: float = 30.0,
+                 name: str = "routecraft_pool"):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.config = config
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_interval = ping_interval
+
+        self._idle = deque()
+        self._size = 0
+        self._warmed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "created": 0,
+            "discarded": 0,
+            "failed_health_checks": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def _connect(self) -> PooledConnection:
+        """Open a new raw connection (caller must already have reserved a slot)"""
+        raw = mysql.connector.connect(**self.config)
+        with self._cond:
+            self._stats["created"] += 1
+        return PooledConnection(raw)
+
+    def _close_quietly(self, conn: PooledConnection):
+        try:
+            conn.raw.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, conn: PooledConnection) -> bool:
+        """Health check run on every borrow of an idle connection"""
+        now = time.monotonic()
+        if self.recycle and now - conn.created_at > self.recycle:
+            return False
+        if now - conn.last_used < self.ping_interval:
+            return True
+        try:
+            # is_connected() pings the server
+            if conn.raw.is_connected():
+                return True
+        except Exception:
+            pass
+        with self._cond:
+            self._stats["failed_health_checks"] += 1
+        return False
+
+    def _discard(self, conn: PooledConnection):
+        self._close_quietly(conn)
+        with self._cond:
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def warm(self):
+        """Open connections until at least ``min_size`` are established"""
+        with self._cond:
+            self._warmed = True
+            missing = max(0, self.min_size - self._size)
+            self._size += missing
+
+        opened = []
+        try:
+            for _ in range(missing):
+                opened.append(self._connect())
+        except Error as e:
+            logger.warning(f"Could not warm connection pool '{self.name}': {e}")
+        finally:
+            with self._cond:
+                self._size -= missing - len(opened)
+                self._idle.extend(opened)
+                self._cond.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Borrow a connection, waiting up to ``timeout`` seconds for one to free up"""
+        if not self._warmed:
+            self.warm()
+
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            conn = None
+            create = False
+            with self._cond:
+                while True:
+                    if self._idle:
+                        # LIFO keeps the most recently used (warmest) connections busy
+                        conn = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            msg=f"Timed out after {timeout}s waiting for a connection from pool '{self.name}'"
+                        )
+                    self._cond.wait(remaining)
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_usable(conn):
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._stats["checkouts"] += 1
+                self._stats["total_wait_seconds"] += waited
+                self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+            return conn
+
+    def release(self, conn: PooledConnection, discard: bool = False):
+        """Return a borrowed connection to the pool"""
+        if not discard:
+            try:
+                if conn.raw.in_transaction:
+                    conn.raw.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            self._discard(conn)
+            return
+
+        conn.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager that borrows a connection and always returns it"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close every idle connection; borrowed ones are closed on release"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._warmed = False
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and lifetime counters"""
+        with self._cond:
+            idle = len(self._idle)
+            stats = dict(self._stats)
+            stats.update({
+                "name": self.name,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+            })
+        checkouts = stats["checkouts"]
+        stats["avg_wait_seconds"] = round(stats["total_wait_seconds"] / checkouts, 6) if checkouts else 0.0
+        return stats
@@ -112,11 +112,32 @@ class BidResponse(BaseModel):
     message: str = "Bid retrieved successfully"
 
 
+class BidBatchCreate(BaseModel):
+    bids: List[BidCreate] = Field(..., min_length=1)
+
+
+class BidBatchItemResult(BaseModel):
+    index: int
+    status: str  # "created", "duplicate" or "invalid"
+    bid_id: Optional[str] = None
+    name: str
+    lane_ids: List[str]
+    error: Optional[str] = None
+
+
+class BidBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BidBatchItemResult]
+    message: str = "Bid batch processed"
+
+
 class BidListResponse(BaseModel):
     bids: List[BidSummary]
-    total: int
-    page: int
+    total: Optional[int] = None  # omitted on cursor continuation pages
+    page: Optional[int] = None  # offset mode only
     size: int
+    next_cursor: Optional[str] = None
 
 
 class BidStats(BaseModel):
@@ -125,6 +146,7 @@ class BidStats(BaseModel):
     closed_bids: int
     awarded_bids: int
     total_value: float
+    average_value: float = 0.0
     currency: str
     bids_by_type: Dict[str, int]
     bids_by_status: Dict[str, int] 
\ No newline at end of file
@@ -43,6 +43,7 @@ class CarrierBase(BaseModel):
     tax_id: Optional[str] = Field(None, max_length=20)
     insurance_coverage: Optional[float] = Field(None, ge=0)
     fleet_size: Optional[int] = Field(None, ge=0)
+    base_location_id: Optional[str] = Field(None, max_length=50)  # locations_master location_id
     operating_radius: Optional[int] = Field(None, ge=0)  # in miles
     specialties: Optional[List[str]] = None
     certifications: Optional[List[str]] = None
@@ -71,6 +72,7 @@ class CarrierUpdate(BaseModel):
     tax_id: Optional[str] = Field(None, max_length=20)
     insurance_coverage: Optional[float] = Field(None, ge=0)
     fleet_size: Optional[int] = Field(None, ge=0)
+    base_location_id: Optional[str] = Field(None, max_length=50)
     operating_radius: Optional[int] = Field(None, ge=0)
     specialties: Optional[List[str]] = None
     certifications: Optional[List[str]] = None
@@ -132,7 +134,7 @@ class CarrierResponse(BaseModel):
 
 class CarrierListResponse(BaseModel):
     carriers: List[CarrierSummary]
-    total: int
+    total: Optional[int] = None  # omitted with count=none
     page: int
     size: int
 
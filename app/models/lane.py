@@ -35,8 +35,10 @@ class LaneBase(BaseModel):
     destination_city: str = Field(..., min_length=1, max_length=100)
     destination_state: str = Field(..., min_length=2, max_length=2)
     destination_zip: str = Field(..., min_length=5, max_length=10)
+    origin_location_id: Optional[str] = Field(None, max_length=50)  # locations_master.location_id
+    destination_location_id: Optional[str] = Field(None, max_length=50)
     lane_type: LaneType
-    distance_miles: float = Field(..., ge=0)
+    distance_miles: Optional[float] = Field(None, ge=0)  # derived from the locations when omitted
     estimated_transit_time_hours: Optional[int] = Field(None, ge=0)
     volume: float = Field(..., ge=0)
     volume_unit: VolumeUnit
@@ -60,6 +62,8 @@ class LaneUpdate(BaseModel):
     destination_city: Optional[str] = Field(None, min_length=1, max_length=100)
     destination_state: Optional[str] = Field(None, min_length=2, max_length=2)
     destination_zip: Optional[str] = Field(None, min_length=5, max_length=10)
+    origin_location_id: Optional[str] = Field(None, max_length=50)
+    destination_location_id: Optional[str] = Field(None, max_length=50)
     lane_type: Optional[LaneType] = None
     distance_miles: Optional[float] = Field(None, ge=0)
     estimated_transit_time_hours: Optional[int] = Field(None, ge=0)
@@ -108,7 +112,7 @@ class LaneSummary(BaseModel):
     destination_city: str
     destination_state: str
     lane_type: LaneType
-    distance_miles: float
+    distance_miles: Optional[float]
     volume: float
     volume_unit: VolumeUnit
     status: LaneStatus
@@ -125,7 +129,7 @@ class LaneResponse(BaseModel):
 
 class LaneListResponse(BaseModel):
     lanes: List[LaneSummary]
-    total: int
+    total: Optional[int] = None  # omitted with count=none
     page: int
     size: int
 
@@ -17,6 +17,7 @@ class AnalysisStatus(str, Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class MetricType(str, Enum):
@@ -157,6 +158,14 @@ class AnalysisSummary(BaseModel):
     recommendations: List[str]
 
 
+class ScoringWeights(BaseModel):
+    type_match: float = Field(3.0, ge=0.0, description="Score when the carrier type matches the lane type")
+    premium: float = Field(2.0, ge=0.0, description="Score for premium service level carriers")
+    express: float = Field(1.0, ge=0.0, description="Score for express service level carriers")
+    rating: float = Field(1.0, ge=0.0, description="Score per carrier rating point")
+    in_radius: float = Field(1.0, ge=0.0, description="Score when the lane is within the carrier's operating radius")
+
+
 class NetworkOptimizationRequest(BaseModel):
     optimization_type: str = Field(..., description="Type of optimization: cost, time, efficiency, or balanced")
     max_routes: Optional[int] = Field(None, ge=1, le=100, description="Maximum number of routes to return")
@@ -164,4 +173,17 @@ class NetworkOptimizationRequest(BaseModel):
     time_weight: Optional[float] = Field(0.3, ge=0.0, le=1.0, description="Weight for time optimization")
     efficiency_weight: Optional[float] = Field(0.2, ge=0.0, le=1.0, description="Weight for efficiency optimization")
     include_inactive: bool = Field(False, description="Include inactive lanes and carriers in optimization")
-    filters: Optional[Dict[str, Any]] = Field(None, description="Additional filters for optimization") 
\ No newline at end of file
+    filters: Optional[Dict[str, Any]] = Field(None, description="Additional filters for optimization")
+    use_lane_volume: bool = Field(False, description="Assign each lane's volume instead of one load per lane")
+    carrier_capacity: Optional[int] = Field(None, ge=1, description="Loads per carrier when it has no capacity of its own; unlimited if omitted")
+    candidates_per_lane: int = Field(25, ge=1, le=500, description="Cheapest carriers per lane considered by the solver")
+    scoring_weights: ScoringWeights = Field(default_factory=ScoringWeights, description="Weights of the carrier-lane score")
+    enforce_operating_radius: bool = Field(False, description="Only pair carriers with lanes whose origin is within their operating radius")
+
+
+class TopCarriersRequest(BaseModel):
+    k: int = Field(5, ge=1, le=50, description="Number of carriers to return per lane")
+    lane_ids: Optional[List[int]] = Field(None, description="Lanes to rank carriers for; all lanes if omitted")
+    include_inactive: bool = Field(False, description="Include inactive lanes and carriers")
+    scoring_weights: ScoringWeights = Field(default_factory=ScoringWeights, description="Weights of the carrier-lane score")
+    enforce_operating_radius: bool = Field(False, description="Only pair carriers with lanes whose origin is within their operating radius")
@@ -71,6 +71,6 @@ class UserResponse(BaseModel):
 
 class UserListResponse(BaseModel):
     users: List[User]
-    total: int
+    total: Optional[int] = None  # omitted with count=none
     page: int
     size: int 
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+Keyset Pagination Helpers for RouteCraft Backend
+
+Cursors are opaque to clients: URL-safe base64 of the sort key of the last
+row on the previous page.
+"""
+from typing import Any, Tuple
+from datetime import datetime
+import base64
+import json
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Encode the ``(created_at, id)`` of the last row returned"""
+    raw = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """Decode a cursor from ``encode_cursor``; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), data["i"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
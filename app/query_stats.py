@@ -0,0 +1,182 @@
+"""
+Query Timing and Slow-Query Log for RouteCraft Backend
+
+Every statement run through the database layer is timed and aggregated under
+a normalized fingerprint (literals and placeholders replaced by ``?``), so
+``SELECT * FROM bids WHERE id = 1`` and ``... id = 2`` share one entry.
+"""
+from app.config import settings
+from typing import Dict, Any, Optional
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the execution-time histogram buckets; the
+# last bucket catches everything slower.
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+OVERFLOW_FINGERPRINT = "<other>"
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"(?<![\w`])-?\d+(?:\.\d+)?(?![\w`])")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s|\?")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_RE = re.compile(r"(values\s*\(\?\+?\))(?:\s*,\s*\(\?\+?\))+", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(query: str) -> str:
+    """Normalize a statement so executions that differ only in literals group together"""
+    sql = _COMMENT_RE.sub(" ", query)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip().rstrip(";").lower()
+    # Collapse IN (...) lists and multi-row VALUES so batch sizes don't fan out
+    sql = _LIST_RE.sub("(?+)", sql)
+    return _VALUES_RE.sub(r"\1, ...", sql)
+
+
+def redact_params(params) -> str:
+    """Describe bound parameters by type only so slow-query logs carry no user data"""
+    if not params:
+        return "[]"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+    if len(params) > 10:
+        return f"[{len(params)} params]"
+    return "[" + ", ".join(type(value).__name__ for value in params) + "]"
+
+
+class QueryTimer:
+    """Timing for one statement: connection wait, execution and row count"""
+
+    __slots__ = ("query", "params", "rows", "started", "connected_at")
+
+    def __init__(self, query: str, params=None):
+        self.query = query
+        self.params = params
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.connected_at = None
+
+    def connected(self):
+        """Mark the end of the wait for a pooled connection"""
+        self.connected_at = time.perf_counter()
+
+
+class QueryStats:
+    """Thread-safe per-fingerprint aggregates plus the slow-query log"""
+
+    def __init__(self, slow_query_ms: float = 500.0, max_fingerprints: int = 500):
+        self.slow_query_ms = slow_query_ms
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._since = datetime.utcnow()
+
+    @contextmanager
+    def measure(self, query: str, params=None, connected: bool = False):
+        """
+        Time the enclosed statement. Call ``timer.connected()`` once a
+        connection is in hand (or pass ``connected=True`` when one already
+        is) and set ``timer.rows`` before leaving the block.
+        """
+        timer = QueryTimer(query, params)
+        if connected:
+            timer.connected_at = timer.started
+        failed = False
+        try:
+            yield timer
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._record(timer, time.perf_counter(), failed)
+
+    def _record(self, timer: QueryTimer, finished: float, failed: bool):
+        connected_at = timer.connected_at or finished
+        wait_ms = (connected_at - timer.started) * 1000
+        exec_ms = (finished - connected_at) * 1000
+        key = fingerprint(timer.query)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    key = OVERFLOW_FINGERPRINT
+                    entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = {
+                        "calls": 0,
+                        "errors": 0,
+                        "slow_calls": 0,
+                        "rows": 0,
+                        "total_exec_ms": 0.0,
+                        "max_exec_ms": 0.0,
+                        "total_wait_ms": 0.0,
+                        "max_wait_ms": 0.0,
+                        "histogram": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+                    }
+            entry["calls"] += 1
+            entry["rows"] += timer.rows or 0
+            entry["total_exec_ms"] += exec_ms
+            entry["max_exec_ms"] = max(entry["max_exec_ms"], exec_ms)
+            entry["total_wait_ms"] += wait_ms
+            entry["max_wait_ms"] = max(entry["max_wait_ms"], wait_ms)
+            entry["histogram"][bisect_left(HISTOGRAM_BUCKETS_MS, exec_ms)] += 1
+            if failed:
+                entry["errors"] += 1
+            slow = self.slow_query_ms > 0 and exec_ms >= self.slow_query_ms
+            if slow:
+                entry["slow_calls"] += 1
+
+        if slow:
+            logger.warning(
+                f"Slow query: {exec_ms:.1f} ms exec, {wait_ms:.1f} ms connection wait, "
+                f"{timer.rows or 0} rows: {key} params={redact_params(timer.params)}"
+            )
+
+    def snapshot(self, sort_by: str = "total_exec_ms", limit: Optional[int] = None) -> Dict[str, Any]:
+        """Aggregates per fingerprint, heaviest first"""
+        with self._lock:
+            entries = [dict(entry, fingerprint=key, histogram=list(entry["histogram"]))
+                       for key, entry in self._entries.items()]
+            since = self._since
+
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+        for entry in entries:
+            calls = entry["calls"]
+            entry["avg_exec_ms"] = round(entry["total_exec_ms"] / calls, 3) if calls else 0.0
+            entry["avg_wait_ms"] = round(entry["total_wait_ms"] / calls, 3) if calls else 0.0
+            entry["histogram"] = dict(zip(labels, entry["histogram"]))
+            for field in ("total_exec_ms", "max_exec_ms", "total_wait_ms", "max_wait_ms"):
+                entry[field] = round(entry[field], 3)
+
+        entries.sort(key=lambda entry: entry.get(sort_by, 0), reverse=True)
+        if limit is not None:
+            entries = entries[:limit]
+        return {
+            "since": since.isoformat(),
+            "slow_query_ms": self.slow_query_ms,
+            "fingerprints": entries,
+        }
+
+    def reset(self):
+        """Drop all aggregates"""
+        with self._lock:
+            self._entries.clear()
+            self._since = datetime.utcnow()
+
+
+query_stats = QueryStats(
+    slow_query_ms=settings.slow_query_threshold_ms,
+    max_fingerprints=settings.query_stats_max_fingerprints
+)
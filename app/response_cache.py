@@ -0,0 +1,299 @@
+"""
+Response Caching for RouteCraft Read-Heavy Endpoints
+
+Two tiers sit in front of the aggregate queries behind the dashboard and
+stats endpoints:
+
+- L1: a small in-process ``TTLCache`` per worker, checked first
+- L2: Redis (``REDIS_URL``), shared by every worker
+
+Entries are keyed by namespace, caller scope (role or user) and request
+parameters, and carry tags naming the tables they were computed from. Write
+endpoints invalidate tags: each tag has a generation counter in Redis that is
+part of every L2 key, so bumping it orphans all entries built from that
+table, including ones still being computed. Another worker's L1 may serve
+an entry for at most ``RESPONSE_CACHE_L1_TTL_SECONDS`` after invalidation.
+
+Concurrent misses for one key are collapsed: within a worker callers share a
+single in-flight load, and across workers a short Redis lock lets one worker
+compute while the rest wait for its result. If Redis is unreachable the
+cache keeps working on L1 alone and retries Redis later.
+"""
+from app.cache import TTLCache
+from app.change_feed import change_feed
+from app.config import settings
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Endpoint arguments that never distinguish one response from another
+UNKEYED_ARGS = frozenset({"db", "current_user"})
+
+LOCK_POLL_SECONDS = 0.05
+
+# Delete the lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def by_role(user) -> str:
+    """Scope shared by every user with the same role"""
+    return f"role:{getattr(user.role, 'value', user.role)}"
+
+
+def by_user(user) -> str:
+    """Scope private to one user"""
+    return f"user:{user.id}"
+
+
+def build_key(namespace: str, scope: str, params: Dict[str, Any]) -> str:
+    """Stable cache key for one namespace, caller scope and parameter set"""
+    encoded = json.dumps(jsonable_encoder(params), sort_keys=True, default=str)
+    digest = hashlib.sha1(encoded.encode()).hexdigest()[:16]
+    return f"{namespace}:{scope}:{digest}"
+
+
+class ResponseCache:
+    """Two-tier (in-process + Redis) cache with tag invalidation and single-flight loads"""
+
+    def __init__(self, redis_url: Optional[str], prefix: str = "routecraft:cache",
+                 default_ttl: float = 30.0, l1_ttl: float = 2.0, l1_max_size: int = 1000,
+                 lock_timeout: float = 5.0, redis_timeout: float = 0.5,
+                 redis_retry_interval: float = 30.0):
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.l1_ttl = l1_ttl
+        self.lock_timeout = lock_timeout
+        self.redis_timeout = redis_timeout
+        self.redis_retry_interval = redis_retry_interval
+        self.l1 = TTLCache(max_size=l1_max_size, ttl=l1_ttl, name="response_l1")
+        self._redis = None
+        self._redis_down_until = 0.0
+        self._tag_versions: Dict[str, int] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "l2_hits": 0, "l2_misses": 0, "loads": 0, "shared_loads": 0,
+            "lock_waits": 0, "invalidations": 0, "redis_errors": 0
+        }
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _client(self):
+        """The Redis client, or None while Redis is disabled or backing off"""
+        if self.redis_url is None or aioredis is None:
+            return None
+        if time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=self.redis_timeout,
+                socket_connect_timeout=self.redis_timeout
+            )
+        return self._redis
+
+    def _redis_failed(self, action: str, error: Exception):
+        self._count("redis_errors")
+        if time.monotonic() >= self._redis_down_until:
+            logger.warning(f"Response cache Redis {action} failed, using in-process cache only "
+                           f"for {self.redis_retry_interval:.0f}s: {error}")
+        self._redis_down_until = time.monotonic() + self.redis_retry_interval
+
+    def _local_versions(self, tags: Iterable[str]) -> tuple:
+        return tuple(self._tag_versions.get(tag, 0) for tag in tags)
+
+    async def get_or_set(self, key: str, loader: Callable[[], Awaitable[Any]],
+                         ttl: Optional[float] = None, tags: Iterable[str] = ()) -> Any:
+        """
+        Return the cached value for ``key``, calling ``loader`` on a miss. Values
+        are stored JSON-encoded, so callers always get the JSON-compatible form.
+        """
+        tags = tuple(sorted(set(tags)))
+        versions = self._local_versions(tags)
+        entry = self.l1.get(key)
+        if entry is not None and entry[1] == versions:
+            return entry[0]
+
+        # A load started before an invalidation of its tags is not shared with
+        # callers that arrive after it
+        flight = (key, versions)
+        future = self._inflight.get(flight)
+        if future is not None:
+            self._count("shared_loads")
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight] = future
+        try:
+            value = await self._load(key, loader, self.default_ttl if ttl is None else ttl, tags)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a load nobody else awaited doesn't warn at GC
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            # Only keep it if no invalidation of its tags happened meanwhile
+            if self._local_versions(tags) == versions:
+                self.l1.set(key, (value, versions), ttl=min(self.l1_ttl, self.default_ttl if ttl is None else ttl))
+            return value
+        finally:
+            self._inflight.pop(flight, None)
+
+    async def _compute(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        self._count("loads")
+        return jsonable_encoder(await loader())
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float, tags: tuple) -> Any:
+        client = self._client()
+        if client is None:
+            return await self._compute(loader)
+
+        try:
+            generations = await client.mget([f"{self.prefix}:gen:{tag}" for tag in tags]) if tags else []
+            full_key = f"{self.prefix}:v:{key}:" + ".".join(str(gen or 0) for gen in generations)
+            raw = await client.get(full_key)
+        except Exception as e:
+            self._redis_failed("read", e)
+            return await self._compute(loader)
+        if raw is not None:
+            self._count("l2_hits")
+            return json.loads(raw)
+        self._count("l2_misses")
+
+        lock_key = f"{self.prefix}:lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await client.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000))
+            if not acquired:
+                # Another worker is computing this entry; wait for it rather than pile on
+                self._count("lock_waits")
+                deadline = time.monotonic() + self.lock_timeout
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(LOCK_POLL_SECONDS)
+                    raw = await client.get(full_key)
+                    if raw is not None:
+                        return json.loads(raw)
+        except Exception as e:
+            self._redis_failed("lock", e)
+            return await self._compute(loader)
+
+        try:
+            value = await self._compute(loader)
+            try:
+                await client.set(full_key, json.dumps(value), px=max(1, int(ttl * 1000)))
+            except Exception as e:
+                self._redis_failed("write", e)
+            return value
+        finally:
+            if acquired:
+                try:
+                    await client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    self._redis_failed("unlock", e)
+
+    async def invalidate(self, *tags: str):
+        """Orphan every entry computed from any of ``tags``, in this worker and in Redis"""
+        if not tags:
+            return
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+        self._count("invalidations", len(tags))
+        client = self._client()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(f"{self.prefix}:gen:{tag}")
+                await pipe.execute()
+        except Exception as e:
+            self._redis_failed("invalidate", e)
+
+    async def close(self):
+        """Close the Redis connection pool"""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for both tiers and the Redis connection state"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["l1"] = self.l1.stats()
+        stats["redis_configured"] = self.redis_url is not None and aioredis is not None
+        stats["redis_available"] = stats["redis_configured"] and time.monotonic() >= self._redis_down_until
+        return stats
+
+
+response_cache = ResponseCache(
+    redis_url=settings.redis_url if settings.response_cache_redis_enabled else None,
+    prefix=settings.response_cache_key_prefix,
+    default_ttl=settings.response_cache_default_ttl_seconds,
+    l1_ttl=settings.response_cache_l1_ttl_seconds,
+    l1_max_size=settings.response_cache_l1_max_size,
+    lock_timeout=settings.response_cache_lock_timeout_seconds,
+    redis_timeout=settings.response_cache_redis_timeout_seconds
+)
+
+
+def cached(namespace: str, ttl: Optional[float] = None, tags: Iterable[str] = (),
+           vary: Optional[Callable[[Any], str]] = by_role):
+    """
+    Cache an endpoint's response. The key includes the endpoint's arguments
+    (except ``db`` and ``current_user``) and ``vary(current_user)``, so callers
+    who may see different data never share an entry.
+    """
+    tags = tuple(tags)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.response_cache_enabled:
+                return await func(*args, **kwargs)
+            user = kwargs.get("current_user")
+            scope = vary(user) if vary is not None and user is not None else "all"
+            params = {name: value for name, value in kwargs.items() if name not in UNKEYED_ARGS}
+            key = build_key(namespace, scope, params)
+            return await response_cache.get_or_set(key, lambda: func(*args, **kwargs), ttl, tags)
+        return wrapper
+    return decorator
+
+
+def invalidates(*tags: str):
+    """
+    Invalidate ``tags`` after the decorated write endpoint returns
+    successfully, and announce the change on the change feed.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            await response_cache.invalidate(*tags)
+            change_feed.publish(*tags)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1 @@
+# Domain Services Package
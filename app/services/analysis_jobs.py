@@ -0,0 +1,482 @@
+"""
+Background Execution of Network Analyses
+
+``POST /network-analysis/{id}/start`` hands the analysis to the worker's
+``AnalysisJobRunner``, which computes it off the request: at most
+``ANALYSIS_JOB_MAX_CONCURRENCY`` analyses run at once, up to
+``ANALYSIS_JOB_MAX_QUEUED`` more wait their turn, and further starts are
+refused. A job reads the requested metrics for the analysis period and the
+period before it (for trends), runs the lane assignment for optimization
+analyses, then writes ``results``, ``summary``, ``recommendations`` and
+``execution_time_seconds`` to its row itself.
+
+Progress lives in the worker running the job. Cancelling (or manually
+failing) an analysis is recorded on the row, whose status then leaves
+``in_progress``; jobs check it between stages, so a cancel reaching any
+worker stops the job at its next checkpoint. The worker that owns the job
+also cancels it immediately.
+
+A worker that crashes or is killed cannot record anything, so each worker
+touches the ``updated_at`` of the analyses it holds every
+``ANALYSIS_JOB_HEARTBEAT_SECONDS``. On startup and after every heartbeat,
+``in_progress`` rows nobody has touched for ``STALE_HEARTBEATS`` intervals
+are marked failed, which lets them be started again.
+"""
+from app.config import settings
+from app.database import async_db
+from app.services.route_optimizer import DEFAULT_CANDIDATES_PER_LANE, optimize_network
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Relative change (percent) below which a metric counts as stable
+STABLE_CHANGE_PERCENT = 1.0
+
+# Worsening (percent) from which a metric is critical rather than a warning
+CRITICAL_CHANGE_PERCENT = 10.0
+
+# Terminal row statuses; the job never overwrites these
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# Missed heartbeats after which an in_progress analysis is taken to have lost its worker
+STALE_HEARTBEATS = 3
+
+
+class JobQueueFullError(Exception):
+    """Raised when the runner already holds as many jobs as it may"""
+
+
+class JobCancelledError(Exception):
+    """Raised inside a job when its analysis was cancelled"""
+
+
+async def _single_value(db, query: str, params: tuple) -> Dict[str, Any]:
+    rows = await db.execute_query(query, params)
+    return rows[0] if rows else {}
+
+
+def _ratio(part, whole, scale: float = 100.0) -> Optional[float]:
+    return float(part) / float(whole) * scale if part is not None and whole else None
+
+
+async def _cost_per_mile(db, start: datetime, end: datetime) -> Optional[float]:
+    row = await _single_value(db, """
+        SELECT SUM(b.estimated_cost) as cost, SUM(l.distance_miles) as miles
+        FROM bids b JOIN lanes l ON l.id = b.lane_id
+        WHERE b.status = 'awarded' AND b.created_at >= %s AND b.created_at < %s
+    """, (start, end))
+    return _ratio(row.get("cost"), row.get("miles"), 1.0)
+
+
+async def _on_time_performance(db, start: datetime, end: datetime) -> Optional[float]:
+    row = await _single_value(db, """
+        SELECT AVG(overall_on_time_performance) as value FROM carrier_historical_metrics
+        WHERE period_start_date >= %s AND period_end_date < %s
+    """, (start, end))
+    return float(row["value"]) if row.get("value") is not None else None
+
+
+async def _damage_rate(db, start: datetime, end: datetime) -> Optional[float]:
+    row = await _single_value(db, """
+        SELECT
+            (SELECT COUNT(*) FROM insurance_claims
+             WHERE claim_type = 'damage' AND created_at >= %s AND created_at < %s) as damages,
+            (SELECT COUNT(*) FROM bids
+             WHERE status = 'awarded' AND created_at >= %s AND created_at < %s) as loads
+    """, (start, end, start, end))
+    return _ratio(row.get("damages"), row.get("loads"))
+
+
+async def _utilization_rate(db, start: datetime, end: datetime) -> Optional[float]:
+    row = await _single_value(db, """
+        SELECT
+            (SELECT COUNT(DISTINCT lane_id) FROM bids
+             WHERE lane_id IS NOT NULL AND created_at >= %s AND created_at < %s) as used,
+            (SELECT COUNT(*) FROM lanes WHERE status = 'active') as total
+    """, (start, end))
+    return _ratio(row.get("used"), row.get("total"))
+
+
+async def _carrier_performance(db, start: datetime, end: datetime) -> Optional[float]:
+    row = await _single_value(db, """
+        SELECT
+            COALESCE(SUM(CASE WHEN status = 'accepted' THEN 1 ELSE 0 END), 0) as accepted,
+            COALESCE(SUM(CASE WHEN status <> 'pending' THEN 1 ELSE 0 END), 0) as decided
+        FROM bid_responses WHERE created_at >= %s AND created_at < %s
+    """, (start, end))
+    return _ratio(row.get("accepted"), row.get("decided"))
+
+
+async def _lane_efficiency(db, start: datetime, end: datetime) -> Optional[float]:
+    row = await _single_value(db, """
+        SELECT
+            COALESCE(SUM(CASE WHEN status = 'awarded' THEN 1 ELSE 0 END), 0) as awarded,
+            COUNT(*) as total
+        FROM bids WHERE created_at >= %s AND created_at < %s
+    """, (start, end))
+    return _ratio(row.get("awarded"), row.get("total"))
+
+
+MetricComputer = Callable[[Any, datetime, datetime], Awaitable[Optional[float]]]
+
+# metric -> (computation, unit, whether higher values are better)
+METRICS: Dict[str, Tuple[MetricComputer, str, bool]] = {
+    "cost_per_mile": (_cost_per_mile, "$/mile", False),
+    "on_time_performance": (_on_time_performance, "%", True),
+    "damage_rate": (_damage_rate, "%", False),
+    "utilization_rate": (_utilization_rate, "%", True),
+    "carrier_performance": (_carrier_performance, "%", True),
+    "lane_efficiency": (_lane_efficiency, "%", True)
+}
+
+
+def build_result(metric: str, value: float, previous: Optional[float],
+                 benchmark: Optional[float]) -> Dict[str, Any]:
+    """One ``AnalysisResult``: the value with its trend against the previous period"""
+    _, unit, higher_is_better = METRICS[metric]
+    change = (value - previous) / abs(previous) * 100 if previous else 0.0
+    trend = "stable" if abs(change) < STABLE_CHANGE_PERCENT else ("increasing" if change > 0 else "decreasing")
+    worsening = -change if higher_is_better else change
+    status = "good" if worsening < STABLE_CHANGE_PERCENT else (
+        "critical" if worsening >= CRITICAL_CHANGE_PERCENT else "warning")
+    return {
+        "metric": metric,
+        "value": round(value, 4),
+        "unit": unit,
+        "trend": trend,
+        "change_percentage": round(change, 2),
+        "benchmark": benchmark,
+        "status": status
+    }
+
+
+def summarize(results: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    """``AnalysisSummary`` and recommendations for a list of metric results"""
+    def improvement(result):
+        higher_is_better = METRICS[result["metric"]][2]
+        return result["change_percentage"] if higher_is_better else -result["change_percentage"]
+
+    improving = [result for result in results if result["trend"] != "stable" and improvement(result) > 0]
+    declining = [result for result in results if result["trend"] != "stable" and improvement(result) < 0]
+    recommendations = [
+        f"{result['metric'].replace('_', ' ').capitalize()} worsened {abs(result['change_percentage']):.1f}% "
+        f"against the previous period; review the lanes and carriers behind it"
+        for result in sorted(declining, key=improvement) if result["status"] != "good"
+    ]
+    percentages = [result["value"] for result in results if result["unit"] == "%"]
+    summary = {
+        "total_metrics": len(results),
+        "improving_metrics": len(improving),
+        "declining_metrics": len(declining),
+        "stable_metrics": len(results) - len(improving) - len(declining),
+        "critical_metrics": sum(1 for result in results if result["status"] == "critical"),
+        "average_performance": round(sum(percentages) / len(percentages), 2) if percentages else 0.0,
+        "top_improvements": sorted(improving, key=improvement, reverse=True)[:3],
+        "top_declines": sorted(declining, key=improvement)[:3],
+        "recommendations": recommendations
+    }
+    return summary, recommendations
+
+
+class AnalysisJob:
+    """Progress and control of one analysis running (or waiting to run) in this worker"""
+
+    def __init__(self, analysis_id: str):
+        self.analysis_id = analysis_id
+        self.state = "queued"
+        self.progress = 0.0
+        self.stage = "queued"
+        self.queued_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "analysis_id": self.analysis_id,
+            "state": self.state,
+            "progress": round(self.progress, 3),
+            "stage": self.stage,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+
+class AnalysisJobRunner:
+    """Runs network analyses as asyncio tasks under a concurrency and queue limit"""
+
+    def __init__(self, db, max_concurrency: int = 2, max_queued: int = 20,
+                 timeout: float = 600.0, finished_ttl: float = 3600.0, heartbeat_interval: float = 30.0):
+        self.db = db
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.finished_ttl = finished_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._maintenance: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0,
+                       "reconciled": 0}
+
+    def _active(self) -> List[AnalysisJob]:
+        return [job for job in self._jobs.values() if job.state in ("queued", "running")]
+
+    def _forget_finished(self):
+        cutoff = datetime.utcnow().timestamp() - self.finished_ttl
+        for analysis_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at.timestamp() < cutoff:
+                del self._jobs[analysis_id]
+
+    def has_capacity(self) -> bool:
+        """Whether another job may be submitted right now"""
+        return len(self._active()) < self.max_concurrency + self.max_queued
+
+    def submit(self, analysis: Dict[str, Any]) -> AnalysisJob:
+        """Queue ``analysis`` (its row, already marked in_progress) for execution"""
+        self._forget_finished()
+        if not self.has_capacity():
+            self._stats["rejected"] += 1
+            raise JobQueueFullError("Too many network analyses are running or queued")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        job = AnalysisJob(str(analysis["id"]))
+        self._jobs[job.analysis_id] = job
+        job.task = asyncio.create_task(self._run(job, analysis))
+        self._stats["submitted"] += 1
+        return job
+
+    def get(self, analysis_id: str) -> Optional[AnalysisJob]:
+        """The job for ``analysis_id`` if this worker runs (or ran) it"""
+        return self._jobs.get(str(analysis_id))
+
+    def cancel(self, analysis_id: str) -> bool:
+        """Cancel a queued or running job owned by this worker"""
+        job = self.get(analysis_id)
+        if job is None or job.task is None or job.task.done():
+            return False
+        job.task.cancel()
+        return True
+
+    def start(self):
+        """Begin heartbeats and stale-row reconciliation on the running event loop; a no-op if already started"""
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.create_task(self._maintain())
+
+    async def _maintain(self):
+        while True:
+            try:
+                await self._heartbeat()
+                await self.reconcile_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The next tick retries
+                logger.error(f"Error maintaining network analysis jobs: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _heartbeat(self):
+        analysis_ids = [job.analysis_id for job in self._active()]
+        if not analysis_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(analysis_ids))
+        await self.db.execute_update(
+            f"UPDATE network_analysis SET updated_at = %s WHERE status = 'in_progress' AND id IN ({placeholders})",
+            (datetime.utcnow(), *analysis_ids)
+        )
+
+    async def reconcile_stale(self) -> int:
+        """
+        Mark ``in_progress`` analyses that no worker has touched for
+        ``STALE_HEARTBEATS`` heartbeat intervals as failed; returns how many
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.heartbeat_interval * STALE_HEARTBEATS)
+        where = ["status = 'in_progress'", "updated_at < %s"]
+        params: List[Any] = [cutoff]
+        own = [job.analysis_id for job in self._active()]
+        if own:
+            where.append(f"id NOT IN ({', '.join(['%s'] * len(own))})")
+            params.extend(own)
+        reconciled = await self.db.execute_update(
+            "UPDATE network_analysis SET status = 'failed', failed_at = %s, updated_at = %s, error_message = %s "
+            f"WHERE {' AND '.join(where)}",
+            (now, now, "Interrupted: the worker running it stopped", *params)
+        )
+        if reconciled:
+            self._stats["reconciled"] += reconciled
+            logger.warning(f"Marked {reconciled} abandoned network analyses as failed")
+        return reconciled
+
+    async def stop(self):
+        """Stop maintenance, cancel every active job and wait for them to record it"""
+        self._stopping = True
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            try:
+                await self._maintenance
+            except asyncio.CancelledError:
+                pass
+            self._maintenance = None
+        tasks = [job.task for job in self._active() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _checkpoint(self, job: AnalysisJob, progress: float, stage: str):
+        """Record progress and stop if the analysis was cancelled or failed from any worker"""
+        job.progress = progress
+        job.stage = stage
+        rows = await self.db.execute_query("SELECT status FROM network_analysis WHERE id = %s", (job.analysis_id,))
+        if not rows or rows[0]["status"] != "in_progress":
+            raise JobCancelledError()
+
+    async def _finish(self, job: AnalysisJob, status: str, fields: Dict[str, Any]):
+        fields = dict(fields, status=status, updated_at=datetime.utcnow())
+        assignments = ", ".join(f"{column} = %s" for column in fields)
+        placeholders = ", ".join(["%s"] * len(FINISHED_STATUSES))
+        # Leave rows alone that were finished elsewhere (e.g. cancelled meanwhile)
+        await self.db.execute_update(
+            f"UPDATE network_analysis SET {assignments} WHERE id = %s AND status NOT IN ({placeholders})",
+            (*fields.values(), job.analysis_id, *FINISHED_STATUSES)
+        )
+
+    async def _run(self, job: AnalysisJob, analysis: Dict[str, Any]):
+        try:
+            async with self._slots:
+                job.state = "running"
+                job.started_at = datetime.utcnow()
+                started = time.monotonic()
+                await self.db.execute_update(
+                    "UPDATE network_analysis SET started_at = %s, updated_at = %s WHERE id = %s",
+                    (job.started_at, job.started_at, job.analysis_id)
+                )
+                outcome = await asyncio.wait_for(self._compute(job, analysis), timeout=self.timeout)
+                await self._finish(job, "completed", dict(
+                    outcome,
+                    completed_at=datetime.utcnow(),
+                    execution_time_seconds=round(time.monotonic() - started, 3)
+                ))
+                job.state, job.progress, job.stage = "completed", 1.0, "completed"
+                self._stats["completed"] += 1
+        except (asyncio.CancelledError, JobCancelledError) as e:
+            job.state = job.stage = "cancelled"
+            self._stats["cancelled"] += 1
+            try:
+                if self._stopping:
+                    # Not the user's doing: record it as a failure that can be rerun
+                    await self._finish(job, "failed", {"failed_at": datetime.utcnow(),
+                                                       "error_message": "Interrupted by server shutdown"})
+                else:
+                    await self._finish(job, "cancelled", {"error_message": "Cancelled"})
+            except Exception as write_error:
+                logger.error(f"Could not record cancellation of network analysis {job.analysis_id}: {write_error}")
+            logger.info(f"Network analysis {job.analysis_id} cancelled")
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        except Exception as e:
+            job.state = job.stage = "failed"
+            job.error = "Timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            self._stats["failed"] += 1
+            logger.error(f"Network analysis {job.analysis_id} failed: {job.error}")
+            try:
+                await self._finish(job, "failed", {"failed_at": datetime.utcnow(), "error_message": job.error})
+            except Exception as write_error:
+                logger.error(f"Could not record failure of network analysis {job.analysis_id}: {write_error}")
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    async def _compute(self, job: AnalysisJob, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        metrics = analysis.get("metrics") or []
+        if isinstance(metrics, str):
+            metrics = json.loads(metrics)
+        parameters = analysis.get("parameters") or {}
+        if isinstance(parameters, str):
+            parameters = json.loads(parameters)
+        start, end = analysis["start_date"], analysis["end_date"]
+        previous_start = start - (end - start)
+        benchmarks = parameters.get("benchmarks") or {}
+
+        steps = len(metrics) + (1 if analysis.get("analysis_type") == "optimization" else 0)
+        results, unavailable = [], []
+        for done, metric in enumerate(metrics):
+            await self._checkpoint(job, done / (steps + 1), f"metric:{metric}")
+            if metric not in METRICS:
+                unavailable.append(metric)
+                continue
+            compute = METRICS[metric][0]
+            value = await compute(self.db, start, end)
+            if value is None:
+                # No data for the period (e.g. no awarded bids); not a zero
+                unavailable.append(metric)
+                continue
+            previous = await compute(self.db, previous_start, start)
+            results.append(build_result(metric, value, previous, benchmarks.get(metric)))
+
+        output: Dict[str, Any] = {
+            "period": {"start": start, "end": end, "compared_to_start": previous_start},
+            "metrics": results,
+            "unavailable_metrics": unavailable
+        }
+
+        if analysis.get("analysis_type") == "optimization":
+            await self._checkpoint(job, len(metrics) / (steps + 1), "optimization")
+            output["optimization"] = await self._optimize(parameters)
+
+        await self._checkpoint(job, steps / (steps + 1), "summary")
+        summary, recommendations = summarize(results)
+        return {
+            "results": json.dumps(output, default=str),
+            "summary": json.dumps(summary, default=str),
+            "recommendations": json.dumps(recommendations)
+        }
+
+    async def _optimize(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        lanes = await self.db.execute_query("SELECT * FROM lanes WHERE status = 'active'")
+        carriers = await self.db.execute_query("SELECT * FROM carriers WHERE status = 'active'")
+        if not lanes or not carriers:
+            return {"message": "No active lanes or carriers to optimize"}
+        # Same pipeline as POST /network-analysis/optimize-routes, parameterised by the analysis
+        result, _ = await optimize_network(
+            self.db, lanes, carriers,
+            use_lane_volume=bool(parameters.get("use_lane_volume")),
+            carrier_capacity=parameters.get("carrier_capacity"),
+            candidates_per_lane=parameters.get("candidates_per_lane") or DEFAULT_CANDIDATES_PER_LANE,
+            weights=parameters.get("scoring_weights"),
+            enforce_operating_radius=bool(parameters.get("enforce_operating_radius"))
+        )
+        return {
+            "objective_value": result["objective_value"],
+            "assignment_cost": result["assignment_cost"],
+            "assigned_routes": int(len(result["volume"])),
+            "assigned_volume": float(result["volume"].sum()),
+            "unassigned_volume": float(result["unassigned"].sum()),
+            "solver": result["solver"]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by state plus lifetime counters"""
+        states: Dict[str, int] = {}
+        for job in self._jobs.values():
+            states[job.state] = states.get(job.state, 0) + 1
+        return dict(self._stats, jobs=states, max_concurrency=self.max_concurrency, max_queued=self.max_queued)
+
+
+# Global runner; each worker executes the analyses started through it
+analysis_jobs = AnalysisJobRunner(
+    async_db,
+    max_concurrency=settings.analysis_job_max_concurrency,
+    max_queued=settings.analysis_job_max_queued,
+    timeout=settings.analysis_job_timeout_seconds,
+    heartbeat_interval=settings.analysis_job_heartbeat_seconds
+)
@@ -0,0 +1,158 @@
+"""
+Bid Statistics Service for RouteCraft Backend
+
+Statistics come from one of two sources:
+
+- a single conditional-aggregation pass over ``bids`` (default), or
+- the ``bid_user_stats`` rollup when ``BID_STATS_TABLE_ENABLED`` is set. The
+  rollup holds one row per (user, status) and is kept current by the bid
+  write endpoints inside their own transactions, so reading it costs the same
+  no matter how many bids exist.
+"""
+from app.config import settings
+from typing import Dict, Any, Iterable, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Single pass over the bids rows: one group per status carries everything
+# the summary needs (counts, value totals and how many bids have a value).
+BID_STATS_QUERY = """
+    SELECT 
+        status,
+        COUNT(*) as bid_count,
+        COALESCE(SUM(estimated_cost), 0) as total_value,
+        COUNT(estimated_cost) as valued_count
+    FROM bids
+    WHERE {where_clause}
+    GROUP BY status
+"""
+
+ROLLUP_STATS_QUERY = """
+    SELECT 
+        status,
+        SUM(bid_count) as bid_count,
+        SUM(total_value) as total_value,
+        SUM(valued_count) as valued_count
+    FROM bid_user_stats
+    WHERE {where_clause}
+    GROUP BY status
+"""
+
+ROLLUP_UPSERT = """
+    INSERT INTO bid_user_stats (user_id, status, bid_count, total_value, valued_count)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        bid_count = bid_count + VALUES(bid_count),
+        total_value = total_value + VALUES(total_value),
+        valued_count = valued_count + VALUES(valued_count)
+"""
+
+ROLLUP_REBUILD = """
+    INSERT INTO bid_user_stats (user_id, status, bid_count, total_value, valued_count)
+    SELECT 
+        COALESCE(created_by, 0),
+        status,
+        COUNT(*),
+        COALESCE(SUM(estimated_cost), 0),
+        COUNT(estimated_cost)
+    FROM bids
+    GROUP BY COALESCE(created_by, 0), status
+"""
+
+# (status, estimated_cost) of a bid before or after a write
+BidState = Tuple[str, Optional[float]]
+
+
+def summarize_status_rows(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fold per-status rows into the BidStats fields"""
+    by_status = {}
+    total_value = 0.0
+    valued = 0
+    for row in rows:
+        count = int(row["bid_count"] or 0)
+        if count <= 0:
+            continue
+        by_status[row["status"]] = by_status.get(row["status"], 0) + count
+        total_value += float(row["total_value"] or 0)
+        valued += int(row["valued_count"] or 0)
+
+    total = sum(by_status.values())
+    return {
+        "total_bids": total,
+        "active_bids": by_status.get("open", 0),
+        "closed_bids": by_status.get("closed", 0),
+        "awarded_bids": by_status.get("awarded", 0),
+        "total_value": round(total_value, 2),
+        "average_value": round(total_value / valued, 2) if valued else 0.0,
+        "currency": "USD",
+        # The bids table has no type column; every bid is a contract bid
+        "bids_by_type": {"contract": total} if total else {},
+        "bids_by_status": by_status
+    }
+
+
+async def compute_bid_stats(db, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Bid summary for one user's bids, or for all bids when ``user_id`` is None"""
+    if settings.bid_stats_table_enabled:
+        query, column = ROLLUP_STATS_QUERY, "user_id"
+    else:
+        query, column = BID_STATS_QUERY, "created_by"
+
+    if user_id is None:
+        rows = await db.execute_query(query.format(where_clause="1=1"))
+    else:
+        rows = await db.execute_query(query.format(where_clause=f"{column} = %s"), (user_id,))
+    return summarize_status_rows(rows)
+
+
+def _delta_row(user_id, state: BidState, sign: int) -> tuple:
+    status, value = state
+    return (
+        int(user_id or 0),
+        status,
+        sign,
+        sign * float(value or 0),
+        sign if value is not None else 0
+    )
+
+
+async def record_bid_change(tx, user_id, before: Optional[BidState] = None,
+                            after: Optional[BidState] = None):
+    """
+    Apply one bid's transition to the rollup inside the caller's transaction.
+    ``before`` is None for a create and ``after`` is None for a delete.
+    """
+    await record_bid_changes(tx, [(user_id, before, after)])
+
+
+async def record_bid_changes(tx, changes: Iterable[Tuple[Any, Optional[BidState], Optional[BidState]]]):
+    """Apply many ``(user_id, before, after)`` transitions with one upsert statement"""
+    if not settings.bid_stats_table_enabled:
+        return
+    # Net the deltas per (user, status) so a batch costs one row per group
+    totals: Dict[Tuple[int, str], list] = {}
+    for user_id, before, after in changes:
+        if before == after:
+            continue
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            key_user, status, count, value, valued = _delta_row(user_id, state, sign)
+            total = totals.setdefault((key_user, status), [0, 0.0, 0])
+            total[0] += count
+            total[1] += value
+            total[2] += valued
+    deltas = [(user, status, *total) for (user, status), total in totals.items() if any(total)]
+    if deltas:
+        await tx.execute_many(ROLLUP_UPSERT, deltas)
+
+
+async def rebuild_bid_user_stats(db):
+    """Recompute the rollup from scratch, e.g. right after enabling it"""
+    async with db.transaction() as tx:
+        # Lock bids so no write slips in between the wipe and the re-aggregation
+        await tx.execute_query("SELECT id FROM bids", for_update=True)
+        await tx.execute_delete("DELETE FROM bid_user_stats")
+        await tx.execute_insert(ROLLUP_REBUILD)
+    logger.info("Rebuilt bid_user_stats from bids")
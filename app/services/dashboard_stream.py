@@ -0,0 +1,215 @@
+"""
+Live Dashboard Stream for RouteCraft Backend
+
+One broadcaster per worker turns the change feed into dashboard updates. When
+bids, lanes, carriers, claims (or any other overview table) change, it waits
+``DASHBOARD_STREAM_DEBOUNCE_SECONDS`` to coalesce a burst of writes, computes
+the overview and recent activity once, and pushes only what changed to every
+connected viewer. N open dashboards therefore cost one computation per
+change instead of N polls. It also recomputes every
+``DASHBOARD_STREAM_POLL_SECONDS`` so writes made by other workers reach
+viewers too; that costs one computation per interval no matter how many
+viewers there are, and sends nothing when nothing changed.
+"""
+from app.change_feed import change_feed
+from app.config import settings
+from app.database import async_db
+from app.services.dashboard_summary import get_cached_overview, fetch_recent_activity, freshness
+from fastapi.encoders import jsonable_encoder
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+import asyncio
+import itertools
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+STREAM_ACTIVITY_LIMIT = 10
+
+
+def diff_values(before: Any, after: Any) -> Any:
+    """
+    Nested dict of the leaves of ``after`` that differ from ``before``;
+    None when nothing changed.
+    """
+    if isinstance(before, dict) and isinstance(after, dict):
+        changed = {}
+        for key, value in after.items():
+            delta = diff_values(before.get(key), value)
+            if delta is not None:
+                changed[key] = delta
+        return changed or None
+    return None if before == after else after
+
+
+def format_event(event_id: int, event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class Subscriber:
+    """One viewer's bounded queue of pending events"""
+
+    def __init__(self, max_pending: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        # Set when events were dropped; the viewer is resent a full snapshot
+        self.missed = False
+
+    def offer(self, event: Tuple[int, str, Dict[str, Any]]):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow viewer must not hold up the rest; it resyncs from a snapshot instead
+            self.missed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            # Still wake the viewer so the resync happens now
+            self.queue.put_nowait(event)
+
+
+class DashboardBroadcaster:
+    """Computes dashboard state once per change and fans deltas out to every subscriber"""
+
+    def __init__(self, db, debounce: float = 1.0, poll_interval: float = 30.0,
+                 heartbeat: float = 15.0, max_pending: int = 16):
+        self.db = db
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.max_pending = max_pending
+        self._subscribers: Set[Subscriber] = set()
+        self._changed: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_lock: Optional[asyncio.Lock] = None
+        self._event_ids = itertools.count(1)
+        self._stats = {"computations": 0, "events": 0, "dropped": 0}
+
+    def _on_change(self, tables: Tuple[str, ...]):
+        self._changed.update(tables)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self):
+        """Listen to the change feed and begin broadcasting on the running loop"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._snapshot_lock = asyncio.Lock()
+            change_feed.subscribe(self._on_change)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop broadcasting and detach from the change feed"""
+        change_feed.unsubscribe(self._on_change)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _compute(self) -> Dict[str, Any]:
+        summary = await get_cached_overview(self.db)
+        activities = await fetch_recent_activity(self.db, STREAM_ACTIVITY_LIMIT)
+        self._stats["computations"] += 1
+        return jsonable_encoder({
+            "overview": summary["overview"],
+            "activities": activities,
+            "freshness": freshness(summary)
+        })
+
+    async def _current_snapshot(self) -> Dict[str, Any]:
+        # Viewers connecting before the first broadcast share one computation
+        async with self._snapshot_lock:
+            if self._snapshot is None:
+                self._snapshot = await self._compute()
+            return self._snapshot
+
+    def _publish(self, event: str, data: Dict[str, Any]):
+        event_id = next(self._event_ids)
+        self._stats["events"] += 1
+        for subscriber in list(self._subscribers):
+            was_missing = subscriber.missed
+            subscriber.offer((event_id, event, data))
+            if subscriber.missed and not was_missing:
+                self._stats["dropped"] += 1
+
+    async def _broadcast(self, tables: List[str]):
+        previous = self._snapshot
+        async with self._snapshot_lock:
+            self._snapshot = current = await self._compute()
+        if previous is None:
+            return
+
+        overview_delta = diff_values(previous["overview"], current["overview"])
+        seen = {(activity["type"], activity["id"]) for activity in previous["activities"]}
+        new_activities = [activity for activity in current["activities"]
+                          if (activity["type"], activity["id"]) not in seen]
+        if overview_delta is None and not new_activities:
+            return
+        self._publish("delta", {
+            "tables": tables,
+            "overview": overview_delta or {},
+            "activities": new_activities,
+            "freshness": current["freshness"]
+        })
+
+    async def _run(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    # Let a burst of writes settle into one recomputation
+                    await asyncio.sleep(self.debounce)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                tables = sorted(self._changed)
+                self._changed.clear()
+                if self._subscribers:
+                    await self._broadcast(tables)
+                else:
+                    # Nobody is watching; the next viewer starts from a fresh snapshot
+                    self._snapshot = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error broadcasting dashboard update: {e}")
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Server-sent events for one viewer: a snapshot, then deltas and keepalives"""
+        self.start()
+        subscriber = Subscriber(self.max_pending)
+        self._subscribers.add(subscriber)
+        try:
+            yield format_event(next(self._event_ids), "snapshot", await self._current_snapshot())
+            while True:
+                try:
+                    event_id, event, data = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                if subscriber.missed:
+                    subscriber.missed = False
+                    yield format_event(event_id, "snapshot", await self._current_snapshot())
+                else:
+                    yield format_event(event_id, event, data)
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        """Viewer count and broadcast counters"""
+        return dict(self._stats, subscribers=len(self._subscribers))
+
+
+# Global broadcaster, started by the first viewer
+dashboard_broadcaster = DashboardBroadcaster(
+    async_db,
+    debounce=settings.dashboard_stream_debounce_seconds,
+    poll_interval=settings.dashboard_stream_poll_seconds,
+    heartbeat=settings.dashboard_stream_heartbeat_seconds,
+    max_pending=settings.dashboard_stream_max_pending
+)
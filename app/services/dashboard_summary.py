@@ -0,0 +1,315 @@
+"""
+Dashboard Summary Service for RouteCraft Backend
+
+The overview counters come from one of two sources:
+
+- a single statement aggregating users, carriers, lanes, bids, bid_responses
+  and insurance_claims (default), or
+- the one-row ``dashboard_summary`` table when ``DASHBOARD_SUMMARY_ENABLED``
+  is set. A background refresher recomputes the row every
+  ``DASHBOARD_SUMMARY_REFRESH_SECONDS`` and bumps its version, so opening the
+  dashboard reads one row however large the tables grow. Every worker runs
+  the refresher, but a MySQL named lock and the row's ``refreshed_at`` let
+  only one of them recompute per interval. Responses carry
+  the row's version and age so clients can tell how stale they are.
+
+Either way the result goes through the response cache for
+``DASHBOARD_CACHE_TTL_SECONDS``, shared by every caller, so bursts of
+dashboard loads cost one aggregation.
+"""
+from app.config import settings
+from app.database_mysql import normalize_row
+from app.response_cache import response_cache
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_ROW_ID = 1
+
+# Tables the overview is computed from, as response cache tags
+OVERVIEW_TAGS = ("users", "carriers", "lanes", "bids", "bid_responses", "claims")
+
+# Every overview counter in one round trip: one derived table per source
+# table, each a single scan, cross-joined into one row.
+OVERVIEW_AGGREGATE_QUERY = """
+    SELECT * FROM
+        (SELECT COUNT(*) as total_users FROM users WHERE status = 'active') u,
+        (SELECT
+            COUNT(*) as total_carriers,
+            COALESCE(SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END), 0) as active_carriers
+         FROM carriers) c,
+        (SELECT
+            COUNT(*) as total_lanes,
+            COALESCE(SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END), 0) as active_lanes
+         FROM lanes) l,
+        (SELECT
+            COUNT(*) as total_bids,
+            COALESCE(SUM(CASE WHEN status = 'open' THEN 1 ELSE 0 END), 0) as open_bids,
+            COALESCE(SUM(CASE WHEN status = 'awarded' THEN 1 ELSE 0 END), 0) as awarded_bids,
+            COALESCE(SUM(estimated_cost), 0) as total_bid_value,
+            COALESCE(SUM(CASE WHEN status = 'awarded' THEN estimated_cost ELSE 0 END), 0) as total_awarded_value
+         FROM bids) b,
+        (SELECT
+            COUNT(*) as total_responses,
+            COALESCE(SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END), 0) as pending_responses
+         FROM bid_responses) r,
+        (SELECT
+            COUNT(*) as total_claims,
+            COALESCE(SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END), 0) as pending_claims,
+            COALESCE(SUM(amount), 0) as total_claims_value
+         FROM insurance_claims) ic
+"""
+
+# Newest bids, lanes and carriers in one statement
+RECENT_ACTIVITY_QUERY = """
+    (SELECT 'bid' as type, id, created_at, status, 
+            CONCAT('Bid #', id, ' was ', status) as description
+     FROM bids 
+     ORDER BY created_at DESC 
+     LIMIT %s)
+    UNION ALL
+    (SELECT 'lane' as type, id, created_at, status,
+            CONCAT('Lane #', id, ' was ', status) as description
+     FROM lanes 
+     ORDER BY created_at DESC 
+     LIMIT %s)
+    UNION ALL
+    (SELECT 'carrier' as type, id, created_at, status,
+            CONCAT('Carrier #', id, ' was ', status) as description
+     FROM carriers 
+     ORDER BY created_at DESC 
+     LIMIT %s)
+    ORDER BY created_at DESC 
+    LIMIT %s
+"""
+
+COUNT_FIELDS = (
+    "total_users", "total_carriers", "active_carriers", "total_lanes", "active_lanes",
+    "total_bids", "open_bids", "awarded_bids", "total_responses", "pending_responses",
+    "total_claims", "pending_claims"
+)
+
+VALUE_FIELDS = ("total_bid_value", "total_awarded_value", "total_claims_value")
+
+SUMMARY_FIELDS = COUNT_FIELDS + VALUE_FIELDS
+
+SUMMARY_UPSERT = """
+    INSERT INTO dashboard_summary (id, {columns}, version, refreshed_at)
+    VALUES (%s, {placeholders}, 1, %s)
+    ON DUPLICATE KEY UPDATE
+        {assignments},
+        version = version + 1,
+        refreshed_at = VALUES(refreshed_at)
+""".format(
+    columns=", ".join(SUMMARY_FIELDS),
+    placeholders=", ".join(["%s"] * len(SUMMARY_FIELDS)),
+    assignments=",\n        ".join(f"{field} = VALUES({field})" for field in SUMMARY_FIELDS)
+)
+
+SUMMARY_SELECT = "SELECT * FROM dashboard_summary WHERE id = %s"
+
+SUMMARY_REFRESHED_AT_SELECT = "SELECT refreshed_at FROM dashboard_summary WHERE id = %s"
+
+# Named lock held by the worker refreshing the row; GET_LOCK(.., 0) fails
+# immediately instead of queueing behind it
+REFRESH_LOCK_NAME = "dashboard_summary_refresh"
+REFRESH_LOCK_ACQUIRE = "SELECT GET_LOCK(%s, 0) AS acquired"
+REFRESH_LOCK_RELEASE = "SELECT RELEASE_LOCK(%s) AS released"
+
+
+def _clean_counters(row: Dict[str, Any]) -> Dict[str, Any]:
+    counters = {field: int(row.get(field) or 0) for field in COUNT_FIELDS}
+    counters.update({field: float(row.get(field) or 0) for field in VALUE_FIELDS})
+    return counters
+
+
+def _percentage(part: int, whole: int) -> float:
+    return round(part / whole * 100, 2) if whole > 0 else 0
+
+
+def build_overview(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape the counters into the ``overview`` payload of GET /dashboard/overview"""
+    return {
+        "users": {
+            "total": counters["total_users"]
+        },
+        "carriers": {
+            "total": counters["total_carriers"],
+            "active": counters["active_carriers"],
+            "utilization_percentage": _percentage(counters["active_carriers"], counters["total_carriers"])
+        },
+        "lanes": {
+            "total": counters["total_lanes"],
+            "active": counters["active_lanes"],
+            "utilization_percentage": _percentage(counters["active_lanes"], counters["total_lanes"])
+        },
+        "bids": {
+            "total": counters["total_bids"],
+            "open": counters["open_bids"],
+            "awarded": counters["awarded_bids"],
+            "success_rate_percentage": _percentage(counters["awarded_bids"], counters["total_bids"])
+        },
+        "responses": {
+            "total": counters["total_responses"],
+            "pending": counters["pending_responses"]
+        },
+        "claims": {
+            "total": counters["total_claims"],
+            "pending": counters["pending_claims"]
+        },
+        "financial": {
+            "total_bid_value": counters["total_bid_value"],
+            "total_awarded_value": counters["total_awarded_value"],
+            "total_claims_value": counters["total_claims_value"]
+        }
+    }
+
+
+async def compute_overview_counters(db) -> Dict[str, Any]:
+    """Aggregate the overview counters live from the source tables"""
+    rows = await db.execute_query(OVERVIEW_AGGREGATE_QUERY)
+    return _clean_counters(rows[0] if rows else {})
+
+
+async def refresh_dashboard_summary(db) -> Dict[str, Any]:
+    """Recompute the summary row and bump its version; returns the counters written"""
+    counters = await compute_overview_counters(db)
+    refreshed_at = normalize_row({"refreshed_at": datetime.utcnow()})["refreshed_at"]
+    await db.execute_insert(
+        SUMMARY_UPSERT,
+        (SUMMARY_ROW_ID, *(counters[field] for field in SUMMARY_FIELDS), refreshed_at)
+    )
+    return counters
+
+
+async def refresh_dashboard_summary_if_stale(db, max_age: float) -> bool:
+    """
+    Refresh the summary row unless another worker is refreshing it or it was
+    refreshed less than ``max_age`` seconds ago; returns whether it refreshed
+    """
+    # One connection for the whole check so the named lock is released where it was taken
+    async with db.transaction() as tx:
+        rows = await tx.execute_query(REFRESH_LOCK_ACQUIRE, (REFRESH_LOCK_NAME,))
+        if not rows or not rows[0]["acquired"]:
+            return False
+        try:
+            rows = await tx.execute_query(SUMMARY_REFRESHED_AT_SELECT, (SUMMARY_ROW_ID,))
+            if rows and _age_seconds(rows[0]["refreshed_at"]) < max_age:
+                return False
+            await refresh_dashboard_summary(tx)
+            return True
+        finally:
+            await tx.execute_query(REFRESH_LOCK_RELEASE, (REFRESH_LOCK_NAME,))
+
+
+async def fetch_recent_activity(db, limit: int = 10) -> List[Dict[str, Any]]:
+    """Newest ``limit`` bid/lane/carrier events, formatted for the dashboard"""
+    limit_per_table = max(1, limit // 3)
+    rows = await db.execute_query(
+        RECENT_ACTIVITY_QUERY,
+        (limit_per_table, limit_per_table, limit_per_table, limit)
+    )
+    return [
+        {
+            "type": row["type"],
+            "id": row["id"],
+            "action": f"{row['type'].title()} {row['status']}",
+            "timestamp": row["created_at"],
+            "description": row["description"]
+        }
+        for row in rows
+    ]
+
+
+def _as_datetime(as_of) -> datetime:
+    if isinstance(as_of, str):
+        # Cached summaries come back JSON-encoded
+        return datetime.fromisoformat(as_of)
+    return as_of
+
+
+def _age_seconds(as_of) -> float:
+    return max(0.0, (datetime.utcnow() - _as_datetime(as_of)).total_seconds())
+
+
+def freshness(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Where an overview came from and how old its numbers are right now"""
+    as_of = _as_datetime(summary["as_of"])
+    return {
+        "source": summary["source"],
+        "version": summary["version"],
+        "as_of": as_of.isoformat(),
+        "stale_seconds": round(_age_seconds(as_of), 1)
+    }
+
+
+async def get_overview(db) -> Dict[str, Any]:
+    """
+    Overview payload with its ``source``, ``version`` and ``as_of`` time: the
+    summary row when the table is enabled (computed on the spot if it has
+    never been refreshed), otherwise a live aggregate.
+    """
+    if not settings.dashboard_summary_enabled:
+        counters = await compute_overview_counters(db)
+        return {"overview": build_overview(counters), "source": "live",
+                "version": None, "as_of": datetime.utcnow()}
+
+    rows = await db.execute_query(SUMMARY_SELECT, (SUMMARY_ROW_ID,), prepared=True)
+    if not rows:
+        await refresh_dashboard_summary(db)
+        rows = await db.execute_query(SUMMARY_SELECT, (SUMMARY_ROW_ID,))
+    row = rows[0]
+    return {"overview": build_overview(_clean_counters(row)), "source": "dashboard_summary",
+            "version": row["version"], "as_of": row["refreshed_at"]}
+
+
+async def get_cached_overview(db) -> Dict[str, Any]:
+    """``get_overview`` behind the response cache; everyone shares one entry"""
+    if not settings.response_cache_enabled:
+        return await get_overview(db)
+    return await response_cache.get_or_set(
+        "dashboard:overview", lambda: get_overview(db),
+        ttl=settings.dashboard_cache_ttl_seconds, tags=OVERVIEW_TAGS
+    )
+
+
+class DashboardSummaryRefresher:
+    """
+    Background task that keeps ``dashboard_summary`` at most one interval old.
+    Each worker runs one; a tick refreshes only if no other worker holds the
+    refresh lock and the row is at least one interval old.
+    """
+
+    def __init__(self, db, interval: float):
+        self.db = db
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Begin refreshing on the running event loop; a no-op if already started"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the refresh loop and wait for it to exit"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await refresh_dashboard_summary_if_stale(self.db, self.interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep serving the previous row; the next tick retries
+                logger.error(f"Error refreshing dashboard summary: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,149 @@
+"""
+Great-Circle Distances for RouteCraft Network Analysis
+
+Distances come from ``locations_master`` coordinates via a vectorised
+haversine, so any number of pairs is a few NumPy operations. Lane distances
+(origin location -> destination location) are persisted in the
+``lane_distances`` table: each pair is computed once and read back
+thereafter. Carrier-to-lane distances are computed on the fly from the
+carrier's base (``carriers.base_location_id`` in ``locations_master``) to
+the lane origin.
+
+These are straight-line distances; road distance is typically longer. A
+stored ``distance_km`` is always preferred over a computed one. Rows for a
+location whose coordinates change must be deleted from ``lane_distances``
+to be recomputed.
+"""
+from app.database_mysql import chunked
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# IUGG mean Earth radius
+EARTH_RADIUS_KM = 6371.0088
+
+KM_PER_MILE = 1.609344
+
+# Parameter sets per IN (...) lookup
+LOOKUP_CHUNK_SIZE = 500
+
+LanePair = Tuple[str, str]
+
+LANE_DISTANCE_UPSERT = """
+    INSERT INTO lane_distances (origin_location_id, destination_location_id, distance_km, computed_at)
+    VALUES (%s, %s, %s, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE distance_km = VALUES(distance_km), computed_at = VALUES(computed_at)
+"""
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km between coordinates given in degrees; broadcasts like NumPy"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def pairwise_km(origins: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """(N, M) distances between (N, 2) and (M, 2) arrays of latitude/longitude"""
+    origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+    targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+    return haversine_km(origins[:, None, 0], origins[:, None, 1], targets[None, :, 0], targets[None, :, 1])
+
+
+async def load_coordinates(db, location_ids: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+    """Latitude/longitude of each known ``locations_master`` location id that has coordinates"""
+    ids = sorted({location_id for location_id in location_ids if location_id})
+    coordinates = {}
+    for chunk in chunked(ids, LOOKUP_CHUNK_SIZE):
+        rows = await db.execute_query(
+            "SELECT location_id, latitude, longitude FROM locations_master "
+            f"WHERE location_id IN ({', '.join(['%s'] * len(chunk))}) "
+            "AND latitude IS NOT NULL AND longitude IS NOT NULL",
+            tuple(chunk)
+        )
+        for row in rows:
+            coordinates[row["location_id"]] = (float(row["latitude"]), float(row["longitude"]))
+    return coordinates
+
+
+async def lane_distances_km(db, pairs: Iterable[LanePair]) -> Dict[LanePair, Optional[float]]:
+    """
+    Distance of each (origin, destination) location id pair: from the
+    ``lane_distances`` cache, else computed and stored. None when either
+    location has no coordinates.
+    """
+    wanted = sorted({pair for pair in pairs if pair[0] and pair[1]})
+    distances: Dict[LanePair, Optional[float]] = {}
+    for chunk in chunked(wanted, LOOKUP_CHUNK_SIZE):
+        rows = await db.execute_query(
+            "SELECT origin_location_id, destination_location_id, distance_km FROM lane_distances "
+            f"WHERE (origin_location_id, destination_location_id) IN ({', '.join(['(%s, %s)'] * len(chunk))})",
+            tuple(value for pair in chunk for value in pair)
+        )
+        for row in rows:
+            distances[(row["origin_location_id"], row["destination_location_id"])] = float(row["distance_km"])
+
+    missing = [pair for pair in wanted if pair not in distances]
+    if not missing:
+        return distances
+
+    coordinates = await load_coordinates(db, (location_id for pair in missing for location_id in pair))
+    computable = [pair for pair in missing if pair[0] in coordinates and pair[1] in coordinates]
+    if computable:
+        origins = np.array([coordinates[origin] for origin, _ in computable])
+        destinations = np.array([coordinates[destination] for _, destination in computable])
+        computed = np.round(haversine_km(origins[:, 0], origins[:, 1], destinations[:, 0], destinations[:, 1]), 2)
+        rows = [(origin, destination, float(km)) for (origin, destination), km in zip(computable, computed)]
+        try:
+            await db.execute_many(LANE_DISTANCE_UPSERT, rows)
+        except Exception as e:
+            # The distances are still good for this request; the next one retries the write
+            logger.warning(f"Could not persist {len(rows)} lane distances: {e}")
+        distances.update({(origin, destination): km for origin, destination, km in rows})
+    for pair in missing:
+        distances.setdefault(pair, None)
+    return distances
+
+
+async def lane_distance_km(db, origin_location_id: str, destination_location_id: str) -> Optional[float]:
+    """Distance of one lane (see ``lane_distances_km``)"""
+    pair = (origin_location_id, destination_location_id)
+    return (await lane_distances_km(db, [pair])).get(pair)
+
+
+async def carrier_lane_distances_km(db, lanes: Sequence[Dict[str, Any]],
+                                    carriers: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """
+    (lanes, carriers) distances from each carrier's base to each lane's
+    origin; NaN where either end has no known coordinates.
+    """
+    coordinates = await load_coordinates(db, [lane.get("origin_location_id") for lane in lanes]
+                                         + [carrier.get("base_location_id") for carrier in carriers])
+    origins = np.array([coordinates.get(lane.get("origin_location_id"), (np.nan, np.nan)) for lane in lanes],
+                       dtype=float).reshape(-1, 2)
+    bases = np.array([coordinates.get(carrier.get("base_location_id"), (np.nan, np.nan)) for carrier in carriers],
+                     dtype=float).reshape(-1, 2)
+    return pairwise_km(origins, bases)
+
+
+async def lane_rows_distance_km(db, lanes: List[Dict[str, Any]]) -> List[Optional[float]]:
+    """
+    Distance of each lane row: its stored ``distance_km`` (or
+    ``distance_miles``), else the cached great-circle distance between its
+    origin and destination locations.
+    """
+    pairs = [(lane.get("origin_location_id"), lane.get("destination_location_id")) for lane in lanes]
+    cached = await lane_distances_km(db, pairs)
+    distances = []
+    for lane, pair in zip(lanes, pairs):
+        if lane.get("distance_km"):
+            distances.append(float(lane["distance_km"]))
+        elif lane.get("distance_miles"):
+            distances.append(float(lane["distance_miles"]) * KM_PER_MILE)
+        else:
+            distances.append(cached.get(pair))
+    return distances
@@ -0,0 +1,231 @@
+"""
+In-Memory Spatial Index over locations_master
+
+The ``idx_coordinates (latitude, longitude)`` B-tree can range-scan a
+bounding box but cannot answer "nearest hubs" or "everything within 200 km".
+This index keeps every active location with coordinates in a k-d tree over
+unit-sphere (x, y, z) points, where straight-line chord length grows with
+great-circle distance, so nearest-neighbour and radius queries are exact.
+Consolidation hubs get a tree of their own.
+
+The index loads lazily and refreshes at most every
+``LOCATION_INDEX_REFRESH_SECONDS``: only rows whose ``updated_at`` moved
+are fetched, and a row count below the number of rows seen (deletes)
+triggers a full reload. Trees are rebuilt from the merged rows and swapped
+in atomically, so queries never see a half-built index. Without SciPy,
+queries fall back to a vectorised scan of all points.
+"""
+from app.config import settings
+from app.database import async_db
+from app.services.geo import EARTH_RADIUS_KM, KM_PER_MILE, haversine_km, pairwise_km
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - optional dependency
+    cKDTree = None
+
+logger = logging.getLogger(__name__)
+
+LOCATION_COLUMNS = (
+    "location_id, location_name, location_type, city, state, zone, latitude, longitude, "
+    "is_consolidation_hub, location_status, updated_at"
+)
+
+# Fields returned for each matching location
+RESULT_FIELDS = ("location_id", "location_name", "location_type", "city", "state", "zone", "is_consolidation_hub")
+
+
+def to_unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """(N, 3) points on the unit sphere for coordinates in degrees"""
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def km_to_chord(km: float) -> float:
+    """Unit-sphere chord length spanning a great-circle distance of ``km``"""
+    return 2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+class _PointSet:
+    """One immutable k-d tree (or plain arrays without SciPy) over a set of locations"""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.coordinates = np.array([(float(row["latitude"]), float(row["longitude"])) for row in rows],
+                                    dtype=float).reshape(-1, 2)
+        self.tree = None
+        if cKDTree is not None and rows:
+            self.tree = cKDTree(to_unit_vectors(self.coordinates[:, 0], self.coordinates[:, 1]))
+
+    def _results(self, indexes: Sequence[int], distances: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            dict({field: self.rows[index].get(field) for field in RESULT_FIELDS},
+                 latitude=float(self.coordinates[index, 0]), longitude=float(self.coordinates[index, 1]),
+                 distance_km=round(float(distance), 2))
+            for index, distance in zip(indexes, distances)
+        ]
+
+    def _distances(self, latitude: float, longitude: float, indexes=slice(None)) -> np.ndarray:
+        points = self.coordinates[indexes]
+        return haversine_km(latitude, longitude, points[:, 0], points[:, 1])
+
+    def nearest(self, latitude: float, longitude: float, n: int) -> List[Dict[str, Any]]:
+        n = min(n, len(self.rows))
+        if n <= 0:
+            return []
+        if self.tree is not None:
+            _, indexes = self.tree.query(to_unit_vectors([latitude], [longitude])[0], k=n)
+            indexes = np.atleast_1d(indexes)
+        else:
+            indexes = np.argsort(self._distances(latitude, longitude), kind="stable")[:n]
+        return self._results(indexes, self._distances(latitude, longitude, indexes))
+
+    def within_radius(self, latitude: float, longitude: float, km: float) -> List[Dict[str, Any]]:
+        if not self.rows:
+            return []
+        if self.tree is not None:
+            indexes = np.array(self.tree.query_ball_point(to_unit_vectors([latitude], [longitude])[0],
+                                                          km_to_chord(km)), dtype=np.intp)
+        else:
+            indexes = np.arange(len(self.rows))
+        distances = self._distances(latitude, longitude, indexes)
+        # The chord bound is exact up to rounding; the haversine check settles the edge
+        keep = distances <= km
+        indexes, distances = indexes[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        return self._results(indexes[order], distances[order])
+
+
+class LocationIndex:
+    """Nearest-neighbour and radius queries over ``locations_master``, refreshed incrementally"""
+
+    def __init__(self, db, refresh_interval: float = 60.0):
+        self.db = db
+        self.refresh_interval = refresh_interval
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._watermark: Optional[datetime] = None
+        self._all = _PointSet([])
+        self._hubs = _PointSet([])
+        self._by_id: Dict[str, Tuple[float, float]] = {}
+        self._refreshed_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._stats = {"full_loads": 0, "incremental_refreshes": 0, "rows_fetched": 0, "rebuilds": 0}
+
+    def _rebuild(self):
+        indexed = [
+            row for row in self._rows.values()
+            if row.get("latitude") is not None and row.get("longitude") is not None
+            and (row.get("location_status") or "Active") == "Active"
+        ]
+        all_points = _PointSet(indexed)
+        hubs = _PointSet([row for row in indexed if row.get("is_consolidation_hub") == "Yes"])
+        by_id = {row["location_id"]: (float(row["latitude"]), float(row["longitude"])) for row in indexed}
+        # Swap whole snapshots so concurrent readers see old or new, never a mix
+        self._all, self._hubs, self._by_id = all_points, hubs, by_id
+        self._stats["rebuilds"] += 1
+
+    async def refresh(self, full: bool = False):
+        """Fetch rows changed since the last refresh (all rows when ``full``) and rebuild if any did"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._refresh(full)
+
+    async def _refresh(self, full: bool):
+        # Without a watermark there is nothing to fetch changes since
+        full = full or self._watermark is None
+        if not full:
+            counted = await self.db.execute_query("SELECT COUNT(*) as total FROM locations_master")
+            # Fewer rows than we hold means some were deleted, which updated_at cannot show
+            full = int(counted[0]["total"]) < len(self._rows)
+
+        if full:
+            rows = await self.db.execute_query(f"SELECT {LOCATION_COLUMNS} FROM locations_master")
+            self._rows = {}
+            self._stats["full_loads"] += 1
+        else:
+            # >= rather than >: rows updated within the same second as the watermark
+            rows = await self.db.execute_query(
+                f"SELECT {LOCATION_COLUMNS} FROM locations_master WHERE updated_at >= %s",
+                (self._watermark,)
+            )
+            self._stats["incremental_refreshes"] += 1
+        self._stats["rows_fetched"] += len(rows)
+
+        changed = full or any(self._rows.get(row["location_id"]) != row for row in rows)
+        for row in rows:
+            self._rows[row["location_id"]] = row
+            if row.get("updated_at") is not None and (self._watermark is None or row["updated_at"] > self._watermark):
+                self._watermark = row["updated_at"]
+        if changed:
+            self._rebuild()
+        self._refreshed_at = time.monotonic()
+
+    async def ensure_fresh(self):
+        """Refresh when the index is older than ``refresh_interval``"""
+        if self._refreshed_at and time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another caller may have refreshed while we waited
+            if not self._refreshed_at or time.monotonic() - self._refreshed_at >= self.refresh_interval:
+                await self._refresh(False)
+
+    def coordinates(self, location_id: Optional[str]) -> Optional[Tuple[float, float]]:
+        """Latitude/longitude of an indexed location"""
+        return self._by_id.get(location_id)
+
+    def nearest(self, latitude: float, longitude: float, n: int = 1,
+                hubs_only: bool = False) -> List[Dict[str, Any]]:
+        """The ``n`` closest locations (or consolidation hubs), nearest first, with ``distance_km``"""
+        return (self._hubs if hubs_only else self._all).nearest(latitude, longitude, n)
+
+    def within_radius(self, latitude: float, longitude: float, km: float,
+                      hubs_only: bool = False) -> List[Dict[str, Any]]:
+        """Every location (or consolidation hub) within ``km``, nearest first, with ``distance_km``"""
+        return (self._hubs if hubs_only else self._all).within_radius(latitude, longitude, km)
+
+    def operating_radius_mask(self, lanes: Sequence[Dict[str, Any]],
+                              carriers: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """
+        (lanes, carriers) mask of pairs a carrier may serve: the lane origin is
+        within its ``operating_radius`` (miles) of its ``base_location_id``.
+        Carriers without a radius or an indexed base, and lanes whose origin is
+        not indexed, are unrestricted.
+        """
+        by_id = self._by_id
+        origins = np.array([by_id.get(lane.get("origin_location_id"), (np.nan, np.nan)) for lane in lanes],
+                           dtype=float).reshape(-1, 2)
+        bases = np.array([by_id.get(carrier.get("base_location_id"), (np.nan, np.nan)) for carrier in carriers],
+                         dtype=float).reshape(-1, 2)
+        radius_km = np.array([float(carrier.get("operating_radius") or 0) for carrier in carriers],
+                             dtype=float) * KM_PER_MILE
+        # One distance matrix for every pair instead of a radius query per carrier
+        with np.errstate(invalid="ignore"):
+            inside = pairwise_km(origins, bases) <= radius_km[None, :]
+        unrestricted = (radius_km <= 0) | np.isnan(bases[:, 0])
+        return inside | unrestricted[None, :] | np.isnan(origins[:, 0])[:, None]
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and refresh counters"""
+        return dict(
+            self._stats,
+            rows=len(self._rows),
+            indexed=len(self._all.rows),
+            hubs=len(self._hubs.rows),
+            kd_tree=cKDTree is not None,
+            age_seconds=round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at else None
+        )
+
+
+# Global location index, loaded on first use
+location_index = LocationIndex(async_db, refresh_interval=settings.location_index_refresh_seconds)
@@ -1,10 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.dashboard_dev import router as dashboard_dev_router
 from app.api.bids import router as bids_router
 from app.api.auth import router as auth_router
+from app.api.admin import router as admin_router
+from app.api.network_analysis import router as network_analysis_router
 # from app.api.load_lane_history import router as load_lane_history_router
 from app.config import settings
+from app.database import async_db
+from app.database_mysql import request_scope
+from app.auth.password_handler import password_pool
+from app.services.dashboard_summary import DashboardSummaryRefresher
+from app.response_cache import response_cache
+from app.services.dashboard_stream import dashboard_broadcaster
+from app.services.analysis_jobs import analysis_jobs
 import logging
 
 # Configure logging
@@ -29,12 +38,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def database_request_scope(request: Request, call_next):
+    """Keep reads that follow a write in the same request on the primary"""
+    with request_scope():
+        return await call_next(request)
+
 # Include API routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(dashboard_dev_router, prefix="/api/v1")
 app.include_router(bids_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(network_analysis_router, prefix="/api/v1")
 # app.include_router(load_lane_history_router, prefix="/api/v1")
 
+dashboard_summary_refresher = DashboardSummaryRefresher(async_db, settings.dashboard_summary_refresh_seconds)
+
+@app.on_event("startup")
+async def startup():
+    """Start background maintenance of the dashboard summary row and analysis jobs"""
+    if settings.dashboard_summary_enabled:
+        dashboard_summary_refresher.start()
+    analysis_jobs.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release pooled database connections and worker threads"""
+    await dashboard_summary_refresher.stop()
+    await dashboard_broadcaster.stop()
+    await analysis_jobs.stop()
+    await response_cache.close()
+    await async_db.close()
+    password_pool.shutdown()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,26 @@
+-- Bid statistics rollup backing GET /bids/stats/summary when BID_STATS_TABLE_ENABLED=true
+-- Run once to create and backfill the table; the bid endpoints keep it current afterwards
+USE routecraft;
+
+-- Per-user, per-status bid totals maintained by the bid write endpoints
+-- (read by GET /bids/stats/summary when BID_STATS_TABLE_ENABLED=true)
+CREATE TABLE IF NOT EXISTS bid_user_stats (
+    user_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    bid_count INT NOT NULL DEFAULT 0,
+    total_value DECIMAL(14,2) NOT NULL DEFAULT 0,
+    valued_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+);
+
+DELETE FROM bid_user_stats;
+
+INSERT INTO bid_user_stats (user_id, status, bid_count, total_value, valued_count)
+SELECT 
+    COALESCE(created_by, 0),
+    status,
+    COUNT(*),
+    COALESCE(SUM(estimated_cost), 0),
+    COUNT(estimated_cost)
+FROM bids
+GROUP BY COALESCE(created_by, 0), status;
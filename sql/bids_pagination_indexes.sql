@@ -0,0 +1,6 @@
+-- Composite indexes backing keyset (cursor) pagination of GET /bids/
+-- Run once against databases created before these were added to setup_mysql.sql
+USE routecraft;
+
+CREATE INDEX idx_bids_created_at_id ON bids(created_at, id);
+CREATE INDEX idx_bids_created_by_created_at_id ON bids(created_by, created_at, id);
@@ -0,0 +1,13 @@
+-- Carrier base location and operating radius, used for carrier-to-lane distances and the radius filter
+-- Run once against databases created before these were added to setup_mysql.sql, after
+-- create_locations_master_table.py has created locations_master
+USE routecraft;
+
+ALTER TABLE carriers
+    ADD COLUMN base_location_id VARCHAR(50) NULL AFTER insurance_expiry,
+    ADD COLUMN operating_radius INT NULL COMMENT 'Miles from the base location' AFTER base_location_id;
+
+-- Databases created from the current setup_mysql.sql already have the columns and need only this
+ALTER TABLE carriers
+    ADD CONSTRAINT fk_carriers_base_location
+    FOREIGN KEY (base_location_id) REFERENCES locations_master(location_id) ON DELETE SET NULL;
@@ -8,6 +8,7 @@ import mysql.connector
 from mysql.connector import Error
 import os
 from dotenv import load_dotenv
+from seed_data import seed_rows
 
 def create_accessorial_definitions_master_table():
     """Create the accessorial_definitions_master table and related views"""
@@ -84,7 +85,7 @@ def create_accessorial_definitions_master_table():
             print("✅ Table created successfully!")
 
             # Insert sample data
-            insert_sample_data(cursor)
+            insert_sample_data(config)
 
             # Create views
             create_views(cursor)
@@ -108,7 +109,7 @@ def create_accessorial_definitions_master_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample accessorial data"""
     print("📝 Inserting sample accessorial data...")
     
@@ -165,25 +166,19 @@ def insert_sample_data(cursor):
         ('ACC-DOC-01', 'Documentation Fee', 'Additional paperwork and documentation processing', 'General', 'Complex documentation or special permits required', 'Flat Fee', 300.00, 'Trip', 'Yes', 'No', 'DOC-FEE', 'GL-4016', 'All equipment types', 'No', 'For shipments requiring special permits or documentation', 'Yes', current_date, None, 'System', 'System')
     ]
 
-    insert_sql = """
-    INSERT INTO accessorial_definitions_master (
-        accessorial_id, accessorial_name, description, applies_to, trigger_condition,
-        rate_type, rate_value, unit, taxable, included_in_base, invoice_code,
-        gl_mapping, applicable_equipment_types, carrier_editable_in_bid, remarks,
-        is_active, effective_from, effective_to, created_by, updated_by
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    success_count = 0
-    for data in sample_data:
-        try:
-            cursor.execute(insert_sql, data)
-            success_count += 1
-            print(f"  ✓ Inserted {data[0]}: {data[1]}")
-        except Error as e:
-            print(f"  ✗ Error inserting {data[0]}: {e}")
+    columns = [
+        'accessorial_id', 'accessorial_name', 'description', 'applies_to', 'trigger_condition', 'rate_type',
+        'rate_value', 'unit', 'taxable', 'included_in_base', 'invoice_code', 'gl_mapping',
+        'applicable_equipment_types', 'carrier_editable_in_bid', 'remarks', 'is_active', 'effective_from',
+        'effective_to', 'created_by', 'updated_by'
+    ]
 
-    print(f"📊 Successfully inserted {success_count} out of {len(sample_data)} accessorial definitions")
+    try:
+        inserted_count = seed_rows(config, 'accessorial_definitions_master', columns, sample_data)
+    except Error as e:
+        print(f"  ❌ Error inserting sample accessorial definitions: {e}")
+        inserted_count = 0
+    print(f"📊 Successfully inserted {inserted_count} out of {len(sample_data)} accessorial definitions")
 
 def create_views(cursor):
     """Create useful views for accessorial analysis"""
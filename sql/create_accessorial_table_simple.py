@@ -6,18 +6,21 @@ Simple Accessorial Definitions Master Table Creation Script
 import mysql.connector
 import os
 from mysql.connector import Error
+from seed_data import seed_rows
+
+DB_CONFIG = {
+    'host': os.getenv('MYSQL_HOST', 'localhost'),
+    'user': os.getenv('MYSQL_USER', 'routecraft_user'),
+    'password': os.getenv('MYSQL_PASSWORD', 'routecraft_password'),
+    'database': os.getenv('MYSQL_DATABASE', 'routecraft'),
+    'port': int(os.getenv('MYSQL_PORT', 3306))
+}
 
 def get_database_connection():
     """Establish connection to MySQL database."""
     try:
         print("🔍 Connecting to MySQL...")
-        connection = mysql.connector.connect(
-            host=os.getenv('MYSQL_HOST', 'localhost'),
-            user=os.getenv('MYSQL_USER', 'routecraft_user'),
-            password=os.getenv('MYSQL_PASSWORD', 'routecraft_password'),
-            database=os.getenv('MYSQL_DATABASE', 'routecraft'),
-            port=int(os.getenv('MYSQL_PORT', 3306))
-        )
+        connection = mysql.connector.connect(**DB_CONFIG)
         print("✅ Database connection successful!")
         return connection
     except Error as e:
@@ -111,21 +114,17 @@ def insert_sample_data(connection):
         print(f"📊 First data tuple has {len(first_tuple)} values")
         print(f"📊 Sample tuple: {first_tuple}")
         
-        # INSERT statement with 25 columns (excluding created_at and updated_at which have defaults)
-        insert_sql = """
-        INSERT INTO accessorial_definitions_master (
-            accessorial_id, accessorial_name, description, applies_to, trigger_condition,
-            rate_type, rate_value, unit, taxable, included_in_base, invoice_code,
-            applicable_equipment_types, carrier_editable_in_bid, is_active, min_charge,
-            max_charge, free_time_hours, applicable_regions, applicable_lanes,
-            seasonal_applicability, documentation_required, approval_required,
-            created_by, updated_by, remarks
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        # Count the %s placeholders
-        placeholder_count = insert_sql.count('%s')
-        print(f"📊 INSERT statement has {placeholder_count} placeholders")
+        # 25 columns (excluding created_at and updated_at which have defaults)
+        insert_columns = [
+            'accessorial_id', 'accessorial_name', 'description', 'applies_to', 'trigger_condition',
+            'rate_type', 'rate_value', 'unit', 'taxable', 'included_in_base', 'invoice_code',
+            'applicable_equipment_types', 'carrier_editable_in_bid', 'is_active', 'min_charge',
+            'max_charge', 'free_time_hours', 'applicable_regions', 'applicable_lanes',
+            'seasonal_applicability', 'documentation_required', 'approval_required',
+            'created_by', 'updated_by', 'remarks'
+        ]
+        placeholder_count = len(insert_columns)
+        print(f"📊 INSERT statement has {placeholder_count} columns")
         
         # Verify the data tuples have the right number of values
         print(f"📊 Data tuples have {len(first_tuple)} values")
@@ -135,11 +134,9 @@ def insert_sample_data(connection):
             print(f"❌ Mismatch: {placeholder_count} columns vs {len(first_tuple)} values")
             return False
         
-        cursor.executemany(insert_sql, sample_data)
-        print(f"✅ Inserted {len(sample_data)} records successfully")
-        
-        connection.commit()
         cursor.close()
+        inserted = seed_rows(DB_CONFIG, 'accessorial_definitions_master', insert_columns, sample_data)
+        print(f"✅ Inserted {inserted} records successfully")
         return True
         
     except Error as e:
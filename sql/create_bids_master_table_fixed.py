@@ -9,6 +9,7 @@ from mysql.connector import Error
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from seed_data import seed_rows
 
 def create_bids_master_table():
     """Create the bids_master table with comprehensive bid management fields"""
@@ -327,25 +328,14 @@ def create_bids_master_table():
             ]
             
             # Insert sample bids
-            for bid in sample_bids:
-                insert_query = """
-                INSERT INTO bids_master (
-                    bid_reference, bid_title, description, bid_type, priority,
-                    bid_start_date, bid_end_date, submission_deadline, budget_amount,
-                    currency, estimated_cost, status, bid_category, equipment_requirements,
-                    service_level_requirements, origin_regions, destination_regions,
-                    target_carrier_types, max_carriers_per_lane, min_carrier_rating, created_by
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                
-                cursor.execute(insert_query, (
-                    bid['bid_reference'], bid['bid_title'], bid['description'], bid['bid_type'],
-                    bid['priority'], bid['bid_start_date'], bid['bid_end_date'], bid['submission_deadline'],
-                    bid['budget_amount'], bid['currency'], bid['estimated_cost'], bid['status'],
-                    bid['bid_category'], bid['equipment_requirements'], bid['service_level_requirements'],
-                    bid['origin_regions'], bid['destination_regions'], bid['target_carrier_types'],
-                    bid['max_carriers_per_lane'], bid['min_carrier_rating'], bid['created_by']
-                ))
+            columns = [
+                'bid_reference', 'bid_title', 'description', 'bid_type', 'priority', 'bid_start_date',
+                'bid_end_date', 'submission_deadline', 'budget_amount', 'currency', 'estimated_cost', 'status',
+                'bid_category', 'equipment_requirements', 'service_level_requirements', 'origin_regions',
+                'destination_regions', 'target_carrier_types', 'max_carriers_per_lane', 'min_carrier_rating',
+                'created_by'
+            ]
+            seed_rows(config, 'bids_master', columns, sample_bids)
             
             print("✅ Successfully inserted sample bid data")
             
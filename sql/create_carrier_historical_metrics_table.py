@@ -15,6 +15,7 @@ import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import random
+from seed_data import seed_rows
 
 def create_carrier_historical_metrics_table():
     """Create the carrier_historical_metrics table and related views"""
@@ -149,7 +150,7 @@ def create_carrier_historical_metrics_table():
             print("✅ Table created successfully!")
 
             # Insert sample data
-            insert_sample_data(cursor)
+            insert_sample_data(config)
 
             # Create views
             create_views(cursor)
@@ -173,7 +174,7 @@ def create_carrier_historical_metrics_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample carrier historical metrics data"""
     print("📝 Inserting sample carrier historical metrics data...")
     
@@ -193,6 +194,21 @@ def insert_sample_data(cursor):
         ('Kolkata, West Bengal', 'Pune, Maharashtra')
     ]
     
+    # Monthly metrics rows are collected and loaded in multi-row batches
+    columns = [
+        'carrier_id', 'carrier_name', 'period_type', 'period_start_date', 'period_end_date', 'period_label',
+        'lane_id', 'origin_location', 'destination_location', 'equipment_type',
+        'total_loads_assigned', 'loads_accepted', 'loads_rejected', 'loads_cancelled_by_carrier', 'loads_completed',
+        'acceptance_rate', 'completion_rate', 'on_time_pickup_rate', 'on_time_delivery_rate', 'overall_on_time_performance',
+        'late_pickup_count', 'late_delivery_count', 'early_pickup_count', 'early_delivery_count',
+        'billing_accuracy_rate', 'billing_disputes_count', 'average_detention_time_hours', 'detention_charges_applied',
+        'claim_incidents_count', 'claim_percentage', 'customer_complaints_count', 'quality_issues_count',
+        'performance_rating', 'scorecard_grade', 'risk_score',
+        'average_transit_time_hours', 'fuel_efficiency_score', 'driver_behavior_score',
+        'is_blacklisted', 'is_preferred_carrier', 'compliance_status', 'remarks'
+    ]
+    rows = []
+    
     # Generate data for the last 12 months
     current_date = datetime.now()
     
@@ -234,38 +250,11 @@ def insert_sample_data(cursor):
             lane_idx = random.randint(0, len(lanes) - 1)
             equipment_idx = random.randint(0, len(equipment_types) - 1)
             
-            # Insert monthly metrics
-            insert_sql = """
-            INSERT INTO carrier_historical_metrics (
-                carrier_id, carrier_name, period_type, period_start_date, period_end_date, period_label,
-                lane_id, origin_location, destination_location, equipment_type,
-                total_loads_assigned, loads_accepted, loads_rejected, loads_cancelled_by_carrier, loads_completed,
-                acceptance_rate, completion_rate, on_time_pickup_rate, on_time_delivery_rate, overall_on_time_performance,
-                late_pickup_count, late_delivery_count, early_pickup_count, early_delivery_count,
-                billing_accuracy_rate, billing_disputes_count, average_detention_time_hours, detention_charges_applied,
-                claim_incidents_count, claim_percentage, customer_complaints_count, quality_issues_count,
-                performance_rating, scorecard_grade, risk_score,
-                average_transit_time_hours, fuel_efficiency_score, driver_behavior_score,
-                is_blacklisted, is_preferred_carrier, compliance_status, remarks
-            ) VALUES (
-                %s, %s, 'Monthly', %s, %s, %s,
-                %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s,
-                %s, %s, %s, %s,
-                %s, %s, %s, %s,
-                %s, %s, %s,
-                %s, %s, %s,
-                %s, %s, %s, %s
-            )
-            """
-            
             lane_id = f"LANE-{month_offset:02d}-{i+1:02d}"
             origin, destination = lanes[lane_idx]
             
             values = (
-                carrier_id, carrier_names[i], period_start.date(), period_end.date(), period_label,
+                carrier_id, carrier_names[i], 'Monthly', period_start.date(), period_end.date(), period_label,
                 lane_id, origin, destination, equipment_types[equipment_idx],
                 total_loads, accepted_loads, total_loads - accepted_loads, 
                 random.randint(0, int(accepted_loads * 0.1)), completed_loads,
@@ -282,11 +271,12 @@ def insert_sample_data(cursor):
                 f"Monthly performance metrics for {period_label}"
             )
             
-            try:
-                cursor.execute(insert_sql, values)
-                print(f"  ✓ Inserted metrics for {carrier_names[i]} - {period_label}")
-            except Error as e:
-                print(f"  ✗ Error inserting {carrier_names[i]} - {period_label}: {e}")
+            rows.append(values)
+    
+    try:
+        seed_rows(config, 'carrier_historical_metrics', columns, rows)
+    except Error as e:
+        print(f"  ✗ Error inserting metric rows: {e}")
 
 def create_views(cursor):
     """Create useful views for carrier historical metrics analysis"""
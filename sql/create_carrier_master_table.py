@@ -8,6 +8,7 @@ import mysql.connector
 from mysql.connector import Error
 import os
 from dotenv import load_dotenv
+from seed_data import seed_rows
 
 def create_carrier_master_table():
     """Create the carrier_master table and related views"""
@@ -97,7 +98,7 @@ def create_carrier_master_table():
             print("✅ Table created successfully!")
 
             # Insert sample data
-            insert_sample_data(cursor)
+            insert_sample_data(config)
 
             # Create views
             create_views(cursor)
@@ -123,7 +124,7 @@ def create_carrier_master_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample carrier master data"""
     print("📝 Inserting sample carrier master data...")
 
@@ -149,27 +150,19 @@ def insert_sample_data(cursor):
         ('CAR-010', 'Cold Chain Express', 'COLD', 'JKLMN0123O', '11JJJJJ0000J0Z4', '741, Cold Storage, Pune, Maharashtra 411002', 'Sanjay Verma', '+91-0987654321', 'sanjay.verma@coldchain.com', 'West India', 80, '["Reefer", "Temperature-controlled"]', 'Own', 94.20, 96.80, 98.90, '2025-03-31', 'Yes', 'Yes', '2025-01-31', 'A', '30 days from invoice', 'ICICI Bank', '8899001122', 'ICIC0008899', 'No', '2024-12-03', 'No', 'Premium cold chain logistics provider', 'admin', 'admin')
     ]
 
-    insert_sql = """
-    INSERT INTO carrier_master (
-        carrier_id, carrier_name, carrier_code, pan_number, gstin, registered_address, 
-        contact_person_name, contact_number, email, region_coverage, fleet_size, 
-        vehicle_types, own_market, avg_acceptance_rate, avg_on_time_performance, 
-        billing_accuracy, compliance_valid_until, preferred_carrier, contracted, 
-        rate_expiry_date, carrier_rating, payment_terms, bank_name, account_number, 
-        ifsc_code, msme_registered, last_load_date, blacklisted, remarks,
-        created_by, updated_by
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+    columns = [
+        'carrier_id', 'carrier_name', 'carrier_code', 'pan_number', 'gstin', 'registered_address',
+        'contact_person_name', 'contact_number', 'email', 'region_coverage', 'fleet_size', 'vehicle_types',
+        'own_market', 'avg_acceptance_rate', 'avg_on_time_performance', 'billing_accuracy',
+        'compliance_valid_until', 'preferred_carrier', 'contracted', 'rate_expiry_date', 'carrier_rating',
+        'payment_terms', 'bank_name', 'account_number', 'ifsc_code', 'msme_registered', 'last_load_date',
+        'blacklisted', 'remarks', 'created_by', 'updated_by'
+    ]
 
-    for data in sample_data:
-        try:
-            cursor.execute(insert_sql, data)
-            print(f"  ✓ Inserted: {data[0]} - {data[1]} ({data[2]})")
-        except Error as e:
-            if "duplicate entry" in str(e).lower():
-                print(f"  ⚠ Skipped (duplicate): {data[0]}")
-            else:
-                print(f"  ✗ Error inserting {data[0]}: {e}")
+    try:
+        seed_rows(config, 'carrier_master', columns, sample_data)
+    except Error as e:
+        print(f"  ❌ Error inserting sample carriers: {e}")
 
 def create_views(cursor):
     """Create useful views for carrier master"""
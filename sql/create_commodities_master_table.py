@@ -5,6 +5,7 @@ import mysql.connector
 from dotenv import load_dotenv
 import os
 from datetime import datetime
+from seed_data import seed_rows
 
 def create_commodities_master_table():
     """Create the commodities_master table and populate with sample data"""
@@ -70,7 +71,7 @@ def create_commodities_master_table():
         print("✅ Commodities Master table created successfully!")
         
         # Insert sample data
-        insert_sample_data(cursor)
+        insert_sample_data(config)
         
         # Create views
         create_views(cursor)
@@ -91,7 +92,7 @@ def create_commodities_master_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample commodities data"""
     
     sample_commodities = [
@@ -102,19 +103,19 @@ def insert_sample_data(cursor):
         ('CMD-005', 'Industrial Chemicals', 'Hazardous', '2811', 'Drums', 'HAZMAT - Special handling', False, True, 'High', 12.5, 750.0, True, True, 300, 3000000.00, '["HAZMAT Certified", "Closed Body"]', '["Open Body", "Food Carriers"]', None, None, 'Active', 'Dangerous goods')
     ]
     
-    insert_sql = """
-    INSERT INTO commodities_master (
-        commodity_id, commodity_name, commodity_category, hsn_code, typical_packaging_type,
-        handling_instructions, temperature_controlled, hazmat, value_category, avg_weight_per_load,
-        avg_volume_per_load, insurance_required, sensitive_cargo, loading_unloading_sla,
-        min_insurance_amount, preferred_carrier_types, restricted_carrier_types, remarks
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    for commodity in sample_commodities:
-        cursor.execute(insert_sql, commodity)
+    columns = [
+        'commodity_id', 'commodity_name', 'commodity_category', 'hsn_code', 'typical_packaging_type',
+        'handling_instructions', 'temperature_controlled', 'hazmat', 'value_category', 'avg_weight_per_load',
+        'avg_volume_per_load', 'insurance_required', 'sensitive_cargo', 'loading_unloading_sla',
+        'min_insurance_amount', 'preferred_carrier_types', 'restricted_carrier_types', 'remarks'
+    ]
     
-    print(f"✅ Inserted {len(sample_commodities)} sample commodities")
+    try:
+        inserted_count = seed_rows(config, 'commodities_master', columns, sample_commodities)
+    except mysql.connector.Error as e:
+        print(f"  ❌ Error inserting sample commodities: {e}")
+        inserted_count = 0
+    print(f"✅ Inserted {inserted_count} sample commodities")
 
 def create_views(cursor):
     """Create analytical views"""
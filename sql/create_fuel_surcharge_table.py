@@ -9,6 +9,7 @@ from mysql.connector import Error
 import os
 from dotenv import load_dotenv
 from datetime import date, datetime
+from seed_data import seed_rows
 
 def create_fuel_surcharge_table():
     """Create the fuel_surcharge_master table and related views"""
@@ -155,18 +156,13 @@ def create_fuel_surcharge_table():
                 (date(2025, 7, 1), 105.00, 110.00, 10.25, 80.00, None, 'INR', 'All India', 'Fixed', 'Updated rates effective July 2025'),
             ]
             
-            insert_query = """
-            INSERT INTO fuel_surcharge_master (
-                effective_date, fuel_price_min, fuel_price_max, fuel_surcharge_percentage,
-                base_fuel_price, change_per_rupee, currency, applicable_region,
-                surcharge_type, notes, is_active
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            for data in sample_data:
-                cursor.execute(insert_query, data + ('Yes',))
+            columns = [
+                'effective_date', 'fuel_price_min', 'fuel_price_max', 'fuel_surcharge_percentage',
+                'base_fuel_price', 'change_per_rupee', 'currency', 'applicable_region', 'surcharge_type',
+                'notes', 'is_active'
+            ]
+            seed_rows(config, 'fuel_surcharge_master', columns, [data + ('Yes',) for data in sample_data])
             
-            print(f"✅ Inserted {len(sample_data)} fuel surcharge records")
             
             # Insert sample fuel price tracking data
             fuel_tracking_data = [
@@ -182,16 +178,10 @@ def create_fuel_surcharge_table():
                 (date(2025, 6, 10), 98.75, 'IOC', 'All India', 'INR', True, 'Official IOC diesel rate'),
             ]
             
-            tracking_insert_query = """
-            INSERT INTO fuel_price_tracking (
-                tracking_date, fuel_price, source, region, currency, is_official, notes
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            for data in fuel_tracking_data:
-                cursor.execute(tracking_insert_query, data)
-            
-            print(f"✅ Inserted {len(fuel_tracking_data)} fuel price tracking records")
+            tracking_columns = [
+                'tracking_date', 'fuel_price', 'source', 'region', 'currency', 'is_official', 'notes'
+            ]
+            seed_rows(config, 'fuel_price_tracking', tracking_columns, fuel_tracking_data)
             
             # Create useful views
             views = [
@@ -13,19 +13,22 @@ from mysql.connector import Error
 import os
 from dotenv import load_dotenv
 from datetime import datetime, date
+from seed_data import seed_rows
 
 # Load environment variables
 load_dotenv()
 
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'routecraft_user'),
+    'password': os.getenv('DB_PASSWORD', 'routecraft_password'),
+    'database': os.getenv('DB_NAME', 'routecraft')
+}
+
 def create_database_connection():
     """Create and return a database connection."""
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv('DB_HOST', 'localhost'),
-            user=os.getenv('DB_USER', 'routecraft_user'),
-            password=os.getenv('DB_PASSWORD', 'routecraft_password'),
-            database=os.getenv('DB_NAME', 'routecraft')
-        )
+        connection = mysql.connector.connect(**DB_CONFIG)
         return connection
     except Error as e:
         print(f"❌ Error connecting to MySQL: {e}")
@@ -90,7 +93,7 @@ def create_lanes_master_table(cursor):
         print(f"❌ Error creating table: {e}")
         return False
 
-def insert_sample_data(cursor, connection):
+def insert_sample_data():
     """Insert sample lane data."""
     sample_lanes = [
         ('LANE-BHW-HYD-001', 'WH-MUM-01', 'Bhiwandi', 'Maharashtra', 'CUST-HYD-01', 'Hyderabad', 'Telangana', 'Primary', 725.50, 2, 30.0, 15.5, 450.0, '32ft Container', 'TL', 'Standard', True, 'March,October', '["ABC Logistics", "XYZ Transport"]', 28000.00, 1806.45, 30000.00, 1935.48, True, '["Unloading", "Waiting"]', True, date(2024, 12, 15), 'High volume lane, toll-heavy route'),
@@ -100,28 +103,23 @@ def insert_sample_data(cursor, connection):
         ('LANE-HYD-MUM-005', 'CUST-HYD-01', 'Hyderabad', 'Telangana', 'PORT-MUM-01', 'Mumbai', 'Maharashtra', 'Outbound', 750.45, 2, 12.0, 16.0, 480.0, '32ft Container', 'TL', 'Scheduled', True, 'February,August', '["Telangana Express", "Port Connect"]', 30000.00, 1875.00, 32000.00, 2000.00, True, '["Unloading", "Port Charges"]', True, date(2024, 12, 10), 'Export route, port handling required')
     ]
     
-    insert_sql = """
-    INSERT INTO lanes_master (
-        lane_id, origin_location_id, origin_city, origin_state, destination_location_id, destination_city, destination_state,
-        lane_type, distance_km, transit_time_days, avg_load_frequency_month, avg_load_volume_tons, avg_load_volume_cft,
-        preferred_equipment_type, mode, service_level, seasonality, peak_months, primary_carriers, current_rate_trip,
-        current_rate_ton, benchmark_rate_trip, benchmark_rate_ton, fuel_surcharge_applied, accessorials_expected,
-        is_active, last_used_date, remarks
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+    columns = [
+        'lane_id', 'origin_location_id', 'origin_city', 'origin_state', 'destination_location_id',
+        'destination_city', 'destination_state', 'lane_type', 'distance_km', 'transit_time_days',
+        'avg_load_frequency_month', 'avg_load_volume_tons', 'avg_load_volume_cft',
+        'preferred_equipment_type', 'mode', 'service_level', 'seasonality', 'peak_months',
+        'primary_carriers', 'current_rate_trip', 'current_rate_ton', 'benchmark_rate_trip',
+        'benchmark_rate_ton', 'fuel_surcharge_applied', 'accessorials_expected', 'is_active',
+        'last_used_date', 'remarks'
+    ]
     
     print("📝 Inserting sample lane data...")
-    inserted_count = 0
-    
-    for lane in sample_lanes:
-        try:
-            cursor.execute(insert_sql, lane)
-            inserted_count += 1
-            print(f"  ✓ Inserted {lane[0]}: {lane[2]} → {lane[5]}")
-        except Error as e:
-            print(f"  ❌ Error inserting {lane[0]}: {e}")
+    try:
+        inserted_count = seed_rows(DB_CONFIG, 'lanes_master', columns, sample_lanes)
+    except Error as e:
+        print(f"  ❌ Error inserting sample lanes: {e}")
+        inserted_count = 0
     
-    connection.commit()
     print(f"✅ Inserted {inserted_count} sample lanes")
     return inserted_count
 
@@ -253,7 +251,7 @@ def main():
             return
         
         # Insert sample data
-        insert_sample_data(cursor, connection)
+        insert_sample_data()
         
         # Create views
         create_analytical_views(cursor)
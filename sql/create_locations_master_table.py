@@ -4,6 +4,7 @@
 import mysql.connector
 import os
 from dotenv import load_dotenv
+from seed_data import seed_rows
 
 load_dotenv()
 
@@ -80,7 +81,7 @@ def create_locations_master_table():
         
         # Insert sample data
         print("📝 Inserting sample location data...")
-        insert_sample_data(cursor)
+        insert_sample_data(config)
         
         # Create views
         print("👁️ Creating location master views...")
@@ -99,7 +100,7 @@ def create_locations_master_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample location data"""
     
     sample_locations = [
@@ -110,24 +111,20 @@ def insert_sample_data(cursor):
         ('PORT-MUM-01', 'Mumbai Port Terminal', 'Port', 'Mumbai Port Trust', 'Mumbai', 'Maharashtra', '400001', 'India', 18.9490, 72.8345, 'Export Hub', None, 'Port Operations', '+91-2109876543', 'operations@mumbaiport.gov.in', '24/7 Operations', 180, 'Container', 'Yes', '["Gantry Crane", "Reach Stacker", "Forklift"]', 'Yes', 'Multimodal', 'Limited', 'Yes', 'Active', 'Major container port, customs clearance available')
     ]
     
-    insert_sql = """
-    INSERT INTO locations_master (
-        location_id, location_name, location_type, address_line_1, city, state, pincode, country,
-        latitude, longitude, zone, gstin, location_contact_name, phone_number, email, working_hours,
-        loading_unloading_sla, dock_type, parking_available, equipment_access, is_consolidation_hub,
-        preferred_mode, hazmat_allowed, auto_scheduling_enabled, location_status, remarks
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    for location in sample_locations:
-        try:
-            cursor.execute(insert_sql, location)
-            print(f"  ✓ Inserted {location[0]}: {location[1]}")
-        except mysql.connector.Error as err:
-            print(f"  ✗ Error inserting {location[0]}: {err}")
+    columns = [
+        'location_id', 'location_name', 'location_type', 'address_line_1', 'city', 'state', 'pincode',
+        'country', 'latitude', 'longitude', 'zone', 'gstin', 'location_contact_name', 'phone_number',
+        'email', 'working_hours', 'loading_unloading_sla', 'dock_type', 'parking_available',
+        'equipment_access', 'is_consolidation_hub', 'preferred_mode', 'hazmat_allowed',
+        'auto_scheduling_enabled', 'location_status', 'remarks'
+    ]
     
-    connection.commit()
-    print(f"✅ Inserted {len(sample_locations)} sample locations")
+    try:
+        inserted_count = seed_rows(config, 'locations_master', columns, sample_locations)
+    except mysql.connector.Error as e:
+        print(f"  ❌ Error inserting sample locations: {e}")
+        inserted_count = 0
+    print(f"✅ Inserted {inserted_count} sample locations")
 
 def create_views(cursor):
     """Create analytical views"""
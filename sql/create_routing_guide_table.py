@@ -8,6 +8,7 @@ import mysql.connector
 from mysql.connector import Error
 import os
 from dotenv import load_dotenv
+from seed_data import seed_rows
 
 def create_routing_guide_table():
     """Create the routing_guides table and related views"""
@@ -102,7 +103,7 @@ def create_routing_guide_table():
             print("✅ Table created successfully!")
 
             # Insert sample data
-            insert_sample_data(cursor)
+            insert_sample_data(config)
 
             # Create views
             create_views(cursor)
@@ -128,7 +129,7 @@ def create_routing_guide_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample routing guide data"""
     print("📝 Inserting sample routing guide data...")
 
@@ -169,26 +170,19 @@ def insert_sample_data(cursor):
          'Partial', 'Variable', '2024-05-01', '2024-10-31', 'Active')
     ]
 
-    insert_sql = """
-    INSERT INTO routing_guides (
-        routing_guide_id, origin_location, destination_location, lane_id, equipment_type, service_level, mode,
-        primary_carrier_name, primary_carrier_rate, primary_carrier_rate_type,
-        backup_carrier_1_name, backup_carrier_1_rate, backup_carrier_1_rate_type,
-        backup_carrier_2_name, backup_carrier_2_rate, backup_carrier_2_rate_type,
-        tender_sequence, tender_lead_time_hours, transit_sla_days, fuel_surcharge_percentage,
-        accessorials_included, load_commitment_type, valid_from, valid_to, routing_guide_status
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+    columns = [
+        'routing_guide_id', 'origin_location', 'destination_location', 'lane_id', 'equipment_type',
+        'service_level', 'mode', 'primary_carrier_name', 'primary_carrier_rate', 'primary_carrier_rate_type',
+        'backup_carrier_1_name', 'backup_carrier_1_rate', 'backup_carrier_1_rate_type',
+        'backup_carrier_2_name', 'backup_carrier_2_rate', 'backup_carrier_2_rate_type', 'tender_sequence',
+        'tender_lead_time_hours', 'transit_sla_days', 'fuel_surcharge_percentage', 'accessorials_included',
+        'load_commitment_type', 'valid_from', 'valid_to', 'routing_guide_status'
+    ]
 
-    for data in sample_data:
-        try:
-            cursor.execute(insert_sql, data)
-            print(f"  ✓ Inserted: {data[0]} - {data[1]} → {data[2]} ({data[4]})")
-        except Error as e:
-            if "duplicate entry" in str(e).lower():
-                print(f"  ⚠ Skipped (duplicate): {data[0]}")
-            else:
-                print(f"  ✗ Error inserting {data[0]}: {e}")
+    try:
+        seed_rows(config, 'routing_guides', columns, sample_data)
+    except Error as e:
+        print(f"  ❌ Error inserting sample routing guides: {e}")
 
 def create_views(cursor):
     """Create useful views for routing guides"""
@@ -13,19 +13,22 @@ from mysql.connector import Error
 import os
 from dotenv import load_dotenv
 from datetime import datetime, date
+from seed_data import seed_rows
 
 # Load environment variables
 load_dotenv()
 
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'routecraft_user'),
+    'password': os.getenv('DB_PASSWORD', 'routecraft_password'),
+    'database': os.getenv('DB_NAME', 'routecraft')
+}
+
 def create_database_connection():
     """Create and return a database connection."""
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv('DB_HOST', 'localhost'),
-            user=os.getenv('DB_USER', 'routecraft_user'),
-            password=os.getenv('DB_PASSWORD', 'routecraft_password'),
-            database=os.getenv('DB_NAME', 'routecraft')
-        )
+        connection = mysql.connector.connect(**DB_CONFIG)
         return connection
     except Error as e:
         print(f"❌ Error connecting to MySQL: {e}")
@@ -75,7 +78,7 @@ def create_service_levels_master_table(cursor):
         print(f"❌ Error creating table: {e}")
         return False
 
-def insert_sample_data(cursor, connection):
+def insert_sample_data():
     """Insert sample service level data."""
     sample_service_levels = [
         ('SL-STD-01', 'Standard Delivery', 'Delivery within 3-4 days, normal operating conditions', 3, 4.0, False, False, 'TL', 24, 'Soft SLA', False, None, 'Medium', True, True, 'Standard service for regular shipments'),
@@ -90,27 +93,20 @@ def insert_sample_data(cursor, connection):
         ('SL-HAZMAT-01', 'Hazardous Goods', 'Special handling for dangerous materials', 4, 4.0, True, True, 'Dedicated', 36, 'Hard SLA', True, 'PEN-HAZMAT-01', 'High', True, True, 'Compliance-driven service for dangerous goods')
     ]
     
-    insert_sql = """
-    INSERT INTO service_levels_master (
-        service_level_id, service_level_name, description, max_transit_time_days,
-        allowed_delay_buffer_hours, fixed_departure_time, fixed_delivery_time, mode,
-        carrier_response_time_hours, sla_type, penalty_applicable, penalty_rule_id,
-        priority_tag, enabled_for_bidding, is_active, remarks
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+    columns = [
+        'service_level_id', 'service_level_name', 'description', 'max_transit_time_days',
+        'allowed_delay_buffer_hours', 'fixed_departure_time', 'fixed_delivery_time', 'mode',
+        'carrier_response_time_hours', 'sla_type', 'penalty_applicable', 'penalty_rule_id', 'priority_tag',
+        'enabled_for_bidding', 'is_active', 'remarks'
+    ]
     
     print("📝 Inserting sample service level data...")
-    inserted_count = 0
-    
-    for service_level in sample_service_levels:
-        try:
-            cursor.execute(insert_sql, service_level)
-            inserted_count += 1
-            print(f"  ✓ Inserted {service_level[0]}: {service_level[1]}")
-        except Error as e:
-            print(f"  ❌ Error inserting {service_level[0]}: {e}")
+    try:
+        inserted_count = seed_rows(DB_CONFIG, 'service_levels_master', columns, sample_service_levels)
+    except Error as e:
+        print(f"  ❌ Error inserting sample service levels: {e}")
+        inserted_count = 0
     
-    connection.commit()
     print(f"✅ Inserted {inserted_count} sample service levels")
     return inserted_count
 
@@ -239,7 +235,7 @@ def main():
             return
         
         # Insert sample data
-        insert_sample_data(cursor, connection)
+        insert_sample_data()
         
         # Create views
         create_analytical_views(cursor)
@@ -7,6 +7,7 @@ import mysql.connector
 from mysql.connector import Error
 import os
 from dotenv import load_dotenv
+from seed_data import seed_rows
 
 def create_contract_table():
     """Create the transport_contracts table directly"""
@@ -102,7 +103,7 @@ def create_contract_table():
             print("✅ Table created successfully!")
             
             # Insert sample data
-            insert_sample_data(cursor)
+            insert_sample_data(config)
             
             # Create views
             create_views(cursor)
@@ -128,7 +129,7 @@ def create_contract_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample contract data"""
     print("📝 Inserting sample data...")
     
@@ -146,23 +147,16 @@ def insert_sample_data(cursor):
          '2024-03-01', '2024-08-31', 'Active', '45 days')
     ]
     
-    insert_sql = """
-    INSERT INTO transport_contracts (
-        contract_id, carrier_name, carrier_code, origin_location, destination_location,
-        mode, equipment_type, service_level, rate_type, base_rate, rate_currency,
-        effective_from, effective_to, contract_status, payment_terms
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+    columns = [
+        'contract_id', 'carrier_name', 'carrier_code', 'origin_location', 'destination_location', 'mode',
+        'equipment_type', 'service_level', 'rate_type', 'base_rate', 'rate_currency', 'effective_from',
+        'effective_to', 'contract_status', 'payment_terms'
+    ]
     
-    for data in sample_data:
-        try:
-            cursor.execute(insert_sql, data)
-            print(f"  ✓ Inserted: {data[0]} - {data[1]}")
-        except Error as e:
-            if "duplicate entry" in str(e).lower():
-                print(f"  ⚠ Skipped (duplicate): {data[0]}")
-            else:
-                print(f"  ✗ Error inserting {data[0]}: {e}")
+    try:
+        seed_rows(config, 'transport_contracts', columns, sample_data)
+    except Error as e:
+        print(f"  ❌ Error inserting sample contracts: {e}")
 
 def create_views(cursor):
     """Create useful views"""
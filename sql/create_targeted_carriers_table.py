@@ -12,6 +12,7 @@ from dotenv import load_dotenv
 import os
 from datetime import datetime, timedelta
 import random
+from seed_data import seed_rows
 
 def create_targeted_carriers_table():
     """Create the targeted_carriers table and populate with sample data"""
@@ -78,7 +79,7 @@ def create_targeted_carriers_table():
         print("✅ Targeted Carriers table created successfully!")
         
         # Insert sample data
-        insert_sample_data(cursor)
+        insert_sample_data(config)
         
         # Create analytical views
         create_views(cursor)
@@ -100,7 +101,7 @@ def create_targeted_carriers_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample data into targeted_carriers table"""
     
     # Sample data for targeted carriers
@@ -273,39 +274,19 @@ def insert_sample_data(cursor):
     ]
     
     # Insert sample data
-    insert_sql = """
-    INSERT INTO targeted_carriers (
-        carrier_id_3p, carrier_name, dot_mc_number, region_of_operation,
-        origin_preference, destination_preference, fleet_size, equipment_types,
-        mode, compliance_validated, performance_score_external, preferred_commodity_types,
-        technology_enabled, rating_threshold_met, last_active, invited_to_bid, remarks
-    ) VALUES (
-        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-    )
-    """
-    
-    for carrier in sample_carriers:
-        cursor.execute(insert_sql, (
-            carrier['carrier_id_3p'],
-            carrier['carrier_name'],
-            carrier['dot_mc_number'],
-            carrier['region_of_operation'],
-            carrier['origin_preference'],
-            carrier['destination_preference'],
-            carrier['fleet_size'],
-            carrier['equipment_types'],
-            carrier['mode'],
-            carrier['compliance_validated'],
-            carrier['performance_score_external'],
-            carrier['preferred_commodity_types'],
-            carrier['technology_enabled'],
-            carrier['rating_threshold_met'],
-            carrier['last_active'],
-            carrier['invited_to_bid'],
-            carrier['remarks']
-        ))
+    columns = [
+        'carrier_id_3p', 'carrier_name', 'dot_mc_number', 'region_of_operation', 'origin_preference',
+        'destination_preference', 'fleet_size', 'equipment_types', 'mode', 'compliance_validated',
+        'performance_score_external', 'preferred_commodity_types', 'technology_enabled',
+        'rating_threshold_met', 'last_active', 'invited_to_bid', 'remarks'
+    ]
     
-    print(f"✅ Inserted {len(sample_carriers)} sample targeted carriers")
+    try:
+        inserted_count = seed_rows(config, 'targeted_carriers', columns, sample_carriers)
+    except mysql.connector.Error as e:
+        print(f"  ❌ Error inserting sample targeted carriers: {e}")
+        inserted_count = 0
+    print(f"✅ Inserted {inserted_count} sample targeted carriers")
 
 def create_views(cursor):
     """Create analytical views for targeted carriers"""
@@ -0,0 +1,25 @@
+-- Dashboard overview summary backing GET /dashboard/overview when DASHBOARD_SUMMARY_ENABLED=true
+-- Run once to create the table; the application's background refresher fills and maintains the row
+USE routecraft;
+
+-- One row (id = 1) of overview counters, recomputed every DASHBOARD_SUMMARY_REFRESH_SECONDS
+CREATE TABLE IF NOT EXISTS dashboard_summary (
+    id TINYINT NOT NULL PRIMARY KEY,
+    total_users INT NOT NULL DEFAULT 0,
+    total_carriers INT NOT NULL DEFAULT 0,
+    active_carriers INT NOT NULL DEFAULT 0,
+    total_lanes INT NOT NULL DEFAULT 0,
+    active_lanes INT NOT NULL DEFAULT 0,
+    total_bids INT NOT NULL DEFAULT 0,
+    open_bids INT NOT NULL DEFAULT 0,
+    awarded_bids INT NOT NULL DEFAULT 0,
+    total_responses INT NOT NULL DEFAULT 0,
+    pending_responses INT NOT NULL DEFAULT 0,
+    total_claims INT NOT NULL DEFAULT 0,
+    pending_claims INT NOT NULL DEFAULT 0,
+    total_bid_value DECIMAL(16,2) NOT NULL DEFAULT 0,
+    total_awarded_value DECIMAL(16,2) NOT NULL DEFAULT 0,
+    total_claims_value DECIMAL(16,2) NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 1,
+    refreshed_at TIMESTAMP NOT NULL
+);
@@ -8,6 +8,7 @@ import mysql.connector
 from mysql.connector import Error
 import os
 from dotenv import load_dotenv
+from seed_data import seed_rows
 
 def fix_service_levels_table():
     """Drop and recreate the service_levels_master table"""
@@ -94,7 +95,7 @@ def fix_service_levels_table():
             print("✅ Table created successfully!")
             
             # Insert sample data
-            insert_sample_data(cursor)
+            insert_sample_data(config)
             
             # Create views
             create_views(cursor)
@@ -113,7 +114,7 @@ def fix_service_levels_table():
             connection.close()
             print("🔌 Database connection closed")
 
-def insert_sample_data(cursor):
+def insert_sample_data(config):
     """Insert sample service level data"""
     print("📝 Inserting sample service level data...")
     
@@ -149,27 +150,21 @@ def insert_sample_data(cursor):
         ('SL-INT-01', 'Intermodal Service', 'Combined rail and road transportation for long distances', 7.0, 12.0, 'No', 'No', 'Intermodal', 72.0, 'Soft SLA', 'No', None, 'Low', 'Yes', 'Specialized', None, None, None, None, 'No', 'No', 'No', 'No', 100000.00, 'Yes', 'Yes', 'For long-haul shipments with cost optimization')
     ]
 
-    insert_sql = """
-    INSERT INTO service_levels_master (
-        service_level_id, service_level_name, description, max_transit_time_days,
-        allowed_delay_buffer_hours, fixed_departure_time, fixed_delivery_time,
-        mode, carrier_response_time_hours, sla_type, penalty_applicable,
-        penalty_rule_id, priority_tag, enabled_for_bidding, service_category,
-        pickup_time_window_start, pickup_time_window_end, delivery_time_window_start,
-        delivery_time_window_end, weekend_operations, holiday_operations,
-        temperature_controlled, security_required, insurance_coverage,
-        fuel_surcharge_applicable, detention_charges_applicable, remarks
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
+    columns = [
+        'service_level_id', 'service_level_name', 'description', 'max_transit_time_days',
+        'allowed_delay_buffer_hours', 'fixed_departure_time', 'fixed_delivery_time', 'mode',
+        'carrier_response_time_hours', 'sla_type', 'penalty_applicable', 'penalty_rule_id', 'priority_tag',
+        'enabled_for_bidding', 'service_category', 'pickup_time_window_start', 'pickup_time_window_end',
+        'delivery_time_window_start', 'delivery_time_window_end', 'weekend_operations', 'holiday_operations',
+        'temperature_controlled', 'security_required', 'insurance_coverage', 'fuel_surcharge_applicable',
+        'detention_charges_applicable', 'remarks'
+    ]
 
-    success_count = 0
-    for data in sample_data:
-        try:
-            cursor.execute(insert_sql, data)
-            success_count += 1
-            print(f"  ✓ Inserted {data[0]}: {data[1]}")
-        except Error as e:
-            print(f"  ✗ Error inserting {data[0]}: {e}")
+    try:
+        success_count = seed_rows(config, 'service_levels_master', columns, sample_data)
+    except Error as e:
+        print(f"  ❌ Error inserting sample service levels: {e}")
+        success_count = 0
 
     print(f"📊 Successfully inserted {success_count} out of {len(sample_data)} service levels")
 
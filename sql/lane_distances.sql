@@ -0,0 +1,13 @@
+-- Lane distance cache backing network analysis, lane creation and rate-per-km analytics
+-- Run once to create the table; the application fills it as lane distances are first requested
+USE routecraft;
+
+-- Great-circle distance between two locations_master locations, computed once per pair.
+-- Delete a location's rows after changing its coordinates so they are recomputed.
+CREATE TABLE IF NOT EXISTS lane_distances (
+    origin_location_id VARCHAR(50) NOT NULL,
+    destination_location_id VARCHAR(50) NOT NULL,
+    distance_km DECIMAL(8,2) NOT NULL,
+    computed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (origin_location_id, destination_location_id)
+);
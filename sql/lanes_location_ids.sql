@@ -0,0 +1,9 @@
+-- locations_master references on lanes, used to derive lane and carrier distances
+-- Run once against databases created before these were added to setup_mysql.sql
+USE routecraft;
+
+ALTER TABLE lanes
+    ADD COLUMN origin_location_id VARCHAR(50) NULL AFTER destination_state,
+    ADD COLUMN destination_location_id VARCHAR(50) NULL AFTER origin_location_id;
+
+CREATE INDEX idx_lanes_locations ON lanes(origin_location_id, destination_location_id);
@@ -0,0 +1,30 @@
+-- Network analyses and the results their background jobs write
+-- Run once to create the table; POST /network-analysis/{id}/start computes an analysis and fills its row
+USE routecraft;
+
+CREATE TABLE IF NOT EXISTS network_analysis (
+    id VARCHAR(36) NOT NULL DEFAULT (UUID()) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    analysis_type VARCHAR(100) NOT NULL,
+    description TEXT,
+    start_date TIMESTAMP NULL,
+    end_date TIMESTAMP NULL,
+    metrics JSON,
+    filters JSON,
+    parameters JSON,
+    notes TEXT,
+    status VARCHAR(50) DEFAULT 'pending',
+    results JSON,
+    summary JSON,
+    recommendations JSON,
+    error_message TEXT,
+    execution_time_seconds DECIMAL(10,3),
+    started_at TIMESTAMP NULL,
+    completed_at TIMESTAMP NULL,
+    failed_at TIMESTAMP NULL,
+    created_by INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_network_analysis_status (status),
+    FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
+);
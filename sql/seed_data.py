@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Batched Sample Data Loading for the Seed Scripts
+
+The create_*_table.py scripts build their tables over their own connection
+and hand their sample rows to ``seed_rows``, which loads them with
+``MySQLDatabase.bulk_insert``: multi-row INSERT statements committed once
+per chunk instead of one round trip per row. Rows whose unique key already
+exists are skipped, so a script can be re-run safely.
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database_mysql import MySQLDatabase
+
+# Rows per multi-row INSERT
+SEED_CHUNK_SIZE = 500
+
+def seed_rows(config, table, columns, rows, chunk_size=SEED_CHUNK_SIZE):
+    """Bulk insert ``rows`` (tuples matching ``columns``) into ``table``; returns the rows inserted"""
+    db = MySQLDatabase(
+        host=config.get('host'),
+        user=config.get('user'),
+        password=config.get('password'),
+        database=config.get('database'),
+        port=config.get('port')
+    )
+    try:
+        counts = db.bulk_insert(table, rows, columns=columns, chunk_size=chunk_size, ignore_duplicates=True)
+    finally:
+        db.close()
+    inserted = sum(counts)
+    skipped = len(rows) - inserted
+    print(f"  ✓ Inserted {inserted} rows into {table} in {len(counts)} batch(es)"
+          + (f", skipped {skipped} existing" if skipped else ""))
+    return inserted
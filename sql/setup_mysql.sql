@@ -33,8 +33,14 @@ CREATE TABLE IF NOT EXISTS carriers (
     mc_number VARCHAR(20),
     status ENUM('active', 'inactive', 'pending') DEFAULT 'pending',
     insurance_expiry DATE,
+    -- locations_master location the carrier operates from. locations_master is created later by
+    -- create_locations_master_table.py; add the foreign key then with the fk_carriers_base_location
+    -- statement of carriers_base_location.sql
+    base_location_id VARCHAR(50) NULL,
+    operating_radius INT NULL COMMENT 'Miles from the base location',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_carriers_base_location (base_location_id),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
 );
 
@@ -44,11 +50,14 @@ CREATE TABLE IF NOT EXISTS lanes (
     origin_state VARCHAR(2) NOT NULL,
     destination_city VARCHAR(100) NOT NULL,
     destination_state VARCHAR(2) NOT NULL,
+    origin_location_id VARCHAR(50),
+    destination_location_id VARCHAR(50),
     distance_miles INT,
     estimated_transit_days INT,
     status ENUM('active', 'inactive') DEFAULT 'active',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_lanes_locations (origin_location_id, destination_location_id)
 );
 
 CREATE TABLE IF NOT EXISTS bids (
@@ -65,6 +74,17 @@ CREATE TABLE IF NOT EXISTS bids (
     FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
 );
 
+-- Per-user, per-status bid totals maintained by the bid write endpoints
+-- (read by GET /bids/stats/summary when BID_STATS_TABLE_ENABLED=true)
+CREATE TABLE IF NOT EXISTS bid_user_stats (
+    user_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    bid_count INT NOT NULL DEFAULT 0,
+    total_value DECIMAL(14,2) NOT NULL DEFAULT 0,
+    valued_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+);
+
 CREATE TABLE IF NOT EXISTS bid_responses (
     id INT AUTO_INCREMENT PRIMARY KEY,
     bid_id INT NOT NULL,
@@ -93,6 +113,66 @@ CREATE TABLE IF NOT EXISTS insurance_claims (
     FOREIGN KEY (filed_by) REFERENCES users(id) ON DELETE SET NULL
 );
 
+-- One-row dashboard overview counters refreshed in the background
+-- (read by GET /dashboard/overview when DASHBOARD_SUMMARY_ENABLED=true)
+CREATE TABLE IF NOT EXISTS dashboard_summary (
+    id TINYINT NOT NULL PRIMARY KEY,
+    total_users INT NOT NULL DEFAULT 0,
+    total_carriers INT NOT NULL DEFAULT 0,
+    active_carriers INT NOT NULL DEFAULT 0,
+    total_lanes INT NOT NULL DEFAULT 0,
+    active_lanes INT NOT NULL DEFAULT 0,
+    total_bids INT NOT NULL DEFAULT 0,
+    open_bids INT NOT NULL DEFAULT 0,
+    awarded_bids INT NOT NULL DEFAULT 0,
+    total_responses INT NOT NULL DEFAULT 0,
+    pending_responses INT NOT NULL DEFAULT 0,
+    total_claims INT NOT NULL DEFAULT 0,
+    pending_claims INT NOT NULL DEFAULT 0,
+    total_bid_value DECIMAL(16,2) NOT NULL DEFAULT 0,
+    total_awarded_value DECIMAL(16,2) NOT NULL DEFAULT 0,
+    total_claims_value DECIMAL(16,2) NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 1,
+    refreshed_at TIMESTAMP NOT NULL
+);
+
+-- Network analyses, computed in the background after POST /network-analysis/{id}/start
+CREATE TABLE IF NOT EXISTS network_analysis (
+    id VARCHAR(36) NOT NULL DEFAULT (UUID()) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    analysis_type VARCHAR(100) NOT NULL,
+    description TEXT,
+    start_date TIMESTAMP NULL,
+    end_date TIMESTAMP NULL,
+    metrics JSON,
+    filters JSON,
+    parameters JSON,
+    notes TEXT,
+    status VARCHAR(50) DEFAULT 'pending',
+    results JSON,
+    summary JSON,
+    recommendations JSON,
+    error_message TEXT,
+    execution_time_seconds DECIMAL(10,3),
+    started_at TIMESTAMP NULL,
+    completed_at TIMESTAMP NULL,
+    failed_at TIMESTAMP NULL,
+    created_by INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_network_analysis_status (status),
+    FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
+);
+
+-- Great-circle lane distances between locations_master locations, computed once per pair
+CREATE TABLE IF NOT EXISTS lane_distances (
+    origin_location_id VARCHAR(50) NOT NULL,
+    destination_location_id VARCHAR(50) NOT NULL,
+    distance_km DECIMAL(8,2) NOT NULL,
+    computed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (origin_location_id, destination_location_id)
+);
+
 CREATE TABLE IF NOT EXISTS bid_lanes (
     id INT AUTO_INCREMENT PRIMARY KEY,
     bid_id INT NOT NULL,
@@ -138,5 +218,7 @@ CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_carriers_user_id ON carriers(user_id);
 CREATE INDEX idx_bids_lane_id ON bids(lane_id);
 CREATE INDEX idx_bids_status ON bids(status);
+CREATE INDEX idx_bids_created_at_id ON bids(created_at, id);
+CREATE INDEX idx_bids_created_by_created_at_id ON bids(created_by, created_at, id);
 CREATE INDEX idx_bid_responses_bid_id ON bid_responses(bid_id);
 CREATE INDEX idx_bid_responses_carrier_id ON bid_responses(carrier_id); 
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""
+Shared fixtures for the RouteCraft backend tests. Nothing here talks to
+MySQL or Redis: databases are stubbed in memory by each test module.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,194 @@
+"""Tests for the network analysis job runner against an in-memory analysis table"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.analysis_jobs import (
+    STALE_HEARTBEATS, AnalysisJobRunner, JobCancelledError, JobQueueFullError, build_result, summarize
+)
+
+
+class AnalysisTable:
+    """Stub database: network_analysis status per id, plus every write it received"""
+
+    def __init__(self, **statuses):
+        self.statuses = dict(statuses)
+        self.updates = []
+
+    async def execute_query(self, query, params=()):
+        status = self.statuses.get(params[0])
+        return [{"status": status}] if status else []
+
+    async def execute_update(self, query, params=()):
+        self.updates.append((query, params))
+        if "status NOT IN" not in query:
+            return 1
+        # _finish: SET <column> = %s, ... WHERE id = %s AND status NOT IN (<finished statuses>)
+        columns = [assignment.split(" = ")[0] for assignment in query.split(" SET ")[1].split(" WHERE ")[0].split(", ")]
+        analysis_id = params[len(columns)]
+        if self.statuses.get(analysis_id) in params[len(columns) + 1:]:
+            return 0
+        self.statuses[analysis_id] = params[columns.index("status")]
+        return 1
+
+    def finished(self, analysis_id):
+        return self.statuses.get(analysis_id)
+
+
+class BlockingRunner(AnalysisJobRunner):
+    """Runner whose analyses wait on ``release`` and then checkpoint once"""
+
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self.running = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def _compute(self, job, analysis):
+        self.running.set()
+        await self.release.wait()
+        await self._checkpoint(job, 0.5, "halfway")
+        return {"results": "{}"}
+
+
+def test_job_completes_and_records_result():
+    async def scenario():
+        db = AnalysisTable(a1="in_progress")
+        runner = BlockingRunner(db)
+        job = runner.submit({"id": "a1"})
+        runner.release.set()
+        await job.task
+        return db, job, runner.stats()
+
+    db, job, stats = asyncio.run(scenario())
+    assert job.state == "completed" and job.progress == 1.0
+    assert db.finished("a1") == "completed"
+    assert stats["completed"] == 1
+
+
+def test_cancel_records_cancelled():
+    async def scenario():
+        db = AnalysisTable(a1="in_progress")
+        runner = BlockingRunner(db)
+        job = runner.submit({"id": "a1"})
+        await runner.running.wait()
+        assert runner.cancel("a1")
+        with pytest.raises(asyncio.CancelledError):
+            await job.task
+        return db, job
+
+    db, job = asyncio.run(scenario())
+    assert job.state == "cancelled"
+    assert db.finished("a1") == "cancelled"
+
+
+def test_checkpoint_stops_job_cancelled_elsewhere():
+    async def scenario():
+        db = AnalysisTable(a1="in_progress")
+        runner = BlockingRunner(db)
+        job = runner.submit({"id": "a1"})
+        await runner.running.wait()
+        # Another worker handled the cancel request and updated the row
+        db.statuses["a1"] = "cancelled"
+        runner.release.set()
+        await job.task
+        return db, job
+
+    db, job = asyncio.run(scenario())
+    assert job.state == "cancelled"
+    # The row finished elsewhere is left as it was
+    assert db.finished("a1") == "cancelled"
+
+
+def test_checkpoint_raises_when_row_is_gone():
+    async def scenario():
+        runner = AnalysisJobRunner(AnalysisTable())
+        job = runner.submit({"id": "missing"})
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+        await runner._checkpoint(job, 0.1, "loading")
+
+    with pytest.raises(JobCancelledError):
+        asyncio.run(scenario())
+
+
+def test_queue_limit_rejects_extra_jobs():
+    async def scenario():
+        db = AnalysisTable(a1="in_progress", a2="in_progress", a3="in_progress")
+        runner = BlockingRunner(db, max_concurrency=1, max_queued=1)
+        runner.submit({"id": "a1"})
+        runner.submit({"id": "a2"})
+        try:
+            with pytest.raises(JobQueueFullError):
+                runner.submit({"id": "a3"})
+            return runner.stats()
+        finally:
+            await runner.stop()
+
+    assert asyncio.run(scenario())["rejected"] == 1
+
+
+def test_stop_marks_interrupted_jobs_failed():
+    async def scenario():
+        db = AnalysisTable(a1="in_progress")
+        runner = BlockingRunner(db)
+        runner.submit({"id": "a1"})
+        await runner.running.wait()
+        await runner.stop()
+        return db
+
+    db = asyncio.run(scenario())
+    assert db.finished("a1") == "failed"
+    assert "Interrupted by server shutdown" in db.updates[-1][1]
+
+
+def test_reconcile_stale_spares_this_workers_jobs():
+    async def scenario():
+        db = AnalysisTable(a1="in_progress", a2="in_progress")
+        runner = BlockingRunner(db, heartbeat_interval=10)
+        runner.submit({"id": "a1"})
+        runner.submit({"id": "a2"})
+        before = datetime.utcnow()
+        await runner.reconcile_stale()
+        await runner.stop()
+        return db, before
+
+    db, before = asyncio.run(scenario())
+    query, params = next(update for update in db.updates if "updated_at < %s" in update[0])
+    assert "status = 'in_progress'" in query
+    assert "id NOT IN (%s, %s)" in query
+    assert params[-2:] == ("a1", "a2")
+    cutoff = params[3]
+    expected = before - timedelta(seconds=10 * STALE_HEARTBEATS)
+    assert abs((cutoff - expected).total_seconds()) < 1
+
+
+def test_heartbeat_touches_only_active_jobs():
+    async def scenario():
+        db = AnalysisTable(a1="in_progress")
+        runner = BlockingRunner(db)
+        await runner._heartbeat()
+        assert db.updates == []
+        runner.submit({"id": "a1"})
+        await runner._heartbeat()
+        await runner.stop()
+        return db
+
+    db = asyncio.run(scenario())
+    query, params = db.updates[0]
+    assert query.startswith("UPDATE network_analysis SET updated_at = %s")
+    assert params[1:] == ("a1",)
+
+
+def test_build_result_and_summary():
+    cheaper = build_result("cost_per_mile", 2.0, 2.5, None)
+    late = build_result("on_time_performance", 80.0, 95.0, 90.0)
+    steady = build_result("damage_rate", 1.0, 1.0, None)
+    assert (cheaper["trend"], cheaper["status"], cheaper["change_percentage"]) == ("decreasing", "good", -20.0)
+    assert (late["trend"], late["status"]) == ("decreasing", "critical")
+    assert (steady["trend"], steady["status"]) == ("stable", "good")
+
+    summary, recommendations = summarize([cheaper, late, steady])
+    assert (summary["improving_metrics"], summary["declining_metrics"], summary["stable_metrics"]) == (1, 1, 1)
+    assert summary["critical_metrics"] == 1
+    assert len(recommendations) == 1 and recommendations[0].startswith("On time performance worsened")
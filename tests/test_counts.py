@@ -0,0 +1,88 @@
+"""Tests for the total-count strategies used by list endpoints"""
+import asyncio
+
+import pytest
+
+from app.counts import count_cache, count_rows
+
+
+class CountingDB:
+    """Stub database answering COUNT, information_schema and EXPLAIN queries"""
+
+    def __init__(self, total=42, table_rows=1000, plan=None, explain_error=None):
+        self.total = total
+        self.table_rows = table_rows
+        self.plan = plan if plan is not None else [{"rows": 200, "filtered": 10.0}]
+        self.explain_error = explain_error
+        self.queries = []
+
+    async def execute_query(self, query, params=()):
+        self.queries.append((query, params))
+        if query.startswith("EXPLAIN"):
+            if self.explain_error:
+                raise self.explain_error
+            return self.plan
+        if "information_schema" in query:
+            return [{"total": self.table_rows}]
+        return [{"total": self.total}]
+
+
+@pytest.fixture(autouse=True)
+def empty_count_cache():
+    count_cache.clear()
+    yield
+    count_cache.clear()
+
+
+def count(db, **kwargs):
+    return asyncio.run(count_rows(db, "bids", **kwargs))
+
+
+def test_none_skips_the_query():
+    db = CountingDB()
+    assert count(db, mode="none") is None
+    assert db.queries == []
+
+
+def test_exact_counts_with_the_filter_every_time():
+    db = CountingDB(total=7)
+    assert count(db, where_clause="b.status = %s", params=["open"], mode="exact", alias="b") == 7
+    assert count(db, where_clause="b.status = %s", params=["open"], mode="exact", alias="b") == 7
+    assert len(db.queries) == 2
+    query, params = db.queries[0]
+    assert query == "SELECT COUNT(*) as total FROM `bids` `b` WHERE b.status = %s"
+    assert params == ("open",)
+
+
+def test_cached_reuses_count_per_filter():
+    db = CountingDB(total=7)
+    assert count(db, where_clause="status = %s", params=["open"], mode="cached") == 7
+    db.total = 8
+    assert count(db, where_clause="status = %s", params=["open"], mode="cached") == 7
+    assert count(db, where_clause="status = %s", params=["closed"], mode="cached") == 8
+    assert len(db.queries) == 2
+
+
+def test_estimate_unfiltered_uses_table_statistics():
+    db = CountingDB(table_rows=1000)
+    assert count(db, mode="estimate") == 1000
+    query, params = db.queries[0]
+    assert "information_schema.TABLES" in query
+    assert params == ("bids",)
+
+
+def test_estimate_filtered_scales_explain_rows():
+    db = CountingDB(plan=[{"rows": 200, "filtered": 10.0}])
+    assert count(db, where_clause="status = %s", params=["open"], mode="estimate") == 20
+    assert db.queries[0][0].startswith("EXPLAIN SELECT 1 FROM `bids` WHERE status = %s")
+
+
+def test_estimate_falls_back_to_exact_when_explain_fails():
+    db = CountingDB(total=5, explain_error=RuntimeError("no EXPLAIN for you"))
+    assert count(db, where_clause="status = %s", params=["open"], mode="estimate") == 5
+    assert "COUNT(*)" in db.queries[-1][0]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        count(CountingDB(), mode="approximate")
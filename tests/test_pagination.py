@@ -0,0 +1,97 @@
+"""Tests for keyset pagination cursors and the bid list built on them"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.bids import list_bids
+from app.pagination import decode_cursor, encode_cursor
+
+
+class BidTable:
+    """Stub database holding bid rows; evaluates list_bids' keyset predicate and ordering"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def execute_query(self, query, params=()):
+        self.queries.append((query, params))
+        params = list(params)
+        if "COUNT(*)" in query:
+            return [{"total": len(self.rows)}]
+        rows = sorted(self.rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)
+        offset = params.pop() if "OFFSET" in query else 0
+        limit = params.pop()
+        if "b.created_at < %s" in query:
+            created_at, _, row_id = params[-3:]
+            rows = [row for row in rows if (row["created_at"], row["id"]) < (created_at, row_id)]
+        return rows[offset:offset + limit]
+
+
+def make_rows(count, ties_every=3):
+    """Bids whose created_at repeats in runs of ``ties_every`` so pages split ties"""
+    base = datetime(2024, 5, 1, 12, 0, 0, 123456)
+    return [
+        {"id": row_id, "title": f"Bid {row_id}", "status": "open",
+         "created_at": base + timedelta(seconds=row_id // ties_every)}
+        for row_id in range(1, count + 1)
+    ]
+
+
+def page_through(db, limit):
+    async def scenario():
+        pages = [await list_bids(db, [], [], 0, limit, None, "exact")]
+        while pages[-1].next_cursor:
+            pages.append(await list_bids(db, [], [], 0, limit, pages[-1].next_cursor, "exact"))
+        return pages
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("row_id", [42, "a1b2-c3"])
+def test_cursor_round_trip(row_id):
+    created_at = datetime(2024, 2, 29, 23, 59, 59, 999999)
+    cursor = encode_cursor(created_at, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime(2024, 1, 1), 1)[:-3]])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_row_once_across_created_at_ties():
+    db = BidTable(make_rows(23))
+    pages = page_through(db, limit=5)
+
+    ids = [int(bid.id) for page in pages for bid in page.bids]
+    expected = [row["id"] for row in sorted(db.rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)]
+    assert ids == expected
+    assert [len(page.bids) for page in pages] == [5, 5, 5, 5, 3]
+    assert pages[-1].next_cursor is None
+
+
+def test_continuation_pages_skip_count_and_offset():
+    db = BidTable(make_rows(12))
+    pages = page_through(db, limit=5)
+
+    assert pages[0].total == 12 and pages[0].page == 1
+    assert all(page.total is None and page.page is None for page in pages[1:])
+    list_queries = [query for query, _ in db.queries if "COUNT(*)" not in query]
+    assert "OFFSET" in list_queries[0]
+    assert not any("OFFSET" in query for query in list_queries[1:])
+
+
+def test_page_boundary_at_exact_multiple_has_no_trailing_cursor():
+    pages = page_through(BidTable(make_rows(10)), limit=5)
+    assert [len(page.bids) for page in pages] == [5, 5]
+    assert pages[-1].next_cursor is None
+
+
+def test_invalid_cursor_is_a_bad_request():
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(list_bids(BidTable([]), [], [], 0, 5, "garbage", "exact"))
+    assert error.value.status_code == 400
@@ -0,0 +1,228 @@
+"""Tests for the two-tier response cache: tag generations and single-flight loads"""
+import asyncio
+import fnmatch
+
+from app.response_cache import ResponseCache, build_key
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of redis.asyncio the cache uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1)
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def keys(self, pattern):
+        return [key for key in self.data if fnmatch.fnmatch(key, pattern)]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.pending.append(key)
+
+    async def execute(self):
+        for key in self.pending:
+            await self.redis.incr(key)
+
+
+def redis_cache(redis: FakeRedis) -> ResponseCache:
+    cache = ResponseCache(redis_url="redis://test")
+    cache._redis = redis
+    return cache
+
+
+class SlowLoader:
+    """Loader that returns successive values, each after ``release`` is set"""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        value = self.calls
+        self.started.set()
+        await self.release.wait()
+        return {"value": value}
+
+
+def test_build_key_ignores_param_order():
+    assert build_key("stats", "role:admin", {"a": 1, "b": 2}) == build_key("stats", "role:admin", {"b": 2, "a": 1})
+    assert build_key("stats", "role:admin", {"a": 1}) != build_key("stats", "role:shipper", {"a": 1})
+
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = ResponseCache(redis_url=None)
+        loader = SlowLoader()
+        first = asyncio.ensure_future(cache.get_or_set("k", loader, tags=("bids",)))
+        await loader.started.wait()
+        others = [asyncio.ensure_future(cache.get_or_set("k", loader, tags=("bids",))) for _ in range(5)]
+        await asyncio.sleep(0)
+        loader.release.set()
+        results = await asyncio.gather(first, *others)
+        return loader.calls, results, cache.stats()
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert results == [{"value": 1}] * 6
+    assert stats["shared_loads"] == 5
+
+
+def test_invalidate_orphans_l1_entry():
+    async def scenario():
+        cache = ResponseCache(redis_url=None)
+        loader = SlowLoader()
+        loader.release.set()
+        first = await cache.get_or_set("k", loader, tags=("bids",))
+        cached = await cache.get_or_set("k", loader, tags=("bids",))
+        await cache.invalidate("lanes")
+        unrelated = await cache.get_or_set("k", loader, tags=("bids",))
+        await cache.invalidate("bids")
+        reloaded = await cache.get_or_set("k", loader, tags=("bids",))
+        return first, cached, unrelated, reloaded
+
+    first, cached, unrelated, reloaded = asyncio.run(scenario())
+    assert first == cached == unrelated == {"value": 1}
+    assert reloaded == {"value": 2}
+
+
+def test_invalidation_racing_a_load_is_not_served_stale():
+    async def scenario():
+        cache = ResponseCache(redis_url=None)
+        loader = SlowLoader()
+        stale = asyncio.ensure_future(cache.get_or_set("k", loader, tags=("bids",)))
+        await loader.started.wait()
+
+        # A write lands while the first load is still reading the old data
+        await cache.invalidate("bids")
+        fresh = asyncio.ensure_future(cache.get_or_set("k", loader, tags=("bids",)))
+        await asyncio.sleep(0)
+        loader.release.set()
+        results = await asyncio.gather(stale, fresh)
+        after = await cache.get_or_set("k", loader, tags=("bids",))
+        return loader.calls, results, after
+
+    calls, (stale, fresh), after = asyncio.run(scenario())
+    # The caller that arrived after the invalidation did not join the old load
+    assert calls == 2
+    assert stale == {"value": 1}
+    assert fresh == {"value": 2}
+    # Nor did the old load's result land in L1
+    assert after == {"value": 2}
+
+
+def test_failed_load_propagates_and_is_not_cached():
+    async def scenario():
+        cache = ResponseCache(redis_url=None)
+        attempts = []
+
+        async def loader():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        try:
+            await cache.get_or_set("k", loader)
+        except RuntimeError as e:
+            error = str(e)
+        return error, await cache.get_or_set("k", loader)
+
+    error, value = asyncio.run(scenario())
+    assert error == "boom"
+    assert value == "ok"
+
+
+def test_l2_entry_is_shared_between_workers():
+    async def scenario():
+        redis = FakeRedis()
+        worker_a, worker_b = redis_cache(redis), redis_cache(redis)
+        loader = SlowLoader()
+        loader.release.set()
+        a = await worker_a.get_or_set("k", loader, tags=("bids",))
+        b = await worker_b.get_or_set("k", loader, tags=("bids",))
+        return loader.calls, a, b, worker_b.stats()
+
+    calls, a, b, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert a == b == {"value": 1}
+    assert stats["l2_hits"] == 1
+
+
+def test_invalidation_racing_an_l2_load_writes_under_the_old_generation():
+    async def scenario():
+        redis = FakeRedis()
+        writer, reader = redis_cache(redis), redis_cache(redis)
+        loader = SlowLoader()
+        stale = asyncio.ensure_future(reader.get_or_set("k", loader, tags=("bids",)))
+        await loader.started.wait()
+
+        # Another worker writes and bumps the generation mid-load
+        await writer.invalidate("bids")
+        loader.release.set()
+        await stale
+
+        fresh_loader = SlowLoader()
+        fresh_loader.release.set()
+        fresh = await writer.get_or_set("k", fresh_loader, tags=("bids",))
+        return redis, fresh_loader.calls, fresh
+
+    redis, calls, fresh = asyncio.run(scenario())
+    assert redis.data["routecraft:cache:gen:bids"] == "1"
+    assert sorted(redis.keys("routecraft:cache:v:k:*")) == ["routecraft:cache:v:k:0", "routecraft:cache:v:k:1"]
+    assert calls == 1
+    assert fresh == {"value": 1}
+    assert redis.keys("routecraft:cache:lock:*") == []
+
+
+def test_lock_loser_waits_for_winner_result():
+    async def scenario():
+        redis = FakeRedis()
+        winner, loser = redis_cache(redis), redis_cache(redis)
+        loader = SlowLoader()
+        first = asyncio.ensure_future(winner.get_or_set("k", loader))
+        await loader.started.wait()
+        second = asyncio.ensure_future(loser.get_or_set("k", loader))
+        await asyncio.sleep(0.01)
+        loader.release.set()
+        return loader.calls, await asyncio.gather(first, second), loser.stats()
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert results == [{"value": 1}, {"value": 1}]
+    assert stats["lock_waits"] == 1
@@ -0,0 +1,202 @@
+"""Tests for transaction commit/rollback on the sync, thread-pool and aiomysql backends"""
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+
+import pytest
+
+from app.database_async import AsyncMySQLDatabase, ThreadPoolDatabase
+from app.database_mysql import MySQLDatabase
+
+
+class Store:
+    """Rows a stub connection has committed; uncommitted writes stay on the connection"""
+
+    def __init__(self):
+        self.committed = []
+        self.events = []
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def execute(self, query, params=()):
+        if query.startswith("SELECT"):
+            self.rows = [{"value": value} for value in self.connection.visible()]
+            return
+        self.connection.pending.append(params[0])
+        self.rowcount = 1
+        self.lastrowid = len(self.connection.visible())
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Sync connection with just enough transaction semantics to observe rollback"""
+
+    def __init__(self, store):
+        self.store = store
+        self.pending = []
+
+    def visible(self):
+        return self.store.committed + self.pending
+
+    def start_transaction(self, isolation_level=None):
+        self.store.events.append("begin")
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.store.committed.extend(self.pending)
+        self.pending = []
+        self.store.events.append("commit")
+
+    def rollback(self):
+        self.pending = []
+        self.store.events.append("rollback")
+
+
+def sync_database(store):
+    # Skip the real constructor: it opens a MySQL connection pool
+    database = MySQLDatabase.__new__(MySQLDatabase)
+
+    @contextmanager
+    def get_connection(read=False):
+        yield FakeConnection(store)
+
+    database.get_connection = get_connection
+    return database
+
+
+class FakeAsyncCursor(FakeCursor):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params=()):
+        FakeCursor.execute(self, query, params)
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeAsyncConnection(FakeConnection):
+    async def begin(self):
+        self.start_transaction()
+
+    def cursor(self, cursor_class=None):
+        return FakeAsyncCursor(self)
+
+    async def commit(self):
+        FakeConnection.commit(self)
+
+    async def rollback(self):
+        FakeConnection.rollback(self)
+
+
+def async_database(store):
+    database = AsyncMySQLDatabase.__new__(AsyncMySQLDatabase)
+
+    @asynccontextmanager
+    async def get_connection(read=False, timer=None):
+        yield FakeAsyncConnection(store)
+
+    database.get_connection = get_connection
+    return database
+
+
+class Boom(Exception):
+    pass
+
+
+def test_sync_transaction_commits_on_clean_exit():
+    store = Store()
+    with sync_database(store).transaction() as transaction:
+        transaction.execute_insert("INSERT INTO t (value) VALUES (%s)", ("a",))
+        transaction.execute_insert("INSERT INTO t (value) VALUES (%s)", ("b",))
+    assert store.committed == ["a", "b"]
+    assert store.events == ["begin", "commit"]
+
+
+def test_sync_transaction_rolls_back_on_error():
+    store = Store()
+    with pytest.raises(Boom):
+        with sync_database(store).transaction() as transaction:
+            transaction.execute_insert("INSERT INTO t (value) VALUES (%s)", ("a",))
+            assert transaction.execute_query("SELECT value FROM t") == [{"value": "a"}]
+            raise Boom()
+    assert store.committed == []
+    assert store.events == ["begin", "rollback"]
+
+
+def test_sync_explicit_rollback_continues_in_a_fresh_transaction():
+    store = Store()
+    with sync_database(store).transaction() as transaction:
+        transaction.execute_insert("INSERT INTO t (value) VALUES (%s)", ("discarded",))
+        transaction.rollback()
+        transaction.execute_insert("INSERT INTO t (value) VALUES (%s)", ("kept",))
+    assert store.committed == ["kept"]
+    assert store.events == ["begin", "rollback", "begin", "commit"]
+
+
+def run_async_transaction(database, fail):
+    async def scenario():
+        async with database.transaction() as transaction:
+            await transaction.execute_insert("INSERT INTO t (value) VALUES (%s)", ("a",))
+            rows = await transaction.execute_query("SELECT value FROM t")
+            if fail:
+                raise Boom()
+        return rows
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("backend", ["thread_pool", "aiomysql"])
+def test_async_transaction_commits_on_clean_exit(backend):
+    store = Store()
+    database = ThreadPoolDatabase(sync_database(store)) if backend == "thread_pool" else async_database(store)
+    assert run_async_transaction(database, fail=False) == [{"value": "a"}]
+    assert store.committed == ["a"]
+    assert store.events == ["begin", "commit"]
+
+
+@pytest.mark.parametrize("backend", ["thread_pool", "aiomysql"])
+def test_async_transaction_rolls_back_on_error(backend):
+    store = Store()
+    database = ThreadPoolDatabase(sync_database(store)) if backend == "thread_pool" else async_database(store)
+    with pytest.raises(Boom):
+        run_async_transaction(database, fail=True)
+    assert store.committed == []
+    assert store.events == ["begin", "rollback"]
+
+
+def test_thread_pool_transaction_rolls_back_when_cancelled():
+    store = Store()
+    database = ThreadPoolDatabase(sync_database(store))
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def work():
+            async with database.transaction() as transaction:
+                await transaction.execute_insert("INSERT INTO t (value) VALUES (%s)", ("a",))
+                started.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(work())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert store.committed == []
+    assert store.events == ["begin", "rollback"]